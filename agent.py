@@ -4,64 +4,92 @@ import logging
 import asyncio
 import builtins
 from livekit import agents, rtc
-from livekit.agents import AgentSession, Agent, RoomInputOptions, function_tool
-from livekit.plugins import google, noise_cancellation
+from livekit.agents import AgentSession, Agent, RoomInputOptions, ChatContext, ChatMessage, StopResponse, function_tool
+from livekit.plugins import google, noise_cancellation, silero
+from google.genai import types
 from datetime import datetime
 
 # Your existing imports...
 from stonic_prompts import behavior_prompts, Reply_prompts
-from stonic_google_search import google_search, get_current_datetime
-from stonic_get_whether import get_weather
-from stonic_window_CTRL import open as open_window, close as close_window, folder_file
-from stonic_file_opner import Play_file
-from stonic_youtube_control import YouTube_control
-from keyboard_mouse_CTRL import (
-    move_cursor_tool, mouse_click_tool, scroll_cursor_tool, type_text_tool,
-    press_key_tool, swipe_gesture_tool, press_hotkey_tool, control_volume_tool
-)
-from stonic_gen_tools import (
-    generate_image, generate_image_alternative,
-    generate_code_advanced, generate_code, save_output
-)
-from stonic_state import set_sleep_state, get_sleep_state, is_jarvis_sleeping
-from stonic_system_control import system_shutdown, system_restart, system_lock
-from stonic_code_fixer import (
-    check_and_fix_code, paste_fixed_code, test_groq_connection
-)
-from stonic_schedule_manager import (
-    get_todays_schedule, get_tomorrows_schedule,
-    get_schedule_for_date, get_schedule_info
-)
+from stonic_state import set_sleep_state, is_jarvis_sleeping, process_sleep_intent, sleep_state
+# Tool implementations (selenium, cv2, pyautogui, ...) are imported on first use
+from stonic_tool_registry import lazy_tools, load_attribute_async
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Opening Edge for YouTube on every job is slow and heavy, so it is opt-in
+PREWARM_YOUTUBE_BROWSER = os.getenv("STONIC_PREWARM_BROWSER", "").lower() in ("1", "true", "yes")
+_background_tasks = set()  # Strong references so background tasks are not garbage collected mid-run
+
 
 class NikhilPersonalAssistant(Agent):
     def __init__(self) -> None:
         super().__init__(
             instructions=behavior_prompts,
-            tools=[
-                set_sleep_state, get_sleep_state, is_jarvis_sleeping,
-                google_search, get_current_datetime,
-                YouTube_control, get_weather, open_window, close_window, folder_file, Play_file,
-                move_cursor_tool, mouse_click_tool, scroll_cursor_tool, type_text_tool,
-                press_key_tool, press_hotkey_tool, control_volume_tool, swipe_gesture_tool,
-                generate_image, generate_image_alternative, generate_code_advanced, generate_code, save_output,
-                system_shutdown, system_restart, system_lock,
-                check_and_fix_code, paste_fixed_code, test_groq_connection,
-                get_todays_schedule, get_tomorrows_schedule, get_schedule_for_date, get_schedule_info,
-            ]
+            tools=[set_sleep_state, is_jarvis_sleeping] + lazy_tools([
+                "google_search", "get_current_datetime",
+                "YouTube_control", "get_weather", "open", "close", "folder_file", "Play_file", "find_files",
+                "move_cursor_tool", "mouse_click_tool", "scroll_cursor_tool", "type_text_tool",
+                "press_key_tool", "press_hotkey_tool", "control_volume_tool", "swipe_gesture_tool",
+                "generate_image", "generate_image_alternative", "generate_code_advanced", "generate_code", "save_output",
+                "system_shutdown", "system_restart", "system_lock",
+                "check_and_fix_code", "paste_fixed_code", "test_groq_connection",
+                "start_code_monitoring", "stop_code_monitoring",
+                "get_todays_schedule", "get_tomorrows_schedule", "get_schedule_for_date", "get_schedule_info",
+                "morning_briefing",
+            ])
         )
 
+    async def on_user_turn_completed(self, turn_ctx: ChatContext, new_message: ChatMessage) -> None:
+        """Local sleep/wake gate: runs before the LLM sees the turn"""
+        text = new_message.text_content or ""
+        if not text.strip():
+            # No transcript, so no wake phrase: asleep drops the turn, awake lets the model answer
+            if sleep_state.get():
+                logger.info("😴 Asleep, ignoring user turn without a transcript")
+                raise StopResponse()
+            return
+        intent = await process_sleep_intent(text)
+
+        if intent == "wake":
+            logger.info("☀ Wake phrase heard, passing the turn to the model")
+            return  # The model greets the user back
+        if intent == "sleep":
+            logger.info("😴 Going to sleep, no reply")
+            raise StopResponse()
+        if sleep_state.get():
+            # Asleep: drop the turn here instead of spending a model round-trip on it
+            logger.info("😴 Asleep, ignoring user turn")
+            raise StopResponse()
+
+
+async def prewarm_youtube_browser():
+    prewarm_browser = await load_attribute_async("stonic_youtube_control", "prewarm_browser")
+    await prewarm_browser()
+
 
 async def entrypoint(ctx: agents.JobContext):
+    if PREWARM_YOUTUBE_BROWSER:
+        # Warm up the shared YouTube browser while the session connects
+        task = asyncio.create_task(prewarm_youtube_browser())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
     assistant = NikhilPersonalAssistant()
     
+    # Turns are ended locally (Silero VAD) instead of by Gemini, so on_user_turn_completed (the
+    # sleep gate) runs before every reply; Gemini transcribes the input for the gate to read
     session = AgentSession(
+        vad=silero.VAD.load(),
+        turn_detection="vad",
         llm=google.beta.realtime.RealtimeModel(
             voice="Charon",
-            temperature=0.2
+            temperature=0.2,
+            realtime_input_config=types.RealtimeInputConfig(
+                automatic_activity_detection=types.AutomaticActivityDetection(disabled=True),
+            ),
+            input_audio_transcription=types.AudioTranscriptionConfig(),
         )
     )
 
@@ -75,7 +103,8 @@ async def entrypoint(ctx: agents.JobContext):
     )
 
     await ctx.connect()
-    await session.generate_reply(instructions=Reply_prompts)
+    if not sleep_state.get():
+        await session.generate_reply(instructions=Reply_prompts)
 
 
 if __name__ == "__main__":
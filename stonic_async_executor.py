@@ -0,0 +1,182 @@
+import sys
+import time
+import asyncio
+import inspect
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Executor configuration
+DEFAULT_TOOL_TIMEOUT = 30  # seconds, for tools not listed below
+TOOL_TIMEOUTS = {  # Keyed by command_router route name, the name passed to run()
+    "wake": 5,
+    "sleep": 5,
+    "weather": 15,
+    "time": 5,
+    "google_search": 20,
+    "youtube": 45,
+    "open": 30,
+    "generate_code": 120,
+    "generate_image": 120,  # The image APIs alone may take up to 90 s
+    "morning_briefing": 12,  # Has its own 8 s fan-out deadline
+}
+SYNC_TOOL_WORKERS = 16  # Threads for blocking (non-async) tools
+
+
+class ToolTimeout(Exception):
+    """A tool did not finish within its timeout"""
+
+
+class AsyncToolExecutor:
+    """Runs tool calls on one dedicated asyncio loop thread, for synchronous callers like Flask handlers.
+
+    Coroutine tools run on the loop; blocking tools run in a thread pool so they never stall it.
+    Every call gets a per-tool timeout and is counted in stats().
+    """
+
+    def __init__(self, default_timeout=DEFAULT_TOOL_TIMEOUT, timeouts=None, workers=SYNC_TOOL_WORKERS):
+        self.default_timeout = default_timeout
+        self.timeouts = dict(TOOL_TIMEOUTS if timeouts is None else timeouts)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stonic-tool")
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {}  # tool name -> counters
+        self._stats_lock = threading.Lock()
+
+    # -------------------------
+    # Loop thread
+    # -------------------------
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None or not self._thread.is_alive():
+                ready = threading.Event()
+                self._thread = threading.Thread(target=self._run_loop, args=(ready,),
+                                                name="stonic-async-tools", daemon=True)
+                self._thread.start()
+                ready.wait()
+            return self._loop
+
+    def _run_loop(self, ready):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.set_default_executor(self._pool)
+        self._loop = loop
+        ready.set()
+        loop.run_forever()
+
+    def shutdown(self):
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=5)
+                self._loop = None
+        self._pool.shutdown(wait=False)
+
+    # -------------------------
+    # Running tools
+    # -------------------------
+    def timeout_for(self, name):
+        return self.timeouts.get(name, self.default_timeout)
+
+    async def _call(self, func, args, kwargs):
+        if inspect.iscoroutinefunction(func):
+            result = await func(*args, **kwargs)
+        else:
+            result = await asyncio.get_running_loop().run_in_executor(self._pool, lambda: func(*args, **kwargs))
+        # Wrappers such as router handlers return the tool's coroutine instead of awaiting it
+        while inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def _timed(self, name, timeout, func, args, kwargs):
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            return await asyncio.wait_for(self._call(func, args, kwargs), timeout)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            logger.warning(f"⏱ Tool '{name}' timed out after {timeout}s")
+            raise ToolTimeout(f"'{name}' did not finish within {timeout} seconds")
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            self._record(name, outcome, time.perf_counter() - start)
+
+    def submit(self, func, *args, name=None, timeout=None, **kwargs):
+        """Schedule func(*args, **kwargs) on the loop; returns a concurrent.futures.Future"""
+        name = name or getattr(func, "__name__", "tool")
+        timeout = timeout or self.timeout_for(name)
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._timed(name, timeout, func, args, kwargs), loop)
+
+    def run(self, func, *args, name=None, timeout=None, **kwargs):
+        """Blocking call for synchronous code: submit and wait for the result (raises ToolTimeout)"""
+        return self.submit(func, *args, name=name, timeout=timeout, **kwargs).result()
+
+    # -------------------------
+    # Stats
+    # -------------------------
+    def _record(self, name, outcome, elapsed):
+        with self._stats_lock:
+            stats = self._stats.setdefault(name, {"calls": 0, "ok": 0, "error": 0, "timeout": 0,
+                                                  "total_seconds": 0.0, "max_seconds": 0.0})
+            stats["calls"] += 1
+            stats[outcome] += 1
+            stats["total_seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                name: {**s, "avg_seconds": round(s["total_seconds"] / s["calls"], 3),
+                       "total_seconds": round(s["total_seconds"], 3), "max_seconds": round(s["max_seconds"], 3)}
+                for name, s in self._stats.items()
+            }
+
+
+# Shared executor used by the web servers
+tool_executor = AsyncToolExecutor()
+
+
+# -------------------------
+# Throughput benchmark: python stonic_async_executor.py [clients] [requests per client]
+# -------------------------
+def run_benchmark(clients=20, requests_per_client=10, io_seconds=0.1):
+    """Simulated browser clients, each a thread issuing blocking calls like a Flask handler would"""
+
+    async def io_tool():
+        await asyncio.sleep(io_seconds)  # Stands in for an HTTP-bound tool such as get_weather
+        return "ok"
+
+    def per_call_loop():
+        # What a handler would have to do without a shared loop: a fresh event loop per request
+        return asyncio.run(io_tool())
+
+    executor = AsyncToolExecutor()
+    total = clients * requests_per_client
+    for label, call in (("asyncio.run per call", per_call_loop),
+                        ("shared loop executor", lambda: executor.run(io_tool, name="io_tool"))):
+        def client():
+            for _ in range(requests_per_client):
+                call()
+
+        threads = [threading.Thread(target=client) for _ in range(clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        print(f"{label:>22}: {total} calls from {clients} clients in {elapsed:.2f}s ({total / elapsed:.0f} calls/s)")
+
+    print(f"executor stats: {executor.stats()}")
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,44 @@
+import logging
+from livekit.agents import function_tool
+
+from stonic_fanout import fan_out
+from stonic_get_whether import get_weather
+from stonic_schedule_manager import get_todays_schedule
+from stonic_google_search import google_search
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BRIEFING_DEADLINE_SECONDS = 8  # The briefing is spoken with whatever is ready by then
+BRIEFING_NEWS_QUERY = "today's top news headlines India"
+
+BRIEFING_SECTIONS = [
+    ("weather", "🌤 Weather"),
+    ("schedule", "📅 Today's Schedule"),
+    ("headlines", "📰 Headlines"),
+]
+
+
+@function_tool
+async def morning_briefing(city: str = "", query: str = "") -> str:
+    """Morning briefing: weather, today's class schedule and top headlines, fetched in parallel.
+
+    Args:
+        city: Optional city for the weather (detected automatically when empty)
+        query: The user's original query to detect language preference
+    """
+    results, missing = await fan_out({
+        "weather": get_weather(city),
+        "schedule": get_todays_schedule(query),
+        "headlines": google_search(BRIEFING_NEWS_QUERY),
+    }, deadline=BRIEFING_DEADLINE_SECONDS)
+
+    sections = []
+    for key, title in BRIEFING_SECTIONS:
+        if key in results:
+            sections.append(f"{title}:\n{results[key]}")
+        elif missing.get(key) == "timeout":
+            sections.append(f"{title}:\nअभी available नहीं है (time पर जवाब नहीं आया)।")
+        else:
+            sections.append(f"{title}:\nअभी available नहीं है।")
+    return "\n\n".join(sections)
@@ -5,12 +5,18 @@ import pyautogui
 import pyperclip
 import pygetwindow as gw
 from livekit.agents import function_tool
-import requests
+from stonic_http import http_client
+from stonic_ttl_cache import TTLCache
+from stonic_ocr_cache import OCRBandCache
+from stonic_ocr_engine import OCREngine, probe_ocr_backend
 import os
 import cv2
 import numpy as np
 import time
-from threading import Thread
+import difflib
+import hashlib
+from collections import deque
+from threading import Thread, Event
 import tkinter as tk
 from tkinter import messagebox
 import subprocess
@@ -20,48 +26,73 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+GROQ_MODEL = "llama3-70b-8192"
+
+# Analyses keyed by the content of the code, so code analyzed before is never sent again
+ANALYSIS_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+ANALYSIS_CACHE_FILE = "stonic_code_analysis_cache.json"  # Set to None to keep the cache in memory only
+ANALYSIS_CACHE_VERSION = 1  # Bump when the analysis prompt changes
+LAST_ANALYSIS_KEY = "last"  # Key of the most recent analysis, for paste_fixed_code after a restart
+analysis_cache = TTLCache("code_analysis", ANALYSIS_CACHE_TTL_SECONDS, max_entries=200,
+                          persist_file=ANALYSIS_CACHE_FILE)
+
+
+def analysis_cache_key(code: str, language: str, model: str = GROQ_MODEL) -> str:
+    """sha256 of the normalized code (line endings, trailing spaces and blank lines ignored), language and model"""
+    normalized = "\n".join(line.rstrip() for line in code.replace("\r\n", "\n").split("\n") if line.strip())
+    content = f"v{ANALYSIS_CACHE_VERSION}\0{model}\0{language}\0{normalized}"
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+# Continuous code monitoring
+MONITOR_POLL_SECONDS = 2  # How often the editor/file is checked for edits
+MONITOR_DEBOUNCE_SECONDS = 4  # Code must stay unchanged this long (user stopped typing) before analysis
+MONITOR_WORK_BUDGET_SECONDS = 6  # Wall-clock seconds of local capture/OCR/diff work per minute; polls pause beyond it
+MONITOR_MAX_ANALYSES_PER_MINUTE = 2  # Groq requests the monitor may make per minute
+MONITOR_CONTEXT_LINES = 3  # Unchanged lines sent around each edit
+MONITOR_FINDINGS_KEPT = 5
+
+
+def extract_changed_code(old: str, new: str, context=MONITOR_CONTEXT_LINES) -> str:
+    """Lines of new that were added or edited since old, with a few lines of context around each edit.
+    Separate edits are joined with '...' lines; empty when lines were only removed."""
+    old_lines, new_lines = old.splitlines(), new.splitlines()
+    ranges = []
+    for tag, _, _, j1, j2 in difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes():
+        if tag not in ("replace", "insert"):
+            continue
+        start, end = max(0, j1 - context), min(len(new_lines), j2 + context)
+        if ranges and start <= ranges[-1][1]:
+            ranges[-1][1] = max(ranges[-1][1], end)
+        else:
+            ranges.append([start, end])
+    return "\n...\n".join("\n".join(new_lines[start:end]) for start, end in ranges)
 
 class CodeFixerCore:
     def __init__(self):
         self.monitoring = False
         self.last_analyzed_code = ""
         self.monitoring_thread = None
-        self.tesseract_available = self._setup_tesseract()
+        self.monitor_file = None  # Watched file, or None to watch the active editor window
+        self.monitor_findings = deque(maxlen=MONITOR_FINDINGS_KEPT)
+        self._monitor_stop = None
+        self._tesseract_available = None  # Probed on first capture, not at import
+        self.ocr_cache = OCRBandCache()  # Text per screen line, so unchanged lines are never re-OCR'd
+        self.ocr_engine = OCREngine()  # Runs Tesseract on the changed lines, in parallel for big captures
+    
+    @property
+    def tesseract_available(self):
+        if self._tesseract_available is None:
+            self._tesseract_available = self._setup_tesseract()
+        return self._tesseract_available
         
     def _setup_tesseract(self):
-        """Setup Tesseract OCR with automatic path detection"""
-        try:
-            import pytesseract
-            
-            # Try to detect Tesseract automatically
-            possible_paths = [
-                r'C:\Program Files\Tesseract-OCR\tesseract.exe',
-                r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
-                r'C:\Users\{}\AppData\Local\Tesseract-OCR\tesseract.exe'.format(os.getenv('USERNAME', '')),
-                r'tesseract',  # If in PATH
-            ]
-            
-            for path in possible_paths:
-                try:
-                    if path == 'tesseract':
-                        # Test if tesseract is in PATH
-                        pytesseract.get_tesseract_version()
-                        logger.info("✅ Tesseract found in PATH")
-                        return True
-                    elif os.path.exists(path):
-                        pytesseract.pytesseract.tesseract_cmd = path
-                        pytesseract.get_tesseract_version()
-                        logger.info(f"✅ Tesseract found at: {path}")
-                        return True
-                except:
-                    continue
-            
-            logger.warning("❌ Tesseract not found. Using clipboard fallback method.")
-            return False
-            
-        except ImportError:
-            logger.warning("❌ pytesseract not installed. Using clipboard fallback method.")
-            return False
+        """Find Tesseract (the probe result is cached across runs, so this does not spawn it every start)"""
+        probe = probe_ocr_backend()
+        if probe.get("backend"):
+            logger.info(f"✅ Tesseract found: {probe.get('version')} via {probe['backend']}")
+            return True
+        logger.warning("❌ Tesseract not found. Using clipboard fallback method.")
+        return False
     
     def detect_language(self, code: str) -> str:
         """Enhanced language detection with better patterns"""
@@ -173,11 +204,9 @@ class CodeFixerCore:
 3. Say "Stonic check my code" again"""
         }
 
-    def _capture_with_ocr(self) -> str:
-        """Capture code using OCR from active editor"""
+    def _capture_with_ocr(self, focus: bool = True) -> str:
+        """Capture code using OCR from active editor (focus=False: only if it is already in front)"""
         try:
-            import pytesseract
-            
             # Find active code editor
             editors = self.find_code_editors()
             if not editors:
@@ -187,11 +216,15 @@ class CodeFixerCore:
             editor_info = editors[0]
             window = editor_info['window']
             
-            # Focus the window
+            if not focus and (window.isMinimized or not window.isActive):
+                return ""
+            
+            # Focus the window (and wait for it to repaint) only if it is not already in front
             if window.isMinimized:
                 window.restore()
-            window.activate()
-            time.sleep(0.5)
+            if not window.isActive:
+                window.activate()
+                time.sleep(0.5)
             
             # Capture screenshot of the editor
             region = (window.left, window.top, window.width, window.height)
@@ -204,9 +237,8 @@ class CodeFixerCore:
             # Enhance image for better text recognition
             _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
             
-            # OCR with better configuration
-            custom_config = r'--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ(){}[].,;:=+-*/\'"#_<>!@$%^&|~`? \t\n'
-            text = pytesseract.image_to_string(thresh, config=custom_config)
+            # OCR only the text lines that are not cached from an earlier capture
+            text = self.ocr_cache.recognize(thresh, self.ocr_engine.ocr_bands)
             
             # Clean and format the captured text
             cleaned_text = self._clean_captured_code(text)
@@ -290,8 +322,8 @@ class CodeFixerCore:
         
         return '\n'.join(cleaned_lines)
 
-    def send_code_to_groq_ai(self, code: str, language: str = None) -> dict:
-        """Send captured code to Groq AI for analysis and fixing"""
+    def send_code_to_groq_ai(self, code: str, language: str = None, use_cache: bool = True) -> dict:
+        """Send captured code to Groq AI for analysis and fixing (cached by code content)"""
         if not GROQ_API_KEY:
             return {
                 'success': False,
@@ -308,6 +340,23 @@ class CodeFixerCore:
         if not language:
             language = self.detect_language(code)
         
+        cache_key = analysis_cache_key(code, language)
+        if use_cache:
+            cached = analysis_cache.get(cache_key)
+            hit_rate = analysis_cache.stats()['hit_rate']
+            if cached:
+                logger.info(f"♻ Code analysis served from cache (hit rate {hit_rate:.0%})")
+                return {
+                    'success': True,
+                    'analysis': cached['analysis'],
+                    'fixed_code': cached['fixed_code'],
+                    'language': language,
+                    'original_code': code,
+                    'cached': True,
+                    'cache_hit_rate': hit_rate,
+                    'message': "✅ Code analysis loaded from cache"
+                }
+        
         # Enhanced prompt for better analysis
         prompt = f"""You are Stonic, an expert code assistant. Analyze this {language} code for errors and provide fixes.
 
@@ -341,7 +390,7 @@ Format your response clearly with sections and use code blocks for the fixed cod
         }
 
         payload = {
-            "model": "llama3-70b-8192",
+            "model": GROQ_MODEL,
             "messages": [
                 {
                     "role": "system", 
@@ -355,7 +404,7 @@ Format your response clearly with sections and use code blocks for the fixed cod
 
         try:
             logger.info("🤖 Sending code to Groq AI for analysis...")
-            response = requests.post(
+            response = http_client.post(
                 "https://api.groq.com/openai/v1/chat/completions",
                 headers=headers,
                 json=payload,
@@ -364,12 +413,17 @@ Format your response clearly with sections and use code blocks for the fixed cod
             response.raise_for_status()
             
             ai_response = response.json()["choices"][0]["message"]["content"].strip()
+            fixed_code = self.extract_fixed_code_from_ai_response(ai_response)
+            analysis_cache.set(cache_key, {'analysis': ai_response, 'fixed_code': fixed_code})
             
             return {
                 'success': True,
                 'analysis': ai_response,
+                'fixed_code': fixed_code,
                 'language': language,
                 'original_code': code,
+                'cached': False,
+                'cache_hit_rate': analysis_cache.stats()['hit_rate'],
                 'message': f"✅ Code analysis complete using Groq AI"
             }
             
@@ -380,6 +434,20 @@ Format your response clearly with sections and use code blocks for the fixed cod
                 'message': f"❌ AI analysis failed: {e}"
             }
 
+    def remember_analysis(self, ai_result: dict):
+        """Keep a whole-code analysis for paste_fixed_code, also across restarts"""
+        self.last_analyzed_code = ai_result
+        analysis_cache.set(LAST_ANALYSIS_KEY, analysis_cache_key(ai_result['original_code'], ai_result['language']))
+
+    def load_last_analysis(self):
+        """Most recent analysis from the persistent cache (e.g. made before a restart), or None"""
+        cache_key, _ = analysis_cache.lookup(LAST_ANALYSIS_KEY)  # lookup() does not count towards the hit rate
+        cached, _ = analysis_cache.lookup(cache_key) if cache_key else (None, None)
+        if not cached:
+            return None
+        return {'analysis': cached['analysis'], 'fixed_code': cached['fixed_code'],
+                'language': self.detect_language(cached['fixed_code'] or cached['analysis'])}
+
     def extract_fixed_code_from_ai_response(self, ai_response: str) -> str:
         """Extract the fixed code from AI response"""
         # Look for code blocks in the response
@@ -513,6 +581,103 @@ Format your response clearly with sections and use code blocks for the fixed cod
             logger.error(f"Paste failed: {e}")
             return False
 
+    # -------------------------
+    # Continuous monitoring
+    # -------------------------
+    def start_monitoring(self, file_path: str = "") -> bool:
+        """Start the background monitor thread. Returns False if it is already running."""
+        if self.monitoring:
+            return False
+        self.monitor_file = os.path.abspath(os.path.expanduser(file_path)) if file_path else None
+        self.monitor_findings.clear()
+        self._monitor_stop = Event()
+        self.monitoring = True
+        self.monitoring_thread = Thread(target=self._monitor_loop, args=(self._monitor_stop,),
+                                        name="stonic-code-monitor", daemon=True)
+        self.monitoring_thread.start()
+        logger.info(f"👀 Code monitoring started ({self.monitor_file or 'active editor'})")
+        return True
+
+    def stop_monitoring(self) -> bool:
+        """Ask the monitor thread to stop (it exits at its next poll). Returns False if it was not running."""
+        if not self.monitoring:
+            return False
+        self.monitoring = False
+        self._monitor_stop.set()
+        logger.info("🛑 Code monitoring stopped")
+        return True
+
+    def _read_monitored_code(self, last_mtime):
+        """(code or None if unchanged/unavailable, mtime) from the watched file or the active editor"""
+        if not self.monitor_file:
+            if not self.tesseract_available:
+                return None, None  # No OCR backend: nothing to read from the editor
+            return self._capture_with_ocr(focus=False) or None, None
+        try:
+            mtime = os.stat(self.monitor_file).st_mtime_ns
+            if mtime == last_mtime:
+                return None, mtime
+            with open(self.monitor_file, "r", encoding="utf-8", errors="replace") as f:
+                return f.read(), mtime
+        except OSError as e:
+            logger.warning(f"⚠ Cannot read monitored file: {e}")
+            return None, last_mtime
+
+    def _monitor_loop(self, stop):
+        """Poll for edits, wait until they settle, then analyze only the changed lines.
+
+        Local work (capture, OCR, diff) is limited to MONITOR_WORK_BUDGET_SECONDS of wall-clock time per
+        minute, measured on this thread (OCR pool workers count as the time spent waiting for them), and
+        Groq requests to MONITOR_MAX_ANALYSES_PER_MINUTE; over either limit the monitor just waits.
+        """
+        baseline = None  # Code as of the last analysis (or when monitoring started)
+        latest, changed_at, mtime = None, 0.0, None
+        work_log, analyses = deque(), deque()  # (time, wall-clock seconds of local work) / times of Groq requests
+
+        while not stop.wait(MONITOR_POLL_SECONDS):
+            try:
+                now = time.monotonic()
+                while work_log and now - work_log[0][0] > 60:
+                    work_log.popleft()
+                while analyses and now - analyses[0] > 60:
+                    analyses.popleft()
+                if sum(seconds for _, seconds in work_log) >= MONITOR_WORK_BUDGET_SECONDS:
+                    continue
+
+                started = time.perf_counter()
+                code, mtime = self._read_monitored_code(mtime)
+                work_log.append((now, time.perf_counter() - started))
+
+                if code is not None and code != latest:
+                    latest, changed_at = code, now
+                    if baseline is None:
+                        baseline = code  # Only edits made after monitoring started are analyzed
+                    continue
+                if latest == baseline or now - changed_at < MONITOR_DEBOUNCE_SECONDS:
+                    continue
+                if len(analyses) >= MONITOR_MAX_ANALYSES_PER_MINUTE:
+                    continue
+
+                changed = extract_changed_code(baseline, latest)
+                baseline = latest
+                if len(changed.strip()) < 3:
+                    continue  # Lines were only removed
+                analyses.append(now)
+                lines = changed.count("\n") + 1
+                result = self.send_code_to_groq_ai(changed, self.detect_language(latest))
+                if result['success']:
+                    self.monitor_findings.append({
+                        'time': time.strftime("%H:%M:%S"),
+                        'lines': lines,
+                        'language': result['language'],
+                        'analysis': result['analysis'],
+                    })
+                    logger.info(f"🔍 Monitor analyzed {lines} changed lines")
+                else:
+                    logger.warning(f"⚠ Monitor analysis failed: {result['message']}")
+            except Exception as e:
+                logger.error(f"Code monitor error: {e}")
+
 # Initialize the core
 code_fixer_core = CodeFixerCore()
 
@@ -547,6 +712,7 @@ async def check_and_fix_code() -> str:
 **Capture Method:** {method}
 **Language Detected:** {ai_result['language']}
 **Code Length:** {len(code)} characters
+**Analysis:** {'cache से (पहले analyze किया गया code) / from cache' if ai_result['cached'] else 'Groq AI'} (cache hit rate {ai_result['cache_hit_rate']:.0%})
 
 ---
 
@@ -561,7 +727,7 @@ async def check_and_fix_code() -> str:
 """
         
         # Store the result for pasting later
-        code_fixer_core.last_analyzed_code = ai_result
+        code_fixer_core.remember_analysis(ai_result)
         
         return response
         
@@ -575,13 +741,14 @@ async def paste_fixed_code() -> str:
     Paste the last AI-analyzed and fixed code to the active editor
     """
     try:
-        if not code_fixer_core.last_analyzed_code:
+        ai_result = code_fixer_core.last_analyzed_code or code_fixer_core.load_last_analysis()
+        if not ai_result:
             return "❌ कोई fixed code उपलब्ध नहीं है। पहले code analyze करें।\nNo fixed code available. Please analyze code first."
         
-        ai_result = code_fixer_core.last_analyzed_code
-        
-        # Extract fixed code from AI response
-        fixed_code = code_fixer_core.extract_fixed_code_from_ai_response(ai_result['analysis'])
+        # Fixed code was extracted when the analysis was made (or cached)
+        fixed_code = ai_result.get('fixed_code')
+        if fixed_code is None:
+            fixed_code = code_fixer_core.extract_fixed_code_from_ai_response(ai_result['analysis'])
         
         if not fixed_code:
             return "❌ AI response से fixed code extract नहीं हो सका।\nCouldn't extract fixed code from AI response."
@@ -610,9 +777,48 @@ async def paste_fixed_code() -> str:
 @function_tool(name="test_groq_connection", description="Test connection to Groq AI")
 async def test_groq_connection() -> str:
     """Test if Groq AI connection is working"""
-    test_result = code_fixer_core.send_code_to_groq_ai("print('hello world')", "python")
+    test_result = code_fixer_core.send_code_to_groq_ai("print('hello world')", "python", use_cache=False)
     
     if test_result['success']:
         return "✅ Groq AI connection working perfectly!\nGroq AI कनेक्शन सही तरीके से काम कर रहा है!"
     else:
-        return f"❌ Groq AI connection failed: {test_result['message']}"
\ No newline at end of file
+        return f"❌ Groq AI connection failed: {test_result['message']}"
+
+@function_tool(name="start_code_monitoring", description="Continuously watch the code editor (or a code file) and analyze new edits with Groq AI in the background")
+async def start_code_monitoring(file_path: str = "") -> str:
+    """
+    Start background code monitoring; only code changed after this point is analyzed
+
+    Args:
+        file_path: Optional path of the code file to watch; the active editor window is watched when empty
+    """
+    if file_path and not os.path.isfile(os.path.expanduser(file_path)):
+        return f"❌ File नहीं मिली: {file_path}\nFile not found: {file_path}"
+    if not file_path and not await asyncio.to_thread(lambda: code_fixer_core.tesseract_available):
+        return ("❌ Tesseract OCR नहीं मिला, इसलिए editor को monitor नहीं कर सकते। Code file का path बताइए।\n"
+                "Tesseract OCR is not installed, so the editor cannot be watched. Give the path of a code file instead.")
+    if not code_fixer_core.start_monitoring(file_path):
+        return "👀 Code monitoring पहले से चल रहा है।\nCode monitoring is already running."
+    target = code_fixer_core.monitor_file or "active editor"
+    return f"""👀 **Code Monitoring Started** ({target})
+
+आपके नए edits typing रुकने के बाद check होंगे।
+Your new edits will be checked once you pause typing.
+
+बोलें "Stonic stop code monitoring" / Say "Stonic stop code monitoring" to stop."""
+
+@function_tool(name="stop_code_monitoring", description="Stop background code monitoring and report what it found")
+async def stop_code_monitoring() -> str:
+    """Stop background code monitoring and summarize its findings"""
+    if not code_fixer_core.stop_monitoring():
+        return "ℹ Code monitoring चल नहीं रहा है।\nCode monitoring is not running."
+    findings = list(code_fixer_core.monitor_findings)
+    if not findings:
+        return "🛑 Code monitoring बंद हो गया। कोई नया edit analyze नहीं हुआ।\nCode monitoring stopped. No new edits were analyzed."
+    latest = findings[-1]
+    return f"""🛑 **Code Monitoring Stopped**
+
+**Edits analyzed:** {len(findings)}
+**Latest ({latest['time']}, {latest['lines']} lines of {latest['language']}):**
+
+{latest['analysis']}"""
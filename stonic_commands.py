@@ -0,0 +1,88 @@
+from stonic_intent_router import command_router
+from stonic_state import set_sleep_state
+from stonic_tool_registry import lazy_callable
+
+# Tools are imported on first use (inside the executor's worker threads)
+google_search = lazy_callable("google_search")
+get_current_datetime = lazy_callable("get_current_datetime")
+get_weather = lazy_callable("get_weather")
+open_window = lazy_callable("open")
+YouTube_control = lazy_callable("YouTube_control")
+control_volume_tool = lazy_callable("control_volume_tool")
+generate_image = lazy_callable("generate_image")
+generate_code = lazy_callable("generate_code")
+system_shutdown = lazy_callable("system_shutdown")
+system_restart = lazy_callable("system_restart")
+system_lock = lazy_callable("system_lock")
+morning_briefing = lazy_callable("morning_briefing")
+start_code_monitoring = lazy_callable("start_code_monitoring")
+stop_code_monitoring = lazy_callable("stop_code_monitoring")
+
+# Priorities: specific phrases beat generic keywords, destructive system actions rank lowest
+PRIORITY_STATE = 100  # sleep / wake
+PRIORITY_SPECIFIC = 50  # multi-word phrases tied to one tool
+PRIORITY_DEFAULT = 20
+PRIORITY_GENERIC = 10  # single generic words such as "open" or "search"
+PRIORITY_SYSTEM = 5  # shutdown / restart / lock
+
+
+async def _go_to_sleep(command, query):
+    await set_sleep_state(True)
+    return "Going to sleep mode..."
+
+
+async def _wake_up(command, query):
+    await set_sleep_state(False)
+    return "Stonic is now awake and ready to assist you."
+
+
+def register_default_commands(router=command_router):
+    """Register the built-in voice/text command triggers on the shared router"""
+    router.register("wake", ["wake up stonic", "uth jao", "jaago", "stonic uth jao"],
+                    _wake_up, priority=PRIORITY_STATE)
+    router.register("sleep", ["stonic go to sleep", "so jao", "sone chalo", "sleep now", "stonic so jao",
+                              "sleep mode", "sleep stonic", "chup ho jao"],
+                    _go_to_sleep, priority=PRIORITY_STATE)
+
+    router.register("weather", ["weather", "mausam"],
+                    lambda command, query: get_weather(), priority=PRIORITY_DEFAULT)
+    router.register("time", ["time", "samay", "kitne baje"],
+                    lambda command, query: get_current_datetime(), priority=PRIORITY_DEFAULT)
+    router.register("google_search", ["search for", "search", "google", "dhundho"],
+                    lambda command, query: google_search(query or command),
+                    priority=PRIORITY_GENERIC, takes_query=True)
+    # YouTube_control parses the full sentence itself
+    router.register("youtube", ["youtube", "video"],
+                    lambda command, query: YouTube_control(command), priority=PRIORITY_SPECIFIC)
+    router.register("open", ["open", "kholo"],
+                    lambda command, query: open_window(query or command),
+                    priority=PRIORITY_GENERIC, takes_query=True)
+
+    router.register("volume_up", ["volume up", "volume badhao", "aawaz badhao", "increase volume"],
+                    lambda command, query: control_volume_tool("up"), priority=PRIORITY_SPECIFIC)
+    router.register("volume_down", ["volume down", "volume kam karo", "aawaz kam karo", "decrease volume"],
+                    lambda command, query: control_volume_tool("down"), priority=PRIORITY_SPECIFIC)
+    router.register("volume_mute", ["mute", "volume band karo", "aawaz band karo"],
+                    lambda command, query: control_volume_tool("mute"), priority=PRIORITY_SPECIFIC)
+
+    router.register("system_shutdown", ["shutdown", "computer band karo", "system band karo",
+                                        "laptop band karo", "pc band karo"],
+                    lambda command, query: system_shutdown(), priority=PRIORITY_SYSTEM)
+    router.register("system_restart", ["restart", "restart karo"],
+                    lambda command, query: system_restart(), priority=PRIORITY_SYSTEM)
+    router.register("system_lock", ["lock", "lock karo", "lock screen"],
+                    lambda command, query: system_lock(), priority=PRIORITY_SYSTEM)
+
+    router.register("morning_briefing", ["morning briefing", "good morning briefing", "briefing", "aaj ka briefing"],
+                    lambda command, query: morning_briefing(query=command), priority=PRIORITY_SPECIFIC)
+    router.register("generate_code", ["generate code", "code banao"],
+                    lambda command, query: generate_code(query or command),
+                    priority=PRIORITY_SPECIFIC, takes_query=True)
+    router.register("generate_image", ["generate image", "image banao"],
+                    lambda command, query: generate_image(query or command),
+                    priority=PRIORITY_SPECIFIC, takes_query=True)
+    router.register("start_code_monitoring", ["start code monitoring", "monitor my code", "code monitor karo"],
+                    lambda command, query: start_code_monitoring(), priority=PRIORITY_SPECIFIC)
+    router.register("stop_code_monitoring", ["stop code monitoring", "stop monitoring", "monitoring band karo"],
+                    lambda command, query: stop_code_monitoring(), priority=PRIORITY_SPECIFIC)
+    return router
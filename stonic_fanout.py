@@ -0,0 +1,38 @@
+import time
+import asyncio
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FANOUT_DEADLINE_SECONDS = 8  # Shared deadline for all calls in one fan-out
+
+
+async def fan_out(calls: dict, deadline=FANOUT_DEADLINE_SECONDS):
+    """Run {label: coroutine} concurrently under one shared deadline.
+
+    Returns (results, missing): results maps label -> value for every call that finished in time,
+    missing maps label -> "timeout" or the error message. Calls still running at the deadline are
+    cancelled; tools that fetch through TTLCache.get_or_fetch still finish filling their cache.
+    """
+    if not calls:
+        return {}, {}
+    start = time.perf_counter()
+    tasks = {asyncio.ensure_future(coro): label for label, coro in calls.items()}
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+
+    results, missing = {}, {}
+    for task in done:
+        label = tasks[task]
+        try:
+            results[label] = task.result()
+        except Exception as e:
+            logger.warning(f"⚠ Fan-out call '{label}' failed: {e}")
+            missing[label] = str(e)
+    for task in pending:
+        task.cancel()
+        missing[tasks[task]] = "timeout"
+
+    logger.info(f"🔀 Fan-out of {len(calls)} calls finished in {time.perf_counter() - start:.2f}s "
+                f"({len(results)} ok, {len(missing)} missing)")
+    return results, missing
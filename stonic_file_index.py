@@ -0,0 +1,451 @@
+import os
+import fnmatch
+import sqlite3
+import logging
+import threading
+import time
+from stonic_trigram_index import TrigramIndex
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Persistent index of files/folders used by Play_file
+INDEX_DB_FILE = "stonic_file_index.db"
+INDEX_ROOTS = ["C:/"]  # 🔧 Change this as needed
+# Folder names / absolute paths that are neither indexed nor watched
+INDEX_EXCLUDES = [
+    "$Recycle.Bin", "System Volume Information", r"C:\Windows", "AppData",
+    "node_modules", "__pycache__", ".git", ".venv", "venv",
+]
+INDEX_REFRESH_MINUTES = 30  # Incremental refresh at most this often
+COMMIT_EVERY = 5000  # Rows written before an intermediate commit
+SQL_VARIABLES = 900  # Ids per "IN (...)" query (SQLite limits bound parameters)
+
+# Keeps the rowid of an existing path, so the trigram index (keyed by rowid) stays valid
+UPSERT_ITEM = ("INSERT INTO items (path, parent, name, name_lower, type, mtime) VALUES (?, ?, ?, ?, ?, ?) "
+               "ON CONFLICT(path) DO UPDATE SET parent = excluded.parent, name = excluded.name, "
+               "name_lower = excluded.name_lower, type = excluded.type, mtime = excluded.mtime")
+
+
+def is_excluded(path, excludes=None) -> bool:
+    """Check whether a path is covered by the exclude list (folder names, globs or absolute paths)"""
+    excludes = INDEX_EXCLUDES if excludes is None else excludes
+    norm = os.path.normcase(os.path.normpath(path))
+    name = os.path.basename(norm)
+    for pattern in excludes:
+        pattern_norm = os.path.normcase(os.path.normpath(pattern))
+        if os.path.isabs(pattern_norm):
+            if norm == pattern_norm or norm.startswith(pattern_norm.rstrip(os.sep) + os.sep):
+                return True
+        elif fnmatch.fnmatch(name, pattern_norm):
+            return True
+    return False
+
+
+class FileIndex:
+    """SQLite backed file/folder index, refreshed incrementally using directory mtimes"""
+
+    def __init__(self, db_path=INDEX_DB_FILE, roots=None, excludes=None):
+        self.db_path = db_path
+        self.roots = [os.path.normpath(root) for root in (roots or INDEX_ROOTS)]
+        self.excludes = INDEX_EXCLUDES if excludes is None else excludes
+        self.live = False  # Set by the file watcher while it streams changes into the index
+        self._trigrams = None  # In-memory trigram index over names, loaded on first search
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread = None
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS dirs (
+                    path TEXT PRIMARY KEY,
+                    mtime REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS items (
+                    path TEXT PRIMARY KEY,
+                    parent TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    name_lower TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    mtime REAL NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS idx_items_parent ON items(parent);
+                CREATE INDEX IF NOT EXISTS idx_items_name ON items(name_lower);
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                CREATE TABLE IF NOT EXISTS opened (
+                    path TEXT PRIMARY KEY,
+                    last_opened REAL NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0
+                );
+            """)
+            self._conn.commit()
+
+    # -------------------------
+    # Metadata
+    # -------------------------
+    def _get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+            self._conn.commit()
+
+    @property
+    def last_refresh(self) -> float:
+        return float(self._get_meta("last_refresh", 0) or 0)
+
+    def is_built(self) -> bool:
+        return self.last_refresh > 0 and self._get_meta("roots") == "|".join(self.roots)
+
+    def is_stale(self) -> bool:
+        return time.time() - self.last_refresh > INDEX_REFRESH_MINUTES * 60
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    # -------------------------
+    # Building / refreshing
+    # -------------------------
+    def ensure_fresh(self):
+        """Build the index on first use, afterwards refresh stale indexes in the background"""
+        if not self.is_built():
+            if self.last_refresh > 0:
+                # Roots changed since the last build, start from scratch
+                self._reset()
+            logger.info(f"🔨 Building file index for {self.roots} (one time)...")
+            self.refresh()
+        elif self.is_stale() and not self.live:
+            self.refresh_in_background()
+
+    def refresh_in_background(self):
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        self._refresh_thread = threading.Thread(target=self.refresh, name="file-index-refresh", daemon=True)
+        self._refresh_thread.start()
+
+    def refresh(self, on_event=None):
+        """Walk the roots, re-listing only directories whose mtime changed.
+        on_event receives created/deleted events for changes found in already indexed folders."""
+        if not self._refresh_lock.acquire(blocking=False):
+            # Another refresh is running, wait for it instead of walking twice
+            with self._refresh_lock:
+                return
+        try:
+            start = time.time()
+            scanned = 0
+            visited = 0
+            pending = 0
+            stack = [root for root in self.roots if os.path.isdir(root)]
+
+            while stack:
+                directory = stack.pop()
+                visited += 1
+                try:
+                    mtime = os.stat(directory).st_mtime
+                except OSError:
+                    pending += self._remove_tree(directory)
+                    continue
+
+                with self._lock:
+                    row = self._conn.execute("SELECT mtime FROM dirs WHERE path = ?", (directory,)).fetchone()
+
+                if row and row[0] == mtime:
+                    # Contents unchanged, only descend into the known sub folders
+                    with self._lock:
+                        subdirs = [r[0] for r in self._conn.execute(
+                            "SELECT path FROM items WHERE parent = ? AND type = 'folder'", (directory,))]
+                else:
+                    subdirs, written = self._rescan_directory(directory, mtime, on_event if row else None)
+                    pending += written
+                    scanned += 1
+
+                stack.extend(subdirs)
+
+                if pending >= COMMIT_EVERY:
+                    with self._lock:
+                        self._conn.commit()
+                    pending = 0
+
+            with self._lock:
+                self._conn.commit()
+            self._set_meta("roots", "|".join(self.roots))
+            self._set_meta("last_refresh", time.time())
+            log = logger.info if scanned else logger.debug
+            log(f"✅ File index refreshed: {visited} folders checked, {scanned} re-listed, "
+                        f"{self.count()} items ({time.time() - start:.1f}s)")
+        finally:
+            self._refresh_lock.release()
+
+    def _rescan_directory(self, directory, mtime, on_event=None):
+        """List a changed directory and sync its direct children. Returns (sub folders, rows written)"""
+        entries = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if is_excluded(entry.path, self.excludes):
+                        continue
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        entry_mtime = entry.stat(follow_symlinks=False).st_mtime
+                    except OSError:
+                        continue
+                    entries[entry.path] = (entry.name, "folder" if is_dir else "file", entry_mtime)
+        except (PermissionError, OSError):
+            pass
+
+        written = 0
+        with self._lock:
+            known = {r[0]: (r[1], r[2]) for r in self._conn.execute(
+                "SELECT path, type, rowid FROM items WHERE parent = ?", (directory,))}
+
+            for path, (item_type, rowid) in known.items():
+                if path not in entries or entries[path][1] != item_type:
+                    self._conn.execute("DELETE FROM items WHERE path = ?", (path,))
+                    self._trigram_remove([rowid])
+                    if item_type == "folder":
+                        written += self._remove_tree(path)
+                    written += 1
+                    if on_event:
+                        on_event({"event": "deleted", "path": path, "dest_path": None, "type": item_type})
+
+            rows = [(path, directory, name, name.lower(), item_type, entry_mtime)
+                    for path, (name, item_type, entry_mtime) in entries.items()]
+            self._conn.executemany(UPSERT_ITEM, rows)
+            if self._trigrams is not None:
+                new_paths = [path for path, (_, item_type, _) in entries.items()
+                             if known.get(path, (None,))[0] != item_type]
+                self._trigram_add_paths(new_paths)
+            self._conn.execute("INSERT OR REPLACE INTO dirs (path, mtime) VALUES (?, ?)", (directory, mtime))
+            written += len(rows)
+
+        if on_event:
+            for path, (_, item_type, _) in entries.items():
+                if known.get(path, (None,))[0] != item_type:
+                    on_event({"event": "created", "path": path, "dest_path": None, "type": item_type})
+
+        subdirs = [path for path, (_, item_type, _) in entries.items() if item_type == "folder"]
+        return subdirs, written
+
+    def _reset(self):
+        with self._lock:
+            self._conn.executescript("DELETE FROM items; DELETE FROM dirs; DELETE FROM meta;")
+            self._conn.commit()
+            self._trigrams = None
+
+    def _remove_tree(self, directory):
+        """Drop a folder and everything below it from the index"""
+        directory = os.path.normpath(directory)
+        low = directory + os.sep
+        high = directory + chr(ord(os.sep) + 1)
+        with self._lock:
+            if self._trigrams is not None:
+                self._trigram_remove([r[0] for r in self._conn.execute(
+                    "SELECT rowid FROM items WHERE path = ? OR (path >= ? AND path < ?)", (directory, low, high))])
+            removed = self._conn.execute(
+                "DELETE FROM items WHERE path = ? OR (path >= ? AND path < ?)", (directory, low, high)).rowcount
+            self._conn.execute(
+                "DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (directory, low, high))
+        return removed
+
+    # -------------------------
+    # Live updates from the file watcher
+    # -------------------------
+    def apply_event(self, event):
+        """Apply a created/deleted/moved event from the file watcher"""
+        kind = event["event"]
+        if kind == "overflow":
+            # Events were dropped by the OS, fall back to an incremental walk
+            self.refresh_in_background()
+            return
+        if kind == "deleted":
+            self._remove_tree(event["path"])
+        elif kind == "moved":
+            if not self._move_tree(event["path"], event["dest_path"]):
+                self._add_tree(event["dest_path"])
+        elif kind == "created":
+            self._add_tree(event["path"])
+        with self._lock:
+            self._conn.commit()
+
+    def _add_tree(self, path):
+        """Index a newly created file, or a new folder together with its contents"""
+        path = os.path.normpath(path)
+        if is_excluded(path, self.excludes):
+            return
+        try:
+            st = os.stat(path, follow_symlinks=False)
+        except OSError:
+            return
+        is_dir = os.path.isdir(path) and not os.path.islink(path)
+        name = os.path.basename(path)
+        row = (path, os.path.dirname(path), name, name.lower(), "folder" if is_dir else "file", st.st_mtime)
+        with self._lock:
+            existed = self._conn.execute("SELECT 1 FROM items WHERE path = ?", (path,)).fetchone()
+            self._conn.execute(UPSERT_ITEM, row)
+            if not existed:
+                self._trigram_add_paths([path])
+        if is_dir:
+            stack = [path]
+            while stack:
+                directory = stack.pop()
+                try:
+                    mtime = os.stat(directory).st_mtime
+                except OSError:
+                    continue
+                subdirs, _ = self._rescan_directory(directory, mtime)
+                stack.extend(subdirs)
+
+    def _move_tree(self, src, dest):
+        """Rewrite the paths of a moved/renamed item and its children. Returns False if src was unknown"""
+        src = os.path.normpath(src)
+        dest = os.path.normpath(dest)
+        with self._lock:
+            row = self._conn.execute("SELECT type, rowid FROM items WHERE path = ?", (src,)).fetchone()
+            if not row:
+                return False
+            self._remove_tree(dest)
+            low = src + os.sep
+            high = src + chr(ord(os.sep) + 1)
+            offset = len(src) + 1
+            # Children keep their rowids and names; only the moved item itself is renamed
+            self._conn.execute(
+                "UPDATE items SET parent = ? || substr(parent, ?), path = ? || substr(path, ?) "
+                "WHERE path >= ? AND path < ?", (dest, offset, dest, offset, low, high))
+            self._conn.execute(
+                "UPDATE dirs SET path = ? || substr(path, ?) WHERE path = ? OR (path >= ? AND path < ?)",
+                (dest, offset, src, low, high))
+            name = os.path.basename(dest)
+            # Re-inserted (new rowid) rather than updated, so the old name's postings are tombstoned
+            self._conn.execute(
+                "INSERT INTO items (path, parent, name, name_lower, type, mtime) "
+                "SELECT ?, ?, ?, ?, type, mtime FROM items WHERE path = ?",
+                (dest, os.path.dirname(dest), name, name.lower(), src))
+            self._conn.execute("DELETE FROM items WHERE path = ?", (src,))
+            self._trigram_remove([row[1]])
+            self._trigram_add_paths([dest])
+        return True
+
+    # -------------------------
+    # Trigram index maintenance
+    # -------------------------
+    def _trigram_add_paths(self, paths):
+        """Mirror newly inserted rows (by path) into the trigram index"""
+        if self._trigrams is None:
+            return
+        for start in range(0, len(paths), SQL_VARIABLES):
+            chunk = paths[start:start + SQL_VARIABLES]
+            placeholders = ",".join("?" for _ in chunk)
+            for rowid, name in self._conn.execute(
+                    f"SELECT rowid, name FROM items WHERE path IN ({placeholders})", chunk):
+                self._trigrams.add(rowid, name)
+
+    def _trigram_remove(self, rowids):
+        if self._trigrams is None:
+            return
+        for rowid in rowids:
+            self._trigrams.remove(rowid)
+
+    def _fetch_items(self, rowids):
+        """{rowid: item} for trigram candidates"""
+        items = {}
+        with self._lock:
+            for start in range(0, len(rowids), SQL_VARIABLES):
+                chunk = rowids[start:start + SQL_VARIABLES]
+                placeholders = ",".join("?" for _ in chunk)
+                for row in self._conn.execute(
+                        f"SELECT rowid, name, path, type, mtime FROM items WHERE rowid IN ({placeholders})", chunk):
+                    items[row[0]] = self._row_to_item(row[1:])
+        return items
+
+    def _get_trigrams(self) -> TrigramIndex:
+        with self._lock:
+            if self._trigrams is None:
+                start = time.time()
+                trigrams = TrigramIndex(fetch_items=self._fetch_items)
+                for rowid, name in self._conn.execute("SELECT rowid, name FROM items"):
+                    trigrams.add(rowid, name)
+                self._trigrams = trigrams
+                logger.info(f"🔤 Trigram index loaded: {len(trigrams)} names ({time.time() - start:.1f}s)")
+            return self._trigrams
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    @staticmethod
+    def _row_to_item(row):
+        return {"name": row[0], "path": row[1], "type": row[2], "mtime": row[3]}
+
+    def exact_matches(self, name):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, path, type, mtime FROM items WHERE name_lower = ?", (name.lower().strip(),)).fetchall()
+        return [self._row_to_item(row) for row in rows]
+
+    def iter_items(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT name, path, type, mtime FROM items").fetchall()
+        for row in rows:
+            yield self._row_to_item(row)
+
+    def search(self, query, limit=10, min_score=0, predicate=None):
+        """Ranked [(item, score)] for a query: exact name matches first, then trigram candidates.
+        predicate(item) -> bool filters items before they are scored."""
+        results = [(item, 100) for item in self.exact_matches(query) if not predicate or predicate(item)]
+        seen = {item["path"] for item, _ in results}
+        matches = self._get_trigrams().search(query, limit=limit, min_score=min_score, predicate=predicate)
+        for item, score in matches:
+            if item["path"] not in seen:
+                results.append((item, score))
+        return results[:limit]
+
+    # -------------------------
+    # Open history (recency boosts)
+    # -------------------------
+    def record_open(self, path):
+        path = os.path.normpath(path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO opened (path, last_opened, count) VALUES (?, ?, 1) "
+                "ON CONFLICT(path) DO UPDATE SET last_opened = excluded.last_opened, count = count + 1",
+                (path, time.time()))
+            self._conn.commit()
+
+    def recent_opens(self, paths):
+        """{path: (last_opened, count)} for the given paths that were opened before"""
+        paths = list(paths)
+        if not paths:
+            return {}
+        placeholders = ",".join("?" for _ in paths)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT path, last_opened, count FROM opened WHERE path IN ({placeholders})", paths).fetchall()
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_file_index(roots=None) -> FileIndex:
+    """Shared FileIndex instance for the given roots"""
+    key = tuple(os.path.normpath(root) for root in (roots or INDEX_ROOTS))
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = FileIndex(roots=list(key))
+        return _indexes[key]
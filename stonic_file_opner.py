@@ -3,8 +3,10 @@ import subprocess
 import sys
 import logging
 import asyncio
-from fuzzywuzzy import process
 from livekit.agents import function_tool
+from stonic_file_index import get_file_index, INDEX_ROOTS
+from stonic_fs_watcher import start_file_watcher
+from stonic_file_search import search_files, best_file_match, record_open
 
 try:
     import pygetwindow as gw
@@ -38,35 +40,17 @@ async def focus_window(title_keyword: str) -> bool:
     logger.warning("⚠ No matching window found for focus.")
     return False
 
-# 🔍 Index all files and folders under specified directories
+# 🔍 Load the persistent index (built once, then refreshed incrementally)
 async def index_items(base_dirs):
-    index = []
-    for base_dir in base_dirs:
-        for root, dirs, files in os.walk(base_dir):
-            for name in files + dirs:
-                index.append({
-                    "name": name,
-                    "path": os.path.join(root, name),
-                    "type": "folder" if name in dirs else "file"
-                })
-    logger.info(f"✅ Indexed {len(index)} items from {base_dirs}")
+    index = get_file_index(base_dirs)
+    await asyncio.to_thread(index.ensure_fresh)
+    start_file_watcher(index)
+    logger.info(f"✅ Index ready with {index.count()} items from {base_dirs}")
     return index
 
-# 🎯 Search best match using fuzzy logic
+# 🎯 Search best match using the shared ranked search
 async def search_item(query, index):
-    choices = [item["name"] for item in index]
-    if not choices:
-        logger.warning("⚠ No files or folders to search.")
-        return None
-
-    best_match, score = process.extractOne(query, choices)
-    logger.info(f"🔍 Matched '{query}' to '{best_match}' (Score: {score})")
-
-    if score > 70:
-        for item in index:
-            if item["name"] == best_match:
-                return item
-    return None
+    return await asyncio.to_thread(best_file_match, query, index=index)
 
 # 🚀 Open the file or folder
 async def open_item(item):
@@ -77,6 +61,7 @@ async def open_item(item):
         else:
             subprocess.call(['open' if sys.platform == 'darwin' else 'xdg-open', item["path"]])
 
+        record_open(item["path"])  # Ranks higher in future searches
         await focus_window(item["name"])  # Optional: bring to front
         return f"✅ '{item['name']}' open हो गया।"
     except Exception as e:
@@ -95,7 +80,25 @@ async def handle_command(command, index):
 # 📢 Tool exposed to LiveKit
 @function_tool
 async def Play_file(name: str) -> str:
-    base_dirs = ["C:/"]  # 🔧 Change this as needed
-    index = await index_items(base_dirs)
+    index = await index_items(INDEX_ROOTS)
     command = name.strip()
     return await handle_command(command, index)
+
+# 📢 Ranked multi-result search exposed to LiveKit
+@function_tool
+async def find_files(query: str, file_type: str = "", extensions: str = "",
+                     modified_within_days: int = 0, limit: int = 5) -> str:
+    """Find files/folders by name and list the top matches with scores.
+    file_type: "file" or "folder"; extensions: e.g. "pdf docx"; modified_within_days: only recently changed items."""
+    index = await index_items(INDEX_ROOTS)
+    results = await asyncio.to_thread(
+        search_files, query, limit=max(1, min(limit, 20)), kind=file_type or None,
+        extensions=extensions or None, modified_within_days=modified_within_days or None, index=index)
+    if not results:
+        return "❌ कोई matching file या folder नहीं मिला।"
+
+    lines = [f"🔍 '{query}' के लिए top {len(results)} results:"]
+    for i, result in enumerate(results, start=1):
+        boost = f", recent +{result['boost']}" if result["boost"] else ""
+        lines.append(f"{i}. {result['name']} ({result['type']}, score {result['score']}{boost})\n   {result['path']}")
+    return "\n".join(lines)
@@ -0,0 +1,98 @@
+import os
+import time
+import logging
+
+from stonic_file_index import get_file_index
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Ranking configuration
+MIN_MATCH_SCORE = 70  # Fuzzy score a best match has to beat
+RECENT_BOOST_MAX = 15.0  # Points added for an item opened just now
+RECENT_HALF_LIFE_DAYS = 7.0  # The recency boost halves every this many days
+FREQUENCY_BOOST_PER_OPEN = 0.5  # Extra points per previous open...
+FREQUENCY_BOOST_MAX = 5.0  # ...up to this many points
+
+
+def _normalize_extensions(extensions):
+    if not extensions:
+        return None
+    if isinstance(extensions, str):
+        extensions = extensions.replace(",", " ").split()
+    return {ext.lower() if ext.startswith(".") else f".{ext.lower()}" for ext in extensions}
+
+
+def _build_filter(kind=None, extensions=None, modified_within_days=None):
+    """Turn the search filters into a predicate over index items (None when there are no filters)"""
+    kind = kind.lower().strip() if kind else None
+    extensions = _normalize_extensions(extensions)
+    modified_after = time.time() - modified_within_days * 86400 if modified_within_days else None
+    if not (kind or extensions or modified_after):
+        return None
+
+    def predicate(item):
+        if kind and item["type"] != kind:
+            return False
+        if extensions and os.path.splitext(item["name"])[1].lower() not in extensions:
+            return False
+        if modified_after and item.get("mtime", 0) < modified_after:
+            return False
+        return True
+
+    return predicate
+
+
+def _recency_boost(history, now):
+    """Boost for previously opened items: decays with age, grows slowly with the open count"""
+    if not history:
+        return 0.0
+    last_opened, count = history
+    age_days = max(0.0, now - last_opened) / 86400
+    recency = RECENT_BOOST_MAX * 0.5 ** (age_days / RECENT_HALF_LIFE_DAYS)
+    frequency = min(FREQUENCY_BOOST_MAX, FREQUENCY_BOOST_PER_OPEN * count)
+    return recency + frequency
+
+
+def search_files(query, limit=5, kind=None, extensions=None, modified_within_days=None, min_score=0, index=None):
+    """Top ranked files/folders from the precomputed index.
+
+    kind: "file" or "folder"; extensions: ".pdf" / "pdf mp3" / list; modified_within_days: mtime filter.
+    Each result is the index item plus "score" (fuzzy match), "boost" (recently opened) and "rank".
+    """
+    index = index or get_file_index()
+    query = query.strip()
+    if not query:
+        return []
+
+    predicate = _build_filter(kind, extensions, modified_within_days)
+    # Over-fetch so that recency boosts can lift items from just below the top N
+    matches = index.search(query, limit=limit * 4, min_score=min_score, predicate=predicate)
+    history = index.recent_opens(item["path"] for item, _ in matches)
+
+    now = time.time()
+    results = []
+    for item, score in matches:
+        boost = _recency_boost(history.get(item["path"]), now)
+        results.append({**item, "score": score, "boost": round(boost, 1), "rank": score + boost})
+    results.sort(key=lambda result: result["rank"], reverse=True)
+    return results[:limit]
+
+
+def best_file_match(query, min_score=MIN_MATCH_SCORE, index=None, **filters):
+    """Highest ranked result whose fuzzy score beats min_score, or None"""
+    for result in search_files(query, limit=5, index=index, **filters):
+        if result["score"] > min_score:
+            logger.info(f"🔍 Matched '{query}' to '{result['name']}' "
+                        f"(Score: {result['score']}, boost: {result['boost']})")
+            return result
+    logger.info(f"❌ No match above {min_score} for '{query}'")
+    return None
+
+
+def record_open(path, index=None):
+    """Remember that an item was opened, so it ranks higher next time"""
+    try:
+        (index or get_file_index()).record_open(path)
+    except Exception as e:
+        logger.warning(f"⚠ Could not record open for {path}: {e}")
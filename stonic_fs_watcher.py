@@ -0,0 +1,403 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import logging
+import threading
+import ctypes
+import ctypes.util
+
+from stonic_file_index import get_file_index, is_excluded
+
+try:
+    import win32con
+    import win32event
+    import win32file
+except ImportError:
+    win32file = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Watcher configuration (roots and excludes come from the file index)
+POLL_INTERVAL_SECONDS = 60  # Polling fallback: seconds between incremental walks after a change
+POLL_MAX_INTERVAL_SECONDS = 30 * 60  # Polling fallback: the interval doubles up to this while nothing changes
+WINDOWS_BUFFER_BYTES = 64 * 1024  # ReadDirectoryChangesW: change buffer per root
+MAX_WATCHES = 100000  # inotify: upper bound on watched folders
+MOVE_PAIR_SECONDS = 0.5  # inotify: wait this long for the MOVED_TO half of a rename
+
+# ReadDirectoryChangesW actions
+FILE_ACTION_ADDED = 1
+FILE_ACTION_REMOVED = 2
+FILE_ACTION_RENAMED_OLD_NAME = 4
+FILE_ACTION_RENAMED_NEW_NAME = 5
+
+# inotify constants (see <sys/inotify.h>)
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_inotify():
+    """Return libc with inotify functions, or None when inotify is not available"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileSystemWatcher:
+    """Streams created/deleted/moved events into the file index and to subscribers"""
+
+    def __init__(self, index, poll_interval=POLL_INTERVAL_SECONDS):
+        self.index = index
+        self.poll_interval = poll_interval
+        self.subscribers = []
+        self.backend = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._libc = _load_inotify()
+        self._fd = None
+        self._watches = {}  # wd -> folder path (inotify)
+        self._dir_handles = []  # Open root handles (ReadDirectoryChangesW)
+        self._pending_moves = {}  # cookie -> (path, type, time)
+
+    def subscribe(self, callback):
+        if callback not in self.subscribers:
+            self.subscribers.append(callback)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="fs-watcher", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        # Adding the inotify watches walks the roots, so it happens on the watcher thread too
+        if self._libc and self._init_inotify():
+            self.backend = "inotify"
+        elif win32file and self._init_windows():
+            self.backend = "ReadDirectoryChangesW"
+        else:
+            self.backend = "polling"
+        # Only native backends keep the index live; with polling, ensure_fresh still refreshes stale indexes
+        self.index.live = self.backend != "polling"
+        logger.info(f"👀 File watcher started ({self.backend}) for {self.index.roots}, "
+                    f"{len(self._watches) or len(self._dir_handles)} folders watched")
+        if self.backend == "inotify":
+            self._run_inotify()
+            self._close_inotify()
+        elif self.backend == "ReadDirectoryChangesW":
+            self._run_windows()
+        else:
+            self._run_polling()
+            return
+        if self._stop.is_set():
+            return
+
+        # The native watch died on an error: catch up on missed changes with a walk, then keep polling
+        logger.warning(f"⚠ {self.backend} watcher failed, falling back to polling")
+        self.index.live = False
+        self.backend = "polling"
+        self._dispatch({"event": "overflow", "path": "", "dest_path": None, "type": None})
+        self._run_polling()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._close_inotify()
+        self.index.live = False
+        logger.info("🛑 File watcher stopped")
+
+    def _close_inotify(self):
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass  # Already invalid, e.g. the error that ended the watch loop
+            self._watches.clear()
+
+    def _notify(self, event):
+        for callback in list(self.subscribers):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning(f"⚠ File watcher subscriber failed: {e}")
+
+    def _dispatch(self, event):
+        """Apply an event to the index, then fan it out to subscribers"""
+        try:
+            self.index.apply_event(event)
+        except Exception as e:
+            logger.warning(f"⚠ Could not apply {event['event']} event for {event['path']}: {e}")
+        self._notify(event)
+
+    def _excluded(self, path) -> bool:
+        """is_excluded for the path or any folder above it (whole-subtree watches report excluded folders too)"""
+        while True:
+            if is_excluded(path, self.index.excludes):
+                return True
+            parent = os.path.dirname(path)
+            if parent == path:
+                return False
+            path = parent
+
+    # -------------------------
+    # Polling fallback
+    # -------------------------
+    def _run_polling(self):
+        interval = self.poll_interval
+        while not self._stop.wait(interval):
+            changes = []
+
+            def on_event(event):
+                changes.append(event)
+                self._notify(event)
+
+            try:
+                # The incremental refresh only re-lists folders whose mtime changed
+                self.index.refresh(on_event=on_event)
+            except Exception as e:
+                logger.warning(f"⚠ Polling refresh failed: {e}")
+            # Back off while nothing changes, so an idle machine is not re-walked every minute
+            interval = self.poll_interval if changes else min(interval * 2, POLL_MAX_INTERVAL_SECONDS)
+
+    # -------------------------
+    # ReadDirectoryChangesW backend (Windows)
+    # -------------------------
+    def _init_windows(self) -> bool:
+        for root in self.index.roots:
+            try:
+                handle = win32file.CreateFile(
+                    root, 0x0001,  # FILE_LIST_DIRECTORY
+                    win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE | win32con.FILE_SHARE_DELETE,
+                    None, win32con.OPEN_EXISTING,
+                    win32con.FILE_FLAG_BACKUP_SEMANTICS | win32con.FILE_FLAG_OVERLAPPED, None)
+            except Exception as e:
+                logger.warning(f"⚠ Cannot watch {root}: {e}")
+                continue
+            overlapped = win32file.OVERLAPPED()
+            overlapped.hEvent = win32event.CreateEvent(None, True, False, None)
+            buffer = win32file.AllocateReadBuffer(WINDOWS_BUFFER_BYTES)
+            self._dir_handles.append((root, handle, overlapped, buffer))
+        return bool(self._dir_handles)
+
+    def _read_changes(self, handle, overlapped, buffer):
+        # One recursive watch per root; only names change (create/delete/rename), not contents
+        win32file.ReadDirectoryChangesW(
+            handle, buffer, True,
+            win32con.FILE_NOTIFY_CHANGE_FILE_NAME | win32con.FILE_NOTIFY_CHANGE_DIR_NAME, overlapped)
+
+    def _run_windows(self):
+        try:
+            for _, handle, overlapped, buffer in self._dir_handles:
+                self._read_changes(handle, overlapped, buffer)
+            events = [overlapped.hEvent for _, _, overlapped, _ in self._dir_handles]
+            while not self._stop.is_set():
+                rc = win32event.WaitForMultipleObjects(events, False, 1000)
+                if rc == win32event.WAIT_TIMEOUT:
+                    continue
+                root, handle, overlapped, buffer = self._dir_handles[rc - win32event.WAIT_OBJECT_0]
+                nbytes = win32file.GetOverlappedResult(handle, overlapped, True)
+                if nbytes:
+                    self._handle_windows_changes(root, win32file.FILE_NOTIFY_INFORMATION(buffer, nbytes))
+                else:
+                    # The change buffer overflowed, fall back to an incremental walk
+                    self._dispatch({"event": "overflow", "path": "", "dest_path": None, "type": None})
+                self._read_changes(handle, overlapped, buffer)
+        except Exception as e:
+            logger.warning(f"⚠ ReadDirectoryChangesW watcher stopped: {e}")
+        finally:
+            for _, handle, _, _ in self._dir_handles:
+                handle.Close()
+            self._dir_handles.clear()
+
+    def _handle_windows_changes(self, root, changes):
+        old_path = None
+        for action, relative in changes:
+            path = os.path.normpath(os.path.join(root, relative))
+            excluded = self._excluded(path)
+            if action == FILE_ACTION_RENAMED_OLD_NAME:
+                old_path = None if excluded else path
+                continue
+            if excluded:
+                if action == FILE_ACTION_RENAMED_NEW_NAME and old_path:
+                    # Renamed into an excluded folder
+                    self._dispatch({"event": "deleted", "path": old_path, "dest_path": None, "type": None})
+                old_path = None
+                continue
+
+            item_type = "folder" if os.path.isdir(path) else "file"
+            if action == FILE_ACTION_ADDED:
+                self._dispatch({"event": "created", "path": path, "dest_path": None, "type": item_type})
+            elif action == FILE_ACTION_REMOVED:
+                self._dispatch({"event": "deleted", "path": path, "dest_path": None, "type": None})
+            elif action == FILE_ACTION_RENAMED_NEW_NAME:
+                if old_path:
+                    self._dispatch({"event": "moved", "path": old_path, "dest_path": path, "type": item_type})
+                else:
+                    self._dispatch({"event": "created", "path": path, "dest_path": None, "type": item_type})
+                old_path = None
+
+    # -------------------------
+    # inotify backend
+    # -------------------------
+    def _init_inotify(self) -> bool:
+        fd = self._libc.inotify_init1(IN_CLOEXEC)
+        if fd < 0:
+            logger.warning(f"⚠ inotify_init1 failed: {os.strerror(ctypes.get_errno())}")
+            return False
+        self._fd = fd
+        for root in self.index.roots:
+            self._add_watch_tree(root)
+        return True
+
+    def _add_watch_tree(self, top):
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            if is_excluded(directory, self.index.excludes):
+                continue
+            if len(self._watches) >= MAX_WATCHES:
+                logger.warning(f"⚠ Watch limit ({MAX_WATCHES}) reached, {directory} and below not watched")
+                return
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err == errno.ENOSPC:
+                    logger.warning("⚠ fs.inotify.max_user_watches exhausted, some folders are not watched")
+                    return
+                continue
+            self._watches[wd] = directory
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError:
+                continue
+
+    def _rewrite_watch_paths(self, src, dest):
+        prefix = src + os.sep
+        for wd, path in list(self._watches.items()):
+            if path == src:
+                self._watches[wd] = dest
+            elif path.startswith(prefix):
+                self._watches[wd] = dest + path[len(src):]
+
+    def _run_inotify(self):
+        while not self._stop.is_set():
+            try:
+                ready, _, _ = select.select([self._fd], [], [], 1.0)
+            except (OSError, ValueError):
+                break
+            if ready:
+                try:
+                    data = os.read(self._fd, 64 * 1024)
+                except OSError:
+                    break
+                self._handle_inotify_data(data)
+            self._flush_pending_moves()
+
+    def _handle_inotify_data(self, data):
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            raw_name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                self._dispatch({"event": "overflow", "path": "", "dest_path": None, "type": None})
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            parent = self._watches.get(wd)
+            if parent is None or not raw_name:
+                continue
+            path = os.path.join(parent, os.fsdecode(raw_name))
+            if is_excluded(path, self.index.excludes):
+                continue
+            item_type = "folder" if mask & IN_ISDIR else "file"
+
+            if mask & IN_CREATE:
+                if item_type == "folder":
+                    self._add_watch_tree(path)
+                self._dispatch({"event": "created", "path": path, "dest_path": None, "type": item_type})
+            elif mask & IN_DELETE:
+                self._dispatch({"event": "deleted", "path": path, "dest_path": None, "type": item_type})
+            elif mask & IN_MOVED_FROM:
+                self._pending_moves[cookie] = (path, item_type, time.monotonic())
+            elif mask & IN_MOVED_TO:
+                source = self._pending_moves.pop(cookie, None)
+                if source:
+                    if item_type == "folder":
+                        self._rewrite_watch_paths(source[0], path)
+                    self._dispatch({"event": "moved", "path": source[0], "dest_path": path, "type": item_type})
+                else:
+                    # Moved in from an unwatched location
+                    if item_type == "folder":
+                        self._add_watch_tree(path)
+                    self._dispatch({"event": "created", "path": path, "dest_path": None, "type": item_type})
+
+    def _flush_pending_moves(self):
+        """A MOVED_FROM without its MOVED_TO means the item left the watched roots"""
+        now = time.monotonic()
+        for cookie, (path, item_type, seen) in list(self._pending_moves.items()):
+            if now - seen >= MOVE_PAIR_SECONDS:
+                del self._pending_moves[cookie]
+                self._dispatch({"event": "deleted", "path": path, "dest_path": None, "type": item_type})
+
+
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+
+def start_file_watcher(index=None) -> FileSystemWatcher:
+    """Start (once) the background watcher that keeps the given file index live"""
+    index = index or get_file_index()
+    with _watchers_lock:
+        watcher = _watchers.get(id(index))
+        if watcher is None:
+            watcher = FileSystemWatcher(index)
+            _watchers[id(index)] = watcher
+        if not watcher.is_running():
+            watcher.start()
+    return watcher
+
+
+def subscribe(callback, index=None):
+    """Receive created/deleted/moved events for the (default) file index"""
+    index = index or get_file_index()
+    with _watchers_lock:
+        watcher = _watchers.get(id(index))
+        if watcher is None:
+            watcher = FileSystemWatcher(index)
+            _watchers[id(index)] = watcher
+    watcher.subscribe(callback)
+    return watcher
@@ -1,6 +1,6 @@
 import os
 import logging
-import requests
+from stonic_http import http_client
 from dotenv import load_dotenv
 from livekit.agents import function_tool
 
@@ -36,7 +36,7 @@ def generate_image(prompt: str) -> str:
     # Translate Hindi to English if needed
     if is_hindi(prompt):
         try:
-            trans = requests.post(
+            trans = http_client.post(
                 "https://translate.googleapis.com/translate_a/single",
                 params={"client": "gtx", "sl": "hi", "tl": "en", "dt": "t", "q": prompt}
             )
@@ -69,7 +69,7 @@ def generate_image(prompt: str) -> str:
     }
 
     try:
-        response = requests.post(API_URL, headers=headers, json=payload, timeout=90)  # Increased timeout
+        response = http_client.post(API_URL, headers=headers, json=payload, timeout=90)  # Increased timeout
 
         if response.status_code == 200:
             import datetime
@@ -91,7 +91,7 @@ def generate_image(prompt: str) -> str:
                     image_url = json_data.get("url") or json_data.get("image_url")
                     if image_url:
                         # Download image from URL
-                        img_response = requests.get(image_url)
+                        img_response = http_client.get(image_url)
                         if img_response.status_code == 200:
                             with open(filepath, "wb") as f:
                                 f.write(img_response.content)
@@ -126,7 +126,7 @@ def generate_image_alternative(prompt: str, model: str = "runwayml/stable-diffus
     # Translate Hindi to English if needed
     if is_hindi(prompt):
         try:
-            trans = requests.post(
+            trans = http_client.post(
                 "https://translate.googleapis.com/translate_a/single",
                 params={"client": "gtx", "sl": "hi", "tl": "en", "dt": "t", "q": prompt}
             )
@@ -142,7 +142,7 @@ def generate_image_alternative(prompt: str, model: str = "runwayml/stable-diffus
     payload = {"inputs": prompt_en}
     
     try:
-        response = requests.post(API_URL, headers=headers, json=payload, timeout=60)
+        response = http_client.post(API_URL, headers=headers, json=payload, timeout=60)
         
         if response.status_code == 200:
             import datetime
@@ -182,7 +182,7 @@ def generate_code(prompt: str, language: str = "python") -> str:
     # Translate Hindi to English if needed
     if is_hindi(prompt):
         try:
-            trans = requests.post(
+            trans = http_client.post(
                 "https://translate.googleapis.com/translate_a/single",
                 params={"client": "gtx", "sl": "hi", "tl": "en", "dt": "t", "q": prompt}
             )
@@ -199,7 +199,7 @@ Make sure the code is properly formatted and follows best practices."""
     
     # Call Groq API
     try:
-        response = requests.post(
+        response = http_client.post(
             "https://api.groq.com/openai/v1/chat/completions",
             headers={
                 "Authorization": f"Bearer {groq_api_key}",
@@ -325,7 +325,7 @@ def generate_code_advanced(prompt: str, language: str = "python", model: str = "
     # Translate Hindi to English if needed
     if is_hindi(prompt):
         try:
-            trans = requests.post(
+            trans = http_client.post(
                 "https://translate.googleapis.com/translate_a/single",
                 params={"client": "gtx", "sl": "hi", "tl": "en", "dt": "t", "q": prompt}
             )
@@ -344,7 +344,7 @@ Only return the code without additional explanations unless specifically request
     user_prompt = f"Create a {language} solution for: {prompt_en}"
     
     try:
-        response = requests.post(
+        response = http_client.post(
             "https://api.groq.com/openai/v1/chat/completions",
             headers={
                 "Authorization": f"Bearer {groq_api_key}",
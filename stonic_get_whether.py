@@ -1,5 +1,7 @@
 import os
-import requests
+import socket
+from stonic_http import async_http_client
+from stonic_ttl_cache import TTLCache, normalize_key
 import logging
 from dotenv import load_dotenv
 from livekit.agents import function_tool  # ✅ Correct decorator
@@ -10,21 +12,77 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def detect_city_by_ip() -> str:
+# Caches: IP based city per network, weather per city
+CITY_CACHE_TTL_SECONDS = 12 * 60 * 60  # Re-detect the city at most twice a day (or on a network change)
+CITY_CACHE_FILE = "stonic_city_cache.json"  # Set to None to keep the detected city in memory only
+WEATHER_CACHE_TTL_SECONDS = 10 * 60  # Weather for a city is reused for 10 minutes
+city_cache = TTLCache("ip_city", CITY_CACHE_TTL_SECONDS, max_entries=16, persist_file=CITY_CACHE_FILE)
+weather_cache = TTLCache("weather", WEATHER_CACHE_TTL_SECONDS, max_entries=64)
+
+
+class WeatherAPIError(Exception):
+    """OpenWeather returned an error; the message is meant for the user and is never cached"""
+
+
+def _network_fingerprint() -> str:
+    """Local address of the default route. Changes when the machine joins another network.
+    Connecting a UDP socket only does a routing lookup, no packet is sent."""
     try:
-        logger.info("IP के ज़रिए शहर detect करने की कोशिश की जा रही है")
-        ip_info = requests.get("https://ipapi.co/json/").json()
-        city = ip_info.get("city")
-        if city:
-            logger.info(f"IP से शहर Detect किया गया: {city}")
-            return city
-        else:
-            logger.warning("City detect करने में विफल, default 'Delhi' इस्तेमाल किया जा रहा है।")
-            return "Delhi"
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+    except OSError:
+        return "offline"
+
+
+async def _lookup_city_by_ip() -> str:
+    logger.info("IP के ज़रिए शहर detect करने की कोशिश की जा रही है")
+    response = await async_http_client.get("https://ipapi.co/json/")
+    city = response.json().get("city")
+    if not city:
+        raise ValueError("ipapi.co response has no city")
+    logger.info(f"IP से शहर Detect किया गया: {city}")
+    return city
+
+async def detect_city_by_ip() -> str:
+    try:
+        return await city_cache.get_or_fetch(_network_fingerprint(), _lookup_city_by_ip)
+    except ValueError:
+        logger.warning("City detect करने में विफल, default 'Delhi' इस्तेमाल किया जा रहा है।")
+        return "Delhi"
     except Exception as e:
         logger.error(f"IP से city detect करने में error आया: {e}")
         return "Delhi"
 
+async def _fetch_weather(city, api_key) -> str:
+    logger.info(f"City के लिए weather fetch किया जा रहा है।: {city}")
+    url = "https://api.openweathermap.org/data/2.5/weather"
+    params = {
+        "q": city,
+        "appid": api_key,
+        "units": "metric"
+    }
+
+    response = await async_http_client.get(url, params=params)
+    if response.status_code != 200:
+        logger.error(f"OpenWeather API में error आया।: {response.status_code} - {response.text}")
+        raise WeatherAPIError(f"Error: {city} के लिए weather fetch नहीं कर पाए। कृपया city name चेक करें।")
+
+    data = response.json()
+    weather = data["weather"][0]["description"].title()
+    temperature = data["main"]["temp"]
+    humidity = data["main"]["humidity"]
+    wind_speed = data["wind"]["speed"]
+
+    result = (f"Weather in {city}:\n"
+              f"- Condition: {weather}\n"
+              f"- Temperature: {temperature}°C\n"
+              f"- Humidity: {humidity}%\n"
+              f"- Wind Speed: {wind_speed} m/s")
+
+    logger.info(f"Weather result: \n{result}")
+    return result
+
 @function_tool
 async def get_weather(city: str = "") -> str:
     
@@ -35,37 +93,13 @@ async def get_weather(city: str = "") -> str:
         return "Environment variables में OpenWeather API key नहीं मिली।"
 
     if not city:
-        city = detect_city_by_ip()
-
-    logger.info(f"City के लिए weather fetch किया जा रहा है।: {city}")
-    url = "https://api.openweathermap.org/data/2.5/weather"
-    params = {
-        "q": city,
-        "appid": api_key,
-        "units": "metric"
-    }
+        city = await detect_city_by_ip()
 
     try:
-        response = requests.get(url, params=params)
-        if response.status_code != 200:
-            logger.error(f"OpenWeather API में error आया।: {response.status_code} - {response.text}")
-            return f"Error: {city} के लिए weather fetch नहीं कर पाए। कृपया city name चेक करें।"
-
-        data = response.json()
-        weather = data["weather"][0]["description"].title()
-        temperature = data["main"]["temp"]
-        humidity = data["main"]["humidity"]
-        wind_speed = data["wind"]["speed"]
-
-        result = (f"Weather in {city}:\n"
-                  f"- Condition: {weather}\n"
-                  f"- Temperature: {temperature}°C\n"
-                  f"- Humidity: {humidity}%\n"
-                  f"- Wind Speed: {wind_speed} m/s")
-
-        logger.info(f"Weather result: \n{result}")
-        return result
+        return await weather_cache.get_or_fetch(normalize_key(city), lambda: _fetch_weather(city, api_key))
 
+    except WeatherAPIError as e:
+        return str(e)
     except Exception as e:
         logger.exception(f"Weather fetch करते समय exception आया: {e}")
         return "Weather fetch करते समय एक error आया"
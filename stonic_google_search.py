@@ -1,5 +1,6 @@
 import os
-import requests
+from stonic_http import async_http_client
+from stonic_ttl_cache import TTLCache, normalize_key
 import logging
 from dotenv import load_dotenv
 from livekit.agents import function_tool  # ✅ Correct decorator
@@ -12,17 +13,19 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@function_tool
-async def google_search(query: str) -> str:
-    logger.info(f"Query प्राप्त हुई।: {query}")
+# Search results cache (keyed on normalized query text)
+SEARCH_CACHE_TTL_SECONDS = 30 * 60  # Results are fresh for 30 minutes
+SEARCH_CACHE_STALE_SECONDS = 6 * 60 * 60  # Then served for up to 6 hours while refreshing in the background
+SEARCH_CACHE_FILE = "stonic_search_cache.json"  # Set to None to keep the cache in memory only
+search_cache = TTLCache("google_search", SEARCH_CACHE_TTL_SECONDS, max_entries=500,
+                        stale_seconds=SEARCH_CACHE_STALE_SECONDS, persist_file=SEARCH_CACHE_FILE)
 
-    api_key = os.getenv("GOOGLE_SEARCH_API_KEY")
-    search_engine_id = os.getenv("SEARCH_ENGINE_ID")
 
-    if not api_key or not search_engine_id:
-        logger.error("API key या Search Engine ID missing है।")
-        return "Environment variables में API key या Search Engine ID missing है।"
+class SearchAPIError(Exception):
+    """Google API returned an error; the message is meant for the user and is never cached"""
+
 
+async def _fetch_search_results(query, api_key, search_engine_id) -> str:
     url = "https://www.googleapis.com/customsearch/v1"
     params = {
         "key": api_key,
@@ -32,11 +35,11 @@ async def google_search(query: str) -> str:
     }
 
     logger.info("Google Custom Search API को request भेजी जा रही है...")
-    response = requests.get(url, params=params)
+    response = await async_http_client.get(url, params=params)
 
     if response.status_code != 200:
         logger.error(f"Google API में error आया: {response.status_code} - {response.text}")
-        return f"Google Search API में error आया: {response.status_code} - {response.text}"
+        raise SearchAPIError(f"Google Search API में error आया: {response.status_code} - {response.text}")
 
     data = response.json()
     results = data.get("items", [])
@@ -56,6 +59,27 @@ async def google_search(query: str) -> str:
 
     return formatted.strip()
 
+@function_tool
+async def google_search(query: str) -> str:
+    logger.info(f"Query प्राप्त हुई।: {query}")
+
+    api_key = os.getenv("GOOGLE_SEARCH_API_KEY")
+    search_engine_id = os.getenv("SEARCH_ENGINE_ID")
+
+    if not api_key or not search_engine_id:
+        logger.error("API key या Search Engine ID missing है।")
+        return "Environment variables में API key या Search Engine ID missing है।"
+
+    key = normalize_key(query)
+    try:
+        result = await search_cache.get_or_fetch(
+            key, lambda: _fetch_search_results(query, api_key, search_engine_id))
+    except SearchAPIError as e:
+        return str(e)
+
+    logger.debug(f"Search cache stats: {search_cache.stats()}")
+    return result
+
 @function_tool
 async def get_current_datetime() -> str:
     return datetime.now().isoformat()
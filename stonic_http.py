@@ -0,0 +1,149 @@
+import json
+import asyncio
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Shared HTTP client configuration
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds, used when a call does not pass its own timeout
+MAX_RETRIES = 3  # Retries for connection errors and RETRY_STATUSES
+BACKOFF_FACTOR = 0.5  # Sleeps 0.5s, 1s, 2s... between retries
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+POOL_HOSTS = 10  # Number of per-host connection pools kept alive
+POOL_MAXSIZE = 10  # Keep-alive connections per host
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})  # POSTs are only retried on connection errors
+
+
+class HttpClient:
+    """Keep-alive requests.Session with per-host connection pools, default timeouts and retries"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR):
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            raise_on_status=False,  # Hand the last response back so callers can report it
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, url, timeout=None, **kwargs) -> requests.Response:
+        return self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+
+    def get(self, url, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncResponse:
+    """Fully read aiohttp response with the parts of the requests.Response API the tools use"""
+
+    def __init__(self, status_code, content, headers, url):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class AsyncHttpClient:
+    """aiohttp counterpart of HttpClient, one pooled keep-alive session per event loop"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._sessions = {}  # event loop -> ClientSession
+        self._lock = threading.Lock()
+
+    def _client_timeout(self, timeout):
+        timeout = timeout or self.timeout
+        if isinstance(timeout, tuple):
+            return aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        return aiohttp.ClientTimeout(total=timeout)
+
+    def _session(self):
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is not installed")
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(limit=POOL_HOSTS * POOL_MAXSIZE, limit_per_host=POOL_MAXSIZE,
+                                                 keepalive_timeout=60)
+                session = aiohttp.ClientSession(connector=connector)
+                self._sessions[loop] = session
+            return session
+
+    async def request(self, method, url, timeout=None, retries=None, **kwargs) -> AsyncResponse:
+        retries = self.retries if retries is None else retries
+        method = method.upper()
+        attempt = 0
+        while True:
+            try:
+                async with self._session().request(method, url, timeout=self._client_timeout(timeout),
+                                                   **kwargs) as response:
+                    content = await response.read()
+                    result = AsyncResponse(response.status, content, dict(response.headers), str(response.url))
+                retryable = method in RETRY_METHODS and result.status_code in RETRY_STATUSES
+                if not retryable or attempt >= retries:
+                    return result
+            except aiohttp.ClientConnectionError as e:
+                # Failed connects are retried for every method (nothing was sent), other errors only when idempotent
+                if attempt >= retries or (method not in RETRY_METHODS and not isinstance(e, aiohttp.ClientConnectorError)):
+                    raise
+            except asyncio.TimeoutError:
+                if attempt >= retries or method not in RETRY_METHODS:
+                    raise
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+            attempt += 1
+
+    async def get(self, url, **kwargs) -> AsyncResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs) -> AsyncResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+        if session and not session.closed:
+            await session.close()
+
+
+# Shared clients used by every tool module
+http_client = HttpClient()
+async_http_client = AsyncHttpClient()
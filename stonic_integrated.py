@@ -1,30 +1,18 @@
-import os
-import json
 import logging
-import asyncio
-import threading
 import subprocess
 import sys
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, make_response
 from flask_socketio import SocketIO, emit
-import queue
-import time
+import uuid
 
 # Import your existing Stonic components
-from stonic_state import set_sleep_state, get_sleep_state, is_jarvis_sleeping
-from stonic_google_search import google_search, get_current_datetime
-from stonic_get_whether import get_weather
-from stonic_window_CTRL import open, close, folder_file
-from stonic_file_opner import Play_file
-from stonic_youtube_control import YouTube_control
-from keyboard_mouse_CTRL import (
-    move_cursor_tool, mouse_click_tool, scroll_cursor_tool, type_text_tool,
-    press_key_tool, swipe_gesture_tool, press_hotkey_tool, control_volume_tool
-)
-from stonic_gen_tools import generate_image, generate_image_alternative, generate_code_advanced, generate_code, save_output
-from stonic_system_control import system_shutdown, system_restart, system_lock
-from stonic_code_fixer import check_code_errors, paste_fixed_code, start_code_monitoring, stop_code_monitoring
+from stonic_state import set_sleep_state, get_sleep_state, is_jarvis_sleeping, sleep_state
+from stonic_tool_registry import lazy_callable
+from stonic_intent_router import command_router
+from stonic_async_executor import tool_executor, ToolTimeout
+from stonic_job_queue import JobQueue, QueueFull
+from stonic_commands import register_default_commands, PRIORITY_STATE
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -34,6 +22,8 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = 'jarvis_secret_key_2024'
 socketio = SocketIO(app, cors_allowed_origins="*")
 
+CLIENT_COOKIE = 'stonic_client_id'  # Per-browser id for HTTP callers that don't send X-Client-Id
+
 # Global state management
 jarvis_state = {
     'is_listening': False,
@@ -45,47 +35,62 @@ jarvis_state = {
     'agent_running': False
 }
 
-# Command queue for processing
-command_queue = queue.Queue()
-response_queue = queue.Queue()
 
 # Agent process management
 agent_process = None
 
 class JarvisIntegratedInterface:
     def __init__(self):
+        # Tool modules are imported on first call, not at server startup
         self.tools = {
-            'google_search': google_search,
-            'get_current_datetime': get_current_datetime,
-            'get_weather': get_weather,
-            'open': open,
-            'close': close,
-            'folder_file': folder_file,
-            'play_file': Play_file,
-            'youtube_control': YouTube_control,
-            'move_cursor': move_cursor_tool,
-            'mouse_click': mouse_click_tool,
-            'scroll_cursor': scroll_cursor_tool,
-            'type_text': type_text_tool,
-            'press_key': press_key_tool,
-            'press_hotkey': press_hotkey_tool,
-            'control_volume': control_volume_tool,
-            'swipe_gesture': swipe_gesture_tool,
-            'generate_image': generate_image,
-            'generate_code': generate_code,
-            'generate_code_advanced': generate_code_advanced,
-            'save_output': save_output,
-            'system_shutdown': system_shutdown,
-            'system_restart': system_restart,
-            'system_lock': system_lock,
-            'check_code_errors': check_code_errors,
-            'paste_fixed_code': paste_fixed_code,
-            'start_code_monitoring': start_code_monitoring,
-            'stop_code_monitoring': stop_code_monitoring,
+            'google_search': lazy_callable('google_search'),
+            'get_current_datetime': lazy_callable('get_current_datetime'),
+            'get_weather': lazy_callable('get_weather'),
+            'open': lazy_callable('open'),
+            'close': lazy_callable('close'),
+            'folder_file': lazy_callable('folder_file'),
+            'play_file': lazy_callable('Play_file'),
+            'find_files': lazy_callable('find_files'),
+            'youtube_control': lazy_callable('YouTube_control'),
+            'move_cursor': lazy_callable('move_cursor_tool'),
+            'mouse_click': lazy_callable('mouse_click_tool'),
+            'scroll_cursor': lazy_callable('scroll_cursor_tool'),
+            'type_text': lazy_callable('type_text_tool'),
+            'press_key': lazy_callable('press_key_tool'),
+            'press_hotkey': lazy_callable('press_hotkey_tool'),
+            'control_volume': lazy_callable('control_volume_tool'),
+            'swipe_gesture': lazy_callable('swipe_gesture_tool'),
+            'generate_image': lazy_callable('generate_image'),
+            'generate_code': lazy_callable('generate_code'),
+            'generate_code_advanced': lazy_callable('generate_code_advanced'),
+            'save_output': lazy_callable('save_output'),
+            'system_shutdown': lazy_callable('system_shutdown'),
+            'system_restart': lazy_callable('system_restart'),
+            'system_lock': lazy_callable('system_lock'),
+            'check_code_errors': lazy_callable('check_and_fix_code'),
+            'paste_fixed_code': lazy_callable('paste_fixed_code'),
+            'start_code_monitoring': lazy_callable('start_code_monitoring'),
+            'stop_code_monitoring': lazy_callable('stop_code_monitoring'),
             'set_sleep_state': set_sleep_state,
             'get_sleep_state': get_sleep_state,
-            'is_jarvis_sleeping': is_jarvis_sleeping
+            'is_jarvis_sleeping': is_jarvis_sleeping,
+            'morning_briefing': lazy_callable('morning_briefing')
         }
+        register_default_commands(command_router)
+        command_router.register("agent_start", ["start agent", "agent start"],
+                                self._start_agent_command, priority=PRIORITY_STATE)
+        command_router.register("agent_stop", ["stop agent", "agent stop"],
+                                self._stop_agent_command, priority=PRIORITY_STATE)
+    
+    def _start_agent_command(self, command, query):
+        if self.start_agent():
+            return "Stonic agent is now running and ready for voice interaction."
+        return "Failed to start the agent. Please check the logs."
+    
+    def _stop_agent_command(self, command, query):
+        if self.stop_agent():
+            return "Stonic agent has been stopped."
+        return "Failed to stop the agent."
     
     def start_agent(self):
         """Start the LiveKit agent in a separate process"""
@@ -109,7 +114,6 @@ class JarvisIntegratedInterface:
     
     def stop_agent(self):
         """Stop the LiveKit agent"""
-        global agent_process
         try:
             if agent_process and agent_process.poll() is None:
                 agent_process.terminate()
@@ -128,126 +132,34 @@ class JarvisIntegratedInterface:
     def process_command(self, command):
         """Process user commands and return responses"""
         try:
-            # Check sleep state first
-            sleep_state = get_sleep_state()
-            jarvis_state['sleep_state'] = sleep_state
+            # Check sleep state first (held in memory, kept in sync with the agent process)
+            sleeping = sleep_state.get()
+            jarvis_state['sleep_state'] = sleeping
             
-            if sleep_state:
-                # Check for wake-up commands
-                wake_commands = ["wake up stonic", "uth jao", "jaago", "stonic uth jao", "wake up stonic"]
-                if any(wake_cmd in command.lower() for wake_cmd in wake_commands):
-                    set_sleep_state(False)
+            if sleeping:
+                # Only wake-up commands are answered while sleeping
+                match = command_router.match(command, names=("wake",))
+                if match:
                     jarvis_state['sleep_state'] = False
-                    return "Stonic is now awake and ready to assist you."
-                else:
-                    return None  # Silent in sleep mode
-            
-            # Process commands when awake
-            command_lower = command.lower()
+                    return tool_executor.run(match.run, name=match.name)
+                return None  # Silent in sleep mode
             
-            # Agent control commands
-            if "start agent" in command_lower or "agent start" in command_lower:
-                if self.start_agent():
-                    return "Stonic agent is now running and ready for voice interaction."
-                else:
-                    return "Failed to start the agent. Please check the logs."
+            # Process commands when awake: one pass over the text finds every trigger
+            match = command_router.match(command)
+            if match is None:
+                # Default response for unrecognized commands
+                return f"I understand you said: '{command}'. I'm still learning to process this type of request. Please try a different command or be more specific."
             
-            if "stop agent" in command_lower or "agent stop" in command_lower:
-                if self.stop_agent():
-                    return "Stonic agent has been stopped."
-                else:
-                    return "Failed to stop the agent."
-            
-            # Sleep commands
-            sleep_commands = ["stonic go to sleep", "so jao", "sone chalo", "sleep now", "stonic so jao", "sleep mode", "sleep stonic", "chup ho jao"]
-            if any(sleep_cmd in command_lower for sleep_cmd in sleep_commands):
-                set_sleep_state(True)
+            logger.info(f"🧭 Routed '{command}' to {match.name} (trigger: '{match.trigger}')")
+            # Tools (async or blocking) run on the executor's loop thread with a per-tool timeout
+            response = tool_executor.run(match.run, name=match.name)
+            if match.name == "sleep":
                 jarvis_state['sleep_state'] = True
-                return "Going to sleep mode..."
-            
-            # Weather commands
-            if "weather" in command_lower or "mausam" in command_lower:
-                return get_weather()
-            
-            # Time commands
-            if "time" in command_lower or "samay" in command_lower or "kitne baje" in command_lower:
-                return get_current_datetime()
-            
-            # Google search
-            if "search" in command_lower or "google" in command_lower or "dhundho" in command_lower:
-                # Extract search query
-                search_terms = ["search for", "google", "dhundho"]
-                query = command
-                for term in search_terms:
-                    if term in command_lower:
-                        query = command[command_lower.find(term) + len(term):].strip()
-                        break
-                return google_search(query)
-            
-            # YouTube commands
-            if "youtube" in command_lower or "video" in command_lower:
-                # Extract video query
-                video_terms = ["play", "search", "dikhao"]
-                query = command
-                for term in video_terms:
-                    if term in command_lower:
-                        query = command[command_lower.find(term) + len(term):].strip()
-                        break
-                return YouTube_control(query)
-            
-            # File operations
-            if "open" in command_lower or "kholo" in command_lower:
-                # Extract file/app name
-                open_terms = ["open", "kholo"]
-                target = command
-                for term in open_terms:
-                    if term in command_lower:
-                        target = command[command_lower.find(term) + len(term):].strip()
-                        break
-                return open(target)
-            
-            # Volume control
-            if "volume" in command_lower or "aawaz" in command_lower:
-                if "up" in command_lower or "badhao" in command_lower:
-                    return control_volume_tool("up")
-                elif "down" in command_lower or "kam karo" in command_lower:
-                    return control_volume_tool("down")
-                elif "mute" in command_lower or "band karo" in command_lower:
-                    return control_volume_tool("mute")
-            
-            # System controls
-            if "shutdown" in command_lower or "band karo" in command_lower:
-                return system_shutdown()
-            elif "restart" in command_lower or "restart karo" in command_lower:
-                return system_restart()
-            elif "lock" in command_lower or "lock karo" in command_lower:
-                return system_lock()
-            
-            # Code generation
-            if "generate code" in command_lower or "code banao" in command_lower:
-                # Extract code description
-                code_terms = ["generate code", "code banao"]
-                description = command
-                for term in code_terms:
-                    if term in command_lower:
-                        description = command[command_lower.find(term) + len(term):].strip()
-                        break
-                return generate_code(description)
-            
-            # Image generation
-            if "generate image" in command_lower or "image banao" in command_lower:
-                # Extract image description
-                image_terms = ["generate image", "image banao"]
-                description = command
-                for term in image_terms:
-                    if term in command_lower:
-                        description = command[command_lower.find(term) + len(term):].strip()
-                        break
-                return generate_image(description)
-            
-            # Default response for unrecognized commands
-            return f"I understand you said: '{command}'. I'm still learning to process this type of request. Please try a different command or be more specific."
+            return response
             
+        except ToolTimeout as e:
+            logger.error(f"Tool timed out: {e}")
+            return f"Sorry, that took too long: {str(e)}"
         except Exception as e:
             logger.error(f"Error processing command: {e}")
             return f"Sorry, I encountered an error while processing your command: {str(e)}"
@@ -255,6 +167,42 @@ class JarvisIntegratedInterface:
 # Initialize Stonic interface
 jarvis_interface = JarvisIntegratedInterface()
 
+def run_command_job(job):
+    """Worker side of the command queue"""
+    jarvis_state['last_command'] = job.command
+    jarvis_state['current_status'] = 'Processing'
+    return jarvis_interface.process_command(job.command)
+
+def emit_job_result(job):
+    """Push a finished job to its client (or everyone) over the jarvis_response event"""
+    queue_stats = command_queue.stats()
+    jarvis_state['current_status'] = 'Processing' if queue_stats['running'] or queue_stats['pending'] else 'Ready'
+    response = job.result if job.status == 'done' else f"Sorry, I encountered an error while processing your command: {job.error}"
+    if not response:
+        return  # Silent response (sleep mode)
+    
+    jarvis_state['last_response'] = response
+    socketio.emit('jarvis_response', {
+        'job_id': job.id,
+        'command': job.command,
+        'response': response,
+        'timestamp': datetime.now().isoformat()
+    }, to=job.reply_to)
+
+def on_sleep_state_change(sleeping):
+    """Push sleep/wake changes (from any process, e.g. the voice agent) to connected clients"""
+    jarvis_state['sleep_state'] = sleeping
+    jarvis_state['current_status'] = 'Sleeping' if sleeping else 'Ready'
+    socketio.emit('status_update', {
+        'sleep_state': sleeping,
+        'status': jarvis_state['current_status']
+    })
+
+sleep_state.subscribe(on_sleep_state_change)
+
+# Command queue: workers run commands off the request threads, results go out over Socket.IO
+command_queue = JobQueue(run_command_job, on_done=emit_job_result)
+
 @app.route('/')
 def index():
     """Serve the main Stonic UI"""
@@ -278,6 +226,27 @@ def get_status():
         'last_response': jarvis_state['last_response']
     })
 
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Status and result of a queued command"""
+    job = command_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job id'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/tools/stats')
+def get_tool_stats():
+    """Per-tool call counts and latencies from the async tool executor, plus command queue depth"""
+    return jsonify({'tools': tool_executor.stats(), 'queue': command_queue.stats()})
+
+def http_client_id():
+    """Fairness key for an HTTP caller: X-Client-Id, else the browser's cookie id, else a new id.
+    The remote address alone would lump every local browser into one client."""
+    client_id = request.headers.get('X-Client-Id') or request.cookies.get(CLIENT_COOKIE)
+    if client_id:
+        return client_id, False
+    return uuid.uuid4().hex, True
+
 @app.route('/api/command', methods=['POST'])
 def process_command():
     """Process a command from the web interface"""
@@ -288,38 +257,21 @@ def process_command():
         if not command:
             return jsonify({'error': 'No command provided'}), 400
         
-        # Update state
-        jarvis_state['last_command'] = command
-        jarvis_state['current_status'] = 'Processing'
-        
-        # Process command
-        response = jarvis_interface.process_command(command)
+        # Queue the command; the result is pushed over the jarvis_response event
+        client_id, new_client = http_client_id()
+        try:
+            job = command_queue.submit(client_id, command)
+        except QueueFull as e:
+            return jsonify({'error': str(e)}), 429, {'Retry-After': '2'}
         
-        if response:
-            jarvis_state['last_response'] = response
-            jarvis_state['current_status'] = 'Ready'
-            
-            # Emit response to connected clients
-            socketio.emit('jarvis_response', {
-                'command': command,
-                'response': response,
-                'timestamp': datetime.now().isoformat()
-            })
-            
-            return jsonify({
-                'success': True,
-                'response': response,
-                'status': jarvis_state['current_status']
-            })
-        else:
-            # Silent response (sleep mode)
-            jarvis_state['current_status'] = 'Ready'
-            return jsonify({
-                'success': True,
-                'response': '',
-                'status': jarvis_state['current_status'],
-                'silent': True
-            })
+        response = make_response(jsonify({
+            'success': True,
+            'job_id': job.id,
+            'status': job.status
+        }), 202)
+        if new_client:
+            response.set_cookie(CLIENT_COOKIE, client_id, httponly=True, samesite='Lax')
+        return response
             
     except Exception as e:
         logger.error(f"Error in process_command: {e}")
@@ -388,7 +340,7 @@ def toggle_sleep():
         data = request.get_json()
         should_sleep = data.get('sleep', False)
         
-        set_sleep_state(should_sleep)
+        sleep_state.set(should_sleep)
         jarvis_state['sleep_state'] = should_sleep
         
         if should_sleep:
@@ -434,11 +386,13 @@ def handle_command(data):
     """Handle commands from WebSocket"""
     command = data.get('command', '').strip()
     if command:
-        response = jarvis_interface.process_command(command)
-        if response:
+        try:
+            command_queue.submit(request.sid, command, reply_to=request.sid)
+        except QueueFull as e:
             emit('jarvis_response', {
                 'command': command,
-                'response': response,
+                'response': str(e),
+                'busy': True,
                 'timestamp': datetime.now().isoformat()
             })
 
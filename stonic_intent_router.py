@@ -0,0 +1,170 @@
+import logging
+import threading
+from collections import deque
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: finds every occurrence of every pattern in one pass over the text"""
+
+    def __init__(self, patterns):
+        self._goto = [{}]  # state -> {char: next state}
+        self._fail = [0]
+        self._out = [[]]  # state -> patterns ending here
+        for pattern in patterns:
+            self._insert(pattern)
+        self._link()
+
+    def _insert(self, pattern):
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(pattern)
+
+    def _link(self):
+        """Breadth-first failure links; each state also inherits the outputs of its failure state"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text):
+        """Yield (start, end, pattern) for every match, in order of end position"""
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern in self._out[state]:
+                yield i + 1 - len(pattern), i + 1, pattern
+
+
+class Route:
+    """A command intent: trigger phrases, a handler(command, query) and a priority"""
+
+    def __init__(self, name, triggers, handler, priority=0, takes_query=False):
+        self.name = name
+        self.triggers = [" ".join(trigger.lower().split()) for trigger in triggers]
+        self.handler = handler
+        self.priority = priority
+        self.takes_query = takes_query
+
+
+class IntentMatch:
+    """The route chosen for a command, with the trigger that selected it and the extracted query"""
+
+    def __init__(self, route, trigger, start, end, command, query):
+        self.route = route
+        self.name = route.name
+        self.trigger = trigger
+        self.start = start
+        self.end = end
+        self.command = command
+        self.query = query
+
+    def run(self):
+        return self.route.handler(self.command, self.query)
+
+    def __repr__(self):
+        return f"IntentMatch({self.name!r}, trigger={self.trigger!r}, query={self.query!r})"
+
+
+def _is_word_boundary(text, start, end):
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return not before.isalnum() and not after.isalnum()
+
+
+class IntentRouter:
+    """Registry of routes, matched with an Aho-Corasick automaton built once after registration.
+
+    Conflicts are resolved by route priority, then by the longer trigger, then by the earlier one.
+    Triggers only match whole words ("lock" does not fire on "block").
+    """
+
+    def __init__(self):
+        self._routes = {}
+        self._by_trigger = {}  # trigger -> [routes]
+        self._automaton = None
+        self._lock = threading.Lock()
+
+    def register(self, name, triggers, handler, priority=0, takes_query=False):
+        """Add or replace a route. takes_query routes get the text after (or else before) the trigger."""
+        with self._lock:
+            self._routes[name] = Route(name, triggers, handler, priority, takes_query)
+            self._automaton = None  # Rebuilt on the next match
+
+    def unregister(self, name):
+        with self._lock:
+            if self._routes.pop(name, None) is not None:
+                self._automaton = None
+
+    def route(self, name, triggers, priority=0, takes_query=False):
+        """Decorator form of register()"""
+        def decorator(handler):
+            self.register(name, triggers, handler, priority, takes_query)
+            return handler
+        return decorator
+
+    def routes(self):
+        return list(self._routes.values())
+
+    def _compiled(self):
+        with self._lock:
+            if self._automaton is None:
+                by_trigger = {}
+                for route in self._routes.values():
+                    for trigger in route.triggers:
+                        by_trigger.setdefault(trigger, []).append(route)
+                self._by_trigger = by_trigger
+                self._automaton = AhoCorasick(by_trigger)
+                logger.info(f"🧭 Intent router built: {len(self._routes)} intents, {len(by_trigger)} triggers")
+            return self._automaton, self._by_trigger
+
+    def match_all(self, command):
+        """Every (route, trigger, start, end) whose trigger occurs as whole words in the command"""
+        automaton, by_trigger = self._compiled()
+        text = " ".join(command.lower().split())
+        matches = []
+        for start, end, trigger in automaton.find_all(text):
+            if _is_word_boundary(text, start, end):
+                for route in by_trigger[trigger]:
+                    matches.append((route, trigger, start, end))
+        return text, matches
+
+    def match(self, command, names=None):
+        """Best IntentMatch for the command (optionally only among the given route names), or None"""
+        text, matches = self.match_all(command)
+        if names is not None:
+            matches = [m for m in matches if m[0].name in names]
+        if not matches:
+            return None
+        route, trigger, start, end = max(matches, key=lambda m: (m[0].priority, m[3] - m[2], -m[2]))
+        query = None
+        if route.takes_query:
+            # Slice the whitespace-normalized original so the query keeps its case; offsets line up
+            # unless lower() changed the length (rare Unicode), then fall back to the lowered text
+            source = " ".join(command.split())
+            if len(source) != len(text):
+                source = text
+            query = source[end:].strip() or source[:start].strip()
+        return IntentMatch(route, trigger, start, end, command, query)
+
+
+# Shared registry used by both web servers (see stonic_commands)
+command_router = IntentRouter()
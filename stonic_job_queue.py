@@ -0,0 +1,169 @@
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict, deque
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Job queue configuration
+JOB_WORKERS = 4  # Commands processed in parallel
+MAX_PENDING_JOBS = 64  # Queued jobs across all clients before new ones are rejected
+MAX_PENDING_PER_CLIENT = 8  # Queued jobs per client before that client is rejected
+MAX_RUNNING_PER_CLIENT = 2  # Workers one client may hold at once; the rest stay free for others
+FINISHED_JOBS_KEPT = 500  # Finished jobs kept for status lookups
+
+
+class QueueFull(Exception):
+    """The queue (or this client's share of it) is full; the caller should retry later"""
+
+
+class Job:
+    def __init__(self, client_id, command, reply_to=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.client_id = client_id
+        self.command = command
+        self.reply_to = reply_to  # Where the result should be delivered (e.g. a socket id), None = everyone
+        self.status = "queued"  # queued -> running -> done / failed
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "command": self.command,
+            "status": self.status,
+            "response": self.result,
+            "error": self.error,
+            "queued_seconds": round((self.started_at or time.time()) - self.created_at, 3),
+            "run_seconds": round(self.finished_at - self.started_at, 3) if self.finished_at and self.started_at else None,
+        }
+
+
+class JobQueue:
+    """Bounded command queue with a worker pool and round-robin fairness between clients.
+
+    Each client has its own FIFO; workers take the next job from the next client in turn,
+    skipping clients already running max_running_per_client jobs, so one client queueing
+    slow commands cannot take every worker and starve the others.
+    handler(job) returns the job result; on_done(job) is called after every job finishes.
+    """
+
+    def __init__(self, handler, on_done=None, workers=JOB_WORKERS, max_pending=MAX_PENDING_JOBS,
+                 max_per_client=MAX_PENDING_PER_CLIENT, max_running_per_client=MAX_RUNNING_PER_CLIENT):
+        self.handler = handler
+        self.on_done = on_done
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_per_client = max_per_client
+        self.max_running_per_client = max_running_per_client
+        self._queues = OrderedDict()  # client id -> deque of jobs, in round-robin order
+        self._pending = 0
+        self._running = {}  # client id -> jobs currently on a worker
+        self._jobs = OrderedDict()  # job id -> job, oldest first
+        self._cond = threading.Condition()
+        self._threads = []
+
+    def start(self):
+        with self._cond:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"stonic-job-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        logger.info(f"🧵 Job queue started with {self.workers} workers")
+
+    def submit(self, client_id, command, reply_to=None) -> Job:
+        """Queue a command for a client; raises QueueFull when the queue or the client's share is full"""
+        self.start()
+        with self._cond:
+            if self._pending >= self.max_pending:
+                raise QueueFull("Too many commands queued, please try again shortly")
+            queue = self._queues.get(client_id)
+            if queue is not None and len(queue) >= self.max_per_client:
+                raise QueueFull("You have too many commands queued, please wait for them to finish")
+
+            job = Job(client_id, command, reply_to)
+            if queue is None:
+                queue = self._queues[client_id] = deque()
+            queue.append(job)
+            self._pending += 1
+            self._remember(job)
+            self._cond.notify()
+            return job
+
+    def get(self, job_id):
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        with self._cond:
+            running = sum(self._running.values())
+            return {"workers": self.workers, "pending": self._pending, "running": running,
+                    "clients_waiting": len(self._queues)}
+
+    def _remember(self, job):
+        self._jobs[job.id] = job
+        while len(self._jobs) > FINISHED_JOBS_KEPT + self.max_pending + self.workers:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.status in ("queued", "running"):
+                break
+            del self._jobs[oldest_id]
+
+    def _next_job(self):
+        """Pop the head of the first client's queue that is under its running cap, then move
+        that client to the back; None when every waiting client is at its cap"""
+        for client_id, queue in self._queues.items():
+            if self._running.get(client_id, 0) < self.max_running_per_client:
+                break
+        else:
+            return None
+        job = queue.popleft()
+        if queue:
+            self._queues.move_to_end(client_id)
+        else:
+            del self._queues[client_id]
+        self._pending -= 1
+        self._running[client_id] = self._running.get(client_id, 0) + 1
+        return job
+
+    def _finish(self, job):
+        """Release the client's running slot and wake a worker for its next job"""
+        with self._cond:
+            count = self._running.get(job.client_id, 0) - 1
+            if count > 0:
+                self._running[job.client_id] = count
+            else:
+                self._running.pop(job.client_id, None)
+            self._cond.notify()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    self._cond.wait()
+                    job = self._next_job()
+                job.status = "running"
+                job.started_at = time.time()
+
+            try:
+                job.result = self.handler(job)
+                job.status = "done"
+            except Exception as e:
+                logger.error(f"Job {job.id} failed: {e}")
+                job.error = str(e)
+                job.status = "failed"
+            job.finished_at = time.time()
+            self._finish(job)
+
+            if self.on_done:
+                try:
+                    self.on_done(job)
+                except Exception as e:
+                    logger.error(f"Job {job.id} completion callback failed: {e}")
@@ -0,0 +1,25 @@
+import os
+import json
+import tempfile
+
+
+def write_json_atomic(path, data, prefix=".tmp_", **dump_kwargs):
+    """Write data as JSON to path through a synced temp file in the same folder and os.replace.
+
+    Readers see either the old file or the new one, never a partial write. Errors are raised to
+    the caller after the temp file is removed.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, delete=False,
+                                         prefix=prefix, suffix=".tmp") as f:
+            tmp_path = f.name
+            json.dump(data, f, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
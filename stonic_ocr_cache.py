@@ -0,0 +1,86 @@
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+from stonic_ocr_engine import find_text_bands
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+OCR_CACHE_MAX_BANDS = 4000  # LRU cap on cached text lines
+
+
+def band_fingerprint(band) -> bytes:
+    """Hash of a band's exact pixels and shape. Screen captures are deterministic, so an unchanged
+    line always hashes the same, while a one-pixel edit (";" to ":", "i" to "l") never does"""
+    digest = hashlib.blake2b(np.ascontiguousarray(band).tobytes(), digest_size=16)
+    digest.update(f"{band.shape}".encode())
+    return digest.digest()
+
+
+class OCRBandCache:
+    """OCR text cached per text-line band, keyed by the hash of the band's pixels.
+
+    recognize() splits a frame into bands, reuses the text of every band seen before (also after
+    scrolling, since keys do not depend on position) and sends only new or edited bands to OCR.
+    """
+
+    def __init__(self, max_bands=OCR_CACHE_MAX_BANDS):
+        self.max_bands = max_bands
+        self._texts = OrderedDict()  # fingerprint -> text, least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.last_stats = {}
+        self._last_frame = (None, "")  # (frame digest, text) of the previous call
+
+    def recognize(self, binary, ocr_bands) -> str:
+        """Text of a binarized frame. ocr_bands(list of band images) -> list of texts is called once
+        with every band that is not cached."""
+        start = time.perf_counter()
+        frame_key = hashlib.blake2b(binary.tobytes(), digest_size=16).digest()
+        with self._lock:
+            last_key, last_text = self._last_frame
+        if frame_key == last_key:
+            # Exactly the same screen as last time
+            self.last_stats = {"bands": 0, "ocr_bands": 0, "ms": round((time.perf_counter() - start) * 1000, 1)}
+            return last_text
+
+        bands = find_text_bands(binary)
+        keys = [band_fingerprint(binary[top:bottom]) for top, bottom in bands]
+
+        texts = [None] * len(bands)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in self._texts:
+                    self._texts.move_to_end(key)
+                    texts[i] = self._texts[key]
+                else:
+                    missing.append(i)
+
+        if missing:
+            results = ocr_bands([binary[bands[i][0]:bands[i][1]] for i in missing])
+            with self._lock:
+                for i, text in zip(missing, results):
+                    texts[i] = text
+                    self._texts[keys[i]] = text
+                while len(self._texts) > self.max_bands:
+                    self._texts.popitem(last=False)
+
+        self.hits += len(bands) - len(missing)
+        self.misses += len(missing)
+        self.last_stats = {"bands": len(bands), "ocr_bands": len(missing),
+                           "ms": round((time.perf_counter() - start) * 1000, 1)}
+        logger.info(f"🔎 OCR: {len(bands)} lines, {len(missing)} re-OCR'd in {self.last_stats['ms']} ms")
+        text = "\n".join(text for text in texts if text and text.strip())
+        with self._lock:
+            self._last_frame = (frame_key, text)
+        return text
+
+    def clear(self):
+        with self._lock:
+            self._texts.clear()
+            self._last_frame = (None, "")
@@ -0,0 +1,439 @@
+import os
+import sys
+import json
+import time
+import ctypes
+import ctypes.util
+import glob
+import shutil
+import atexit
+import logging
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tesseract settings for code (page segmentation mode 6 = one uniform block of text)
+OCR_LANGUAGE = "eng"
+OCR_PAGE_SEG_MODE = 6
+OCR_WHITELIST = r'0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ(){}[].,;:=+-*/\'"#_<>!@$%^&|~`? \t\n'
+OCR_CONFIG = f"--oem 3 --psm {OCR_PAGE_SEG_MODE} -c tessedit_char_whitelist={OCR_WHITELIST}"  # For the tesseract CLI
+
+# Backend probe
+OCR_PROBE_FILE = "stonic_ocr_probe.json"  # Last probe result, reused while the file it found is unchanged
+TESSERACT_PATHS = [
+    r'C:\Program Files\Tesseract-OCR\tesseract.exe',
+    r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
+    r'C:\Users\{}\AppData\Local\Tesseract-OCR\tesseract.exe'.format(os.getenv('USERNAME', '')),
+    r'tesseract',  # If in PATH
+]
+
+# Band detection
+MIN_BAND_GAP = 2  # Blank rows needed between two text lines
+MIN_BAND_HEIGHT = 4  # Thinner ink runs (rules, underlines) are not text
+BAND_PADDING = 3  # Rows/columns of margin kept around each band for Tesseract
+MIN_ROW_INK = 2  # Ink pixels a row needs to count as text
+RULE_COLUMN_RATIO = 0.9  # Columns inked in this share of rows are scrollbars/rulers and are ignored
+
+# Process pool
+OCR_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))  # Leave a core for the agent itself
+MIN_PARALLEL_BANDS = 4  # Fewer bands than this are OCR'd in-process (not worth a pool round trip)
+
+
+# -------------------------
+# Band detection (vectorized row projections)
+# -------------------------
+def _ink_mask(binary):
+    # The background is whichever value covers most of the image (light or dark editor themes)
+    background = 255 if np.count_nonzero(binary) * 2 > binary.size else 0
+    ink = binary != background
+    ink[:, ink.mean(axis=0) > RULE_COLUMN_RATIO] = False
+    return ink
+
+
+def find_text_bands(binary) -> list:
+    """(top, bottom) row ranges of the text lines in a binarized image, from row ink projections"""
+    height = binary.shape[0]
+    ink_rows = np.flatnonzero(_ink_mask(binary).sum(axis=1) >= MIN_ROW_INK)
+    if ink_rows.size == 0:
+        return []
+
+    breaks = np.flatnonzero(np.diff(ink_rows) > MIN_BAND_GAP)
+    starts = np.concatenate(([ink_rows[0]], ink_rows[breaks + 1]))
+    ends = np.concatenate((ink_rows[breaks], [ink_rows[-1]])) + 1
+    return [(max(0, int(top) - BAND_PADDING), min(height, int(bottom) + BAND_PADDING))
+            for top, bottom in zip(starts, ends) if bottom - top >= MIN_BAND_HEIGHT]
+
+
+def trim_band(band):
+    """Band with the blank columns right of the text cut off (most of a maximized editor's width).
+    Left margin is kept so indentation still reads as leading spaces."""
+    ink_columns = np.flatnonzero(_ink_mask(band).any(axis=0))
+    if ink_columns.size == 0:
+        return band
+    return band[:, :min(band.shape[1], int(ink_columns[-1]) + 1 + BAND_PADDING)]
+
+
+# -------------------------
+# Backends: persistent Tesseract readers
+# -------------------------
+class _TesserocrReader:
+    """tesserocr's PyTessBaseAPI: Tesseract inside this process, language data loaded once"""
+
+    def __init__(self, probe):
+        import tesserocr
+        kwargs = {"path": probe["tessdata"]} if probe.get("tessdata") else {}
+        self.api = tesserocr.PyTessBaseAPI(lang=OCR_LANGUAGE, psm=OCR_PAGE_SEG_MODE, **kwargs)
+        self.api.SetVariable("tessedit_char_whitelist", OCR_WHITELIST)
+        self._version = tesserocr.tesseract_version().splitlines()[0]
+
+    def version(self):
+        return self._version
+
+    def read(self, band) -> str:
+        band = np.ascontiguousarray(band, dtype=np.uint8)
+        self.api.SetImageBytes(band.tobytes(), band.shape[1], band.shape[0], 1, band.shape[1])
+        return self.api.GetUTF8Text()
+
+    def close(self):
+        self.api.End()
+
+
+class _CApiReader:
+    """libtesseract through its C API (ctypes), for installs without tesserocr"""
+
+    def __init__(self, probe):
+        library = probe["library"]
+        if os.name == "nt" and os.path.dirname(library):
+            os.add_dll_directory(os.path.dirname(library))  # Leptonica and the other DLLs sit next to it
+        lib = ctypes.CDLL(library)
+        lib.TessVersion.restype = ctypes.c_char_p
+        lib.TessBaseAPICreate.restype = ctypes.c_void_p
+        lib.TessBaseAPIInit3.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+        lib.TessBaseAPISetPageSegMode.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.TessBaseAPISetVariable.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+        lib.TessBaseAPISetImage.argtypes = [ctypes.c_void_p, ctypes.c_void_p] + [ctypes.c_int] * 4
+        lib.TessBaseAPIGetUTF8Text.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p  # Freed with TessDeleteText
+        lib.TessDeleteText.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIEnd.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIDelete.argtypes = [ctypes.c_void_p]
+        self.lib = lib
+
+        self.api = lib.TessBaseAPICreate()
+        tessdata = probe.get("tessdata")
+        if lib.TessBaseAPIInit3(self.api, tessdata.encode() if tessdata else None, OCR_LANGUAGE.encode()) != 0:
+            lib.TessBaseAPIDelete(self.api)
+            raise RuntimeError(f"Tesseract could not load '{OCR_LANGUAGE}' language data")
+        lib.TessBaseAPISetPageSegMode(self.api, OCR_PAGE_SEG_MODE)
+        lib.TessBaseAPISetVariable(self.api, b"tessedit_char_whitelist", OCR_WHITELIST.encode())
+
+    def version(self):
+        return f"tesseract {self.lib.TessVersion().decode()}"
+
+    def read(self, band) -> str:
+        band = np.ascontiguousarray(band, dtype=np.uint8)
+        self.lib.TessBaseAPISetImage(self.api, band.ctypes.data, band.shape[1], band.shape[0], 1, band.strides[0])
+        text = self.lib.TessBaseAPIGetUTF8Text(self.api)
+        if not text:
+            return ""
+        try:
+            return ctypes.string_at(text).decode("utf-8", errors="replace")
+        finally:
+            self.lib.TessDeleteText(text)
+
+    def close(self):
+        self.lib.TessBaseAPIEnd(self.api)
+        self.lib.TessBaseAPIDelete(self.api)
+
+
+class _CliReader:
+    """pytesseract: a new tesseract process per call (used only when neither API is available)"""
+
+    def __init__(self, probe):
+        import pytesseract
+        pytesseract.pytesseract.tesseract_cmd = probe["tesseract_cmd"]
+        self.cmd = probe["tesseract_cmd"]
+        self.image_to_string = pytesseract.image_to_string
+
+    def version(self):
+        result = subprocess.run([self.cmd, "--version"], capture_output=True, text=True, timeout=10)
+        return (result.stdout or result.stderr).splitlines()[0]
+
+    def read(self, band) -> str:
+        return self.image_to_string(band, config=OCR_CONFIG)
+
+    def close(self):
+        pass
+
+
+OCR_READERS = {"tesserocr": _TesserocrReader, "capi": _CApiReader, "cli": _CliReader}  # Preferred first
+
+
+def _make_reader(probe):
+    if not probe.get("backend"):
+        raise RuntimeError("No OCR backend available")
+    return OCR_READERS[probe["backend"]](probe)
+
+
+# -------------------------
+# Backend probe (cached across runs)
+# -------------------------
+_probe = None
+_probe_lock = threading.Lock()
+
+
+def _file_signature(path):
+    """[size, mtime] of a file, or None if it is not a file path"""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return [stat.st_size, int(stat.st_mtime)]
+
+
+def _find_tesseract_cmd():
+    for path in TESSERACT_PATHS:
+        if found := shutil.which(path):
+            return os.path.realpath(found)
+    return None
+
+
+def _find_tessdata(tesseract_cmd):
+    if os.getenv("TESSDATA_PREFIX"):
+        return os.getenv("TESSDATA_PREFIX")
+    if tesseract_cmd:
+        tessdata = os.path.join(os.path.dirname(tesseract_cmd), "tessdata")
+        if os.path.isdir(tessdata):
+            return tessdata
+    return None
+
+
+def _find_libtesseract(tesseract_cmd):
+    if tesseract_cmd:
+        # The Windows installer ships libtesseract-5.dll next to tesseract.exe
+        libraries = sorted(glob.glob(os.path.join(os.path.dirname(tesseract_cmd), "libtesseract*.dll")))
+        if libraries:
+            return libraries[-1]
+    return ctypes.util.find_library("tesseract")
+
+
+def _probe_backends() -> dict:
+    tesseract_cmd = _find_tesseract_cmd()
+    candidates = []
+    try:
+        import tesserocr
+        candidates.append({"backend": "tesserocr", "source": tesserocr.__file__})
+    except ImportError:
+        pass
+    if library := _find_libtesseract(tesseract_cmd):
+        candidates.append({"backend": "capi", "library": library, "source": library})
+    if tesseract_cmd:
+        candidates.append({"backend": "cli", "source": tesseract_cmd})
+
+    for probe in candidates:
+        probe.update(tesseract_cmd=tesseract_cmd, tessdata=_find_tessdata(tesseract_cmd),
+                     signature=_file_signature(probe["source"]))
+        try:
+            reader = _make_reader(probe)
+            probe["version"] = reader.version()
+            reader.close()
+            return probe
+        except Exception as e:
+            logger.info(f"OCR backend {probe['backend']} unusable: {e}")
+    return {"backend": None}
+
+
+def _load_probe():
+    try:
+        with open(OCR_PROBE_FILE, "r", encoding="utf-8") as f:
+            probe = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Trusted only while the library/executable it found is unchanged (a reinstall re-probes)
+    signature = probe.get("signature")
+    if probe.get("backend") in OCR_READERS and signature and signature == _file_signature(probe.get("source")):
+        return probe
+    return None
+
+
+def _save_probe(probe):
+    try:
+        with open(OCR_PROBE_FILE, "w", encoding="utf-8") as f:
+            json.dump(probe, f, indent=2)
+    except OSError as e:
+        logger.warning(f"⚠ Could not save OCR probe result: {e}")
+
+
+def probe_ocr_backend(refresh=False) -> dict:
+    """Best available OCR backend: {"backend": "tesserocr" | "capi" | "cli" | None, ...}.
+    Reuses the result saved by an earlier run, so startup does not spawn tesseract to find it."""
+    global _probe
+    with _probe_lock:
+        if _probe is not None and not refresh:
+            return _probe
+        probe = None if refresh else _load_probe()
+        if probe is None:
+            probe = _probe_backends()
+            if probe.get("backend"):
+                _save_probe(probe)
+        _probe = probe
+        logger.info(f"🔤 OCR backend: {probe.get('backend')} {probe.get('version', '')}".rstrip())
+        return probe
+
+
+# -------------------------
+# One reader per process
+# -------------------------
+_reader = None
+_reader_lock = threading.Lock()  # Tesseract handles are not thread-safe
+
+
+def _init_worker(probe):
+    # Pool workers load the language data once, when they start
+    global _reader
+    _reader = _make_reader(probe)
+
+
+def _get_reader():
+    global _reader
+    if _reader is None:
+        probe = probe_ocr_backend()
+        try:
+            _reader = _make_reader(probe)
+        except Exception as e:
+            logger.warning(f"⚠ OCR backend {probe.get('backend')} failed ({e}), probing again")
+            _reader = _make_reader(probe_ocr_backend(refresh=True))
+    return _reader
+
+
+def _ocr_band(band) -> str:
+    with _reader_lock:
+        return _get_reader().read(band).rstrip()  # Drops the trailing newline/form feed
+
+
+class OCREngine:
+    """Tesseract over text-line bands, in a process pool for large captures.
+
+    Every process keeps one persistent Tesseract reader (tesserocr, else the libtesseract C API,
+    else the tesseract CLI), so a call costs only the recognition itself. ocr_bands() returns the
+    texts in input order, so they stitch back together top to bottom. The pool is started on the
+    first large capture and kept for later ones; bands reach the workers over the pool's pipes.
+    On Windows each worker also re-imports the main script once at that point.
+    """
+
+    def __init__(self, workers=OCR_WORKERS):
+        self.workers = workers
+        self._pool = None
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(probe_ocr_backend(),))
+                logger.info(f"🧵 OCR pool started with {self.workers} workers")
+            return self._pool
+
+    def ocr_bands(self, bands) -> list:
+        """Text of each band image, in the same order"""
+        bands = [trim_band(band) for band in bands]
+        if self.workers <= 1 or len(bands) < MIN_PARALLEL_BANDS:
+            return [_ocr_band(band) for band in bands]
+        try:
+            chunksize = max(1, len(bands) // (self.workers * 4))
+            return list(self._get_pool().map(_ocr_band, bands, chunksize=chunksize))
+        except BrokenProcessPool as e:
+            logger.error(f"OCR pool crashed, continuing in-process: {e}")
+            self.shutdown()
+            return [_ocr_band(band) for band in bands]
+
+    def recognize(self, binary) -> str:
+        """Text of a whole binarized capture, band by band"""
+        bands = [binary[top:bottom] for top, bottom in find_text_bands(binary)]
+        return "\n".join(text for text in self.ocr_bands(bands) if text.strip())
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+# -------------------------
+# Benchmark: python stonic_ocr_engine.py [lines] [width] [height]
+# -------------------------
+SAMPLE_CODE = [
+    "def process_command(self, command):",
+    "    \"\"\"Route a command to the matching tool\"\"\"",
+    "    match = command_router.match(command.lower())",
+    "    if match is None:",
+    "        return {'success': False, 'message': 'Unknown command'}",
+    "    for attempt in range(3):",
+    "        result = tool_executor.run(match.run, name=match.name)",
+    "        if result.get('success'):",
+    "            break",
+    "    logger.info(f'Command took {elapsed:.2f}s')",
+    "    return {'success': True, 'response': result}",
+    "",
+]
+
+
+def render_code_image(lines=120, width=3840, height=2160):
+    """Synthetic editor capture: dark code on a light background, already binarized like the fixer does"""
+    import cv2
+    image = np.full((height, width), 255, np.uint8)
+    line_height = 26
+    for i in range(min(lines, (height - 20) // line_height)):
+        text = SAMPLE_CODE[i % len(SAMPLE_CODE)]
+        cv2.putText(image, f"{i + 1:>4}  {text}", (20, 30 + i * line_height),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, 0, 2, cv2.LINE_AA)
+    image[:, width - 16:] = 90  # Scrollbar
+    _, binary = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary
+
+
+def run_benchmark(lines=120, width=3840, height=2160, repeats=3):
+    binary = render_code_image(lines, width, height)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        bands = find_text_bands(binary)
+    band_ms = (time.perf_counter() - start) / repeats * 1000
+    print(f"{width}x{height}, {len(bands)} text lines, band detection {band_ms:.1f} ms")
+
+    probe = probe_ocr_backend()
+    if not probe.get("backend"):
+        print("Tesseract not available, OCR timings skipped")
+        return
+    print(f"OCR backend: {probe['backend']} ({probe.get('version')})")
+
+    def timed(label, fn):
+        start = time.perf_counter()
+        text = fn()
+        print(f"{label:>28}: {(time.perf_counter() - start) * 1000:8.0f} ms, {len(text.splitlines())} lines")
+
+    first_band = trim_band(binary[bands[0][0]:bands[0][1]])
+    try:
+        import pytesseract
+        pytesseract.pytesseract.tesseract_cmd = probe.get("tesseract_cmd") or "tesseract"
+        timed("single call (current)", lambda: pytesseract.image_to_string(binary, config=OCR_CONFIG))
+        timed("one line, new process", lambda: pytesseract.image_to_string(first_band, config=OCR_CONFIG))
+    except ImportError:
+        print("pytesseract not installed, single-call timings skipped")
+    _ocr_band(first_band)  # Load the language data
+    timed("one line, persistent", lambda: _ocr_band(first_band))
+
+    engine = OCREngine()
+    timed("bands, in-process", lambda: OCREngine(workers=1).recognize(binary))
+    engine.ocr_bands([binary[top:bottom] for top, bottom in bands[:MIN_PARALLEL_BANDS]])  # Start the pool
+    timed(f"bands, {engine.workers} workers", lambda: engine.recognize(binary))
+    engine.shutdown()
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:4]))
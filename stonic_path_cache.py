@@ -0,0 +1,211 @@
+import os
+import json
+import bisect
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from stonic_json_file import write_json_atomic
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Defaults for the path cache store
+PATH_CACHE_MAX_ENTRIES = 5000  # LRU cap, least recently used entries are evicted first
+SAVE_DEBOUNCE_SECONDS = 2.0  # Changes within this window are written together
+
+
+class PathCacheStore:
+    """LRU cache of search query -> path with a reverse path index and debounced, atomic saves"""
+
+    def __init__(self, cache_file, expiry_hours=24, max_entries=PATH_CACHE_MAX_ENTRIES,
+                 debounce_seconds=SAVE_DEBOUNCE_SECONDS):
+        self.cache_file = cache_file
+        self.expiry_hours = expiry_hours
+        self.max_entries = max_entries
+        self.debounce_seconds = debounce_seconds
+        self._entries = OrderedDict()  # key -> path, least recently used first
+        self._keys_by_path = {}  # path -> set of keys
+        self._sorted_paths = []  # cached paths in sorted order, for folder prefix lookups
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = False
+        atexit.register(self.flush)
+
+    # -------------------------
+    # Reverse index helpers
+    # -------------------------
+    def _link(self, key, path):
+        keys = self._keys_by_path.get(path)
+        if keys is None:
+            keys = self._keys_by_path[path] = set()
+            bisect.insort(self._sorted_paths, path)
+        keys.add(key)
+
+    def _unlink(self, key, path):
+        keys = self._keys_by_path.get(path)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_path[path]
+            i = bisect.bisect_left(self._sorted_paths, path)
+            if i < len(self._sorted_paths) and self._sorted_paths[i] == path:
+                del self._sorted_paths[i]
+
+    def _paths_under(self, path):
+        """The path itself and every cached path below it"""
+        prefix = path.rstrip(os.sep) + os.sep
+        matches = [path] if path in self._keys_by_path else []
+        i = bisect.bisect_left(self._sorted_paths, prefix)
+        while i < len(self._sorted_paths) and self._sorted_paths[i].startswith(prefix):
+            matches.append(self._sorted_paths[i])
+            i += 1
+        return matches
+
+    # -------------------------
+    # Mapping API
+    # -------------------------
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def __getitem__(self, key):
+        with self._lock:
+            if key not in self._entries:
+                raise KeyError(key)
+            return self.get(key)
+
+    def __setitem__(self, key, path):
+        with self._lock:
+            old = self._entries.get(key)
+            if old == path:
+                self._entries.move_to_end(key)
+                return
+            if old is not None:
+                self._unlink(key, old)
+            self._entries[key] = path
+            self._entries.move_to_end(key)
+            self._link(key, path)
+            while len(self._entries) > self.max_entries:
+                evicted_key, evicted_path = self._entries.popitem(last=False)
+                self._unlink(evicted_key, evicted_path)
+            self._schedule_save()
+
+    def __delitem__(self, key):
+        with self._lock:
+            path = self._entries.pop(key)
+            self._unlink(key, path)
+            self._schedule_save()
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            path = self._entries[key]
+            del self[key]
+            return path
+
+    def items(self):
+        with self._lock:
+            return list(self._entries.items())
+
+    def keys_for_path(self, path):
+        with self._lock:
+            return set(self._keys_by_path.get(path, ()))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_path.clear()
+            self._sorted_paths.clear()
+            self._schedule_save()
+
+    # -------------------------
+    # Path updates (rename / delete)
+    # -------------------------
+    def move_path(self, old_path, new_path):
+        """Point every key cached for old_path (or anything below it) at the new location"""
+        with self._lock:
+            changed = False
+            for path in self._paths_under(old_path):
+                for key in list(self._keys_by_path.get(path, ())):
+                    self[key] = new_path + path[len(old_path):]
+                    changed = True
+            return changed
+
+    def remove_path(self, path):
+        """Drop every key cached for path (or anything below it)"""
+        with self._lock:
+            changed = False
+            for cached_path in self._paths_under(path):
+                for key in list(self._keys_by_path.get(cached_path, ())):
+                    del self[key]
+                    changed = True
+            return changed
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+    def load(self):
+        """Load cached paths from file, ignoring an expired cache"""
+        try:
+            if not os.path.exists(self.cache_file):
+                return
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            cache_time = datetime.fromisoformat(data.get('timestamp', '2000-01-01'))
+            if datetime.now() - cache_time >= timedelta(hours=self.expiry_hours):
+                logger.info("🔄 Cache expired, will rebuild")
+                return
+            with self._lock:
+                for key, path in data.get('paths', {}).items():
+                    self._entries[key] = path
+                    self._link(key, path)
+                while len(self._entries) > self.max_entries:
+                    evicted_key, evicted_path = self._entries.popitem(last=False)
+                    self._unlink(evicted_key, evicted_path)
+            logger.info(f"✅ Loaded {len(self._entries)} cached paths")
+        except Exception as e:
+            logger.warning(f"⚠ Could not load cache: {e}")
+
+    def _schedule_save(self):
+        """Write-behind: batch every change made within the debounce window into one save"""
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.debounce_seconds, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write pending changes now, replacing the cache file atomically"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            cache_data = {
+                'timestamp': datetime.now().isoformat(),
+                'paths': dict(self._entries)
+            }
+            self._dirty = False
+
+        try:
+            write_json_atomic(self.cache_file, cache_data, prefix='.path_cache_',
+                              ensure_ascii=False, separators=(',', ':'))
+            logger.info(f"💾 Saved {len(cache_data['paths'])} paths to cache")
+        except Exception as e:
+            logger.warning(f"⚠ Could not save cache: {e}")
+            with self._lock:
+                self._dirty = True
@@ -1,70 +1,217 @@
 import json
 import os
 import re
+import time
+import atexit
+import socket
+import struct
 import logging
+import threading
 from livekit.agents import function_tool
+from stonic_json_file import write_json_atomic
 
 STATE_FILE = os.path.abspath(r"C:\Users\Nikhil Pathak\OneDrive\Desktop\Stonic 2.0\sleep_state.json")  # Absolute path for safety
 
+# Sleep state sharing between processes (agent.py and the web servers)
+STATE_GROUP = "239.255.42.99"  # Host-local UDP multicast group for state change notifications
+STATE_PORT = 50999
+STATE_INTERFACE = "127.0.0.1"  # Multicast is sent and joined on loopback, so it works with no network at all
+SAVE_DEBOUNCE_SECONDS = 0.5  # The state file is only for crash recovery, so writes are batched
+
 logger = logging.getLogger(__name__)
 
-# Get the sleep state from file
+
+class SleepStateService:
+    """Sleep state held in memory, saved write-behind (atomically) and broadcast to other processes.
+
+    Every process keeps its own copy; set() updates it, schedules a file save and publishes the change
+    over UDP multicast. The listener thread applies changes from other processes (newest wins) and
+    notifies local subscribers. The file is read only once, at startup.
+    """
+
+    def __init__(self, state_file=STATE_FILE, group=STATE_GROUP, port=STATE_PORT):
+        self.state_file = state_file
+        self.group = group
+        self.port = port
+        self._sleeping = False
+        self._updated_at = 0.0
+        self._origin = f"{os.getpid()}-{id(self)}"
+        self._lock = threading.RLock()
+        self._subscribers = []
+        self._timer = None
+        self._dirty = False
+        self._sender = None
+        self._listener = None
+        self._load()
+        atexit.register(self.flush)
+
+    # -------------------------
+    # State
+    # -------------------------
+    def get(self) -> bool:
+        self._ensure_listener()
+        return self._sleeping
+
+    def set(self, sleeping: bool):
+        self._ensure_listener()
+        sleeping = bool(sleeping)
+        with self._lock:
+            changed = sleeping != self._sleeping
+            self._sleeping = sleeping
+            self._updated_at = time.time()
+            updated_at = self._updated_at
+            self._schedule_save()
+        logger.info(f"Sleep state set to: {sleeping}")
+        self._publish(sleeping, updated_at)
+        if changed:
+            self._notify(sleeping)
+
+    def subscribe(self, callback):
+        """callback(sleeping) runs on every change, local or from another process"""
+        self._ensure_listener()
+        self._subscribers.append(callback)
+
+    def _notify(self, sleeping):
+        for callback in list(self._subscribers):
+            try:
+                callback(sleeping)
+            except Exception as e:
+                logger.error(f"Sleep state subscriber failed: {e}")
+
+    # -------------------------
+    # Pub/sub between processes
+    # -------------------------
+    def _publish(self, sleeping, updated_at):
+        message = json.dumps({"sleeping": sleeping, "updated_at": updated_at, "origin": self._origin}).encode()
+        try:
+            if self._sender is None:
+                sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+                sender.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 0)  # Never leaves this machine
+                sender.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+                sender.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(STATE_INTERFACE))
+                self._sender = sender
+            self._sender.sendto(message, (self.group, self.port))
+        except OSError as e:
+            logger.warning(f"⚠ Could not publish sleep state change: {e}")
+
+    def _ensure_listener(self):
+        if self._listener is not None:
+            return
+        with self._lock:
+            if self._listener is not None:
+                return
+            try:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                sock.bind(("", self.port))
+                membership = struct.pack("4s4s", socket.inet_aton(self.group), socket.inet_aton(STATE_INTERFACE))
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+            except OSError as e:
+                logger.warning(f"⚠ Sleep state notifications unavailable, using this process only: {e}")
+                self._listener = False
+                return
+            self._listener = threading.Thread(target=self._listen, args=(sock,),
+                                              name="stonic-sleep-state", daemon=True)
+            self._listener.start()
+
+    def _listen(self, sock):
+        while True:
+            try:
+                data, _ = sock.recvfrom(1024)
+                message = json.loads(data)
+            except OSError as e:
+                logger.error(f"Sleep state listener stopped: {e}")
+                return
+            except ValueError:
+                continue
+            if message.get("origin") == self._origin:
+                continue
+
+            sleeping = bool(message.get("sleeping"))
+            with self._lock:
+                if message.get("updated_at", 0) <= self._updated_at:
+                    continue  # Older than what we have
+                changed = sleeping != self._sleeping
+                self._sleeping = sleeping
+                self._updated_at = message["updated_at"]
+            logger.info(f"Sleep state changed by another process: {sleeping}")
+            if changed:
+                self._notify(sleeping)
+
+    # -------------------------
+    # Persistence (crash recovery only)
+    # -------------------------
+    def _load(self):
+        if not os.path.exists(self.state_file):
+            logger.info("STATE_FILE not found, assuming awake.")
+            return
+        try:
+            with open(self.state_file, "r") as f:
+                data = json.load(f)
+            self._sleeping = bool(data.get("sleeping", False))
+            self._updated_at = data.get("updated_at", 0.0)
+            logger.info(f"Read sleep state: {self._sleeping} from {self.state_file}")
+        except Exception as e:
+            logger.error(f"Error reading sleep state file: {e}")
+
+    def _schedule_save(self):
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write the current state now, replacing the file atomically"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            data = {"sleeping": self._sleeping, "updated_at": self._updated_at}
+            self._dirty = False
+
+        try:
+            write_json_atomic(self.state_file, data, prefix=".sleep_state_", indent=2)
+        except Exception as e:
+            logger.error(f"Error writing sleep state file: {e}")
+
+
+sleep_state = SleepStateService()
+
+# Get the sleep state (from memory)
 @function_tool
 async def get_sleep_state() -> bool:
     """Get the current sleep state of Stonic"""
-    if not os.path.exists(STATE_FILE):
-        logger.info("STATE_FILE not found, creating new file and assuming awake.")
-        # Create the file if it doesn't exist
-        try:
-            with open(STATE_FILE, "w") as f:
-                json.dump({"sleeping": False}, f)
-        except Exception as e:
-            logger.error(f"Error creating sleep state file: {e}")
-        return False
-    
-    try:
-        with open(STATE_FILE, "r") as f:
-            data = json.load(f)
-            sleeping = data.get("sleeping", False)
-            logger.info(f"Read sleep state: {sleeping} from {STATE_FILE}")
-            return sleeping
-    except Exception as e:
-        logger.error(f"Error reading sleep state file: {e}")
-        return False
+    return sleep_state.get()
 
 # Set sleep state to True or False
 @function_tool
 async def set_sleep_state(sleeping: bool):
     """Set the sleep state of Stonic"""
-    try:
-        with open(STATE_FILE, "w") as f:
-            json.dump({"sleeping": sleeping}, f, indent=2)
-        logger.info(f"Sleep state successfully set to: {sleeping} in {STATE_FILE}")
-        
-        # Verify the write was successful
-        with open(STATE_FILE, "r") as f:
-            data = json.load(f)
-            actual_state = data.get("sleeping", False)
-            logger.info(f"Verified sleep state in file: {actual_state}")
-            
-    except Exception as e:
-        logger.error(f"Error writing sleep state file: {e}")
+    sleep_state.set(sleeping)
+
+SLEEP_PHRASES = re.compile(r"\b(so jao|sone chalo|go to sleep|sleep now|stonic so jao|stonic go to sleep|sleep mode|sleep stonic|chup ho jao)\b")
+WAKE_PHRASES = re.compile(r"\b(uth jao|jaago|wake up|stonic uth jao|wake up stonic)\b")
 
 # Process sleep/wake commands - REMOVED from tools list
-async def process_sleep_intent(command: str) -> str:
-    """Process sleep/wake commands - internal function, not a tool"""
+async def process_sleep_intent(command: str):
+    """Process sleep/wake commands - internal function, not a tool.
+    Returns "sleep" or "wake" when the command changed the state, otherwise None."""
     command = command.lower()
-    if re.search(r"\b(so jao|sone chalo|go to sleep|sleep now|stonic so jao|stonic go to sleep|sleep mode|sleep stonic|chup ho jao)\b", command):
-        await set_sleep_state(True)
-        return ""  # No response when going to sleep
-    elif re.search(r"\b(uth jao|jaago|wake up|stonic uth jao|wake up stonic)\b", command):
-        await set_sleep_state(False)
-        return "Stonic is now awake."
-    return ""
+    # While asleep only a wake phrase matters, so check it first
+    checks = [(WAKE_PHRASES, False), (SLEEP_PHRASES, True)] if sleep_state.get() else \
+             [(SLEEP_PHRASES, True), (WAKE_PHRASES, False)]
+    for pattern, sleeping in checks:
+        if pattern.search(command):
+            await set_sleep_state(sleeping)
+            return "sleep" if sleeping else "wake"
+    return None
 
 # Tool to provide sleep/awake status
 @function_tool
 async def is_jarvis_sleeping(query: str) -> str:
     """Check if Stonic is currently sleeping"""
     sleeping = await get_sleep_state()
-    return "Yes, Stonic is sleeping." if sleeping else "No, Stonic is awake."
\ No newline at end of file
+    return "Yes, Stonic is sleeping." if sleeping else "No, Stonic is awake."
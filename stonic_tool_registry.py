@@ -0,0 +1,245 @@
+import os
+import re
+import ast
+import sys
+import asyncio
+import inspect
+import logging
+import importlib
+import importlib.util
+import subprocess
+import threading
+from livekit.agents import function_tool
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tool name -> (module, attribute). Modules are imported on the first call of one of their tools.
+TOOL_LOCATIONS = {
+    "google_search": ("stonic_google_search", "google_search"),
+    "get_current_datetime": ("stonic_google_search", "get_current_datetime"),
+    "get_weather": ("stonic_get_whether", "get_weather"),
+    "YouTube_control": ("stonic_youtube_control", "YouTube_control"),
+    "open": ("stonic_window_CTRL", "open"),
+    "close": ("stonic_window_CTRL", "close"),
+    "folder_file": ("stonic_window_CTRL", "folder_file"),
+    "Play_file": ("stonic_file_opner", "Play_file"),
+    "find_files": ("stonic_file_opner", "find_files"),
+    "move_cursor_tool": ("keyboard_mouse_CTRL", "move_cursor_tool"),
+    "mouse_click_tool": ("keyboard_mouse_CTRL", "mouse_click_tool"),
+    "scroll_cursor_tool": ("keyboard_mouse_CTRL", "scroll_cursor_tool"),
+    "type_text_tool": ("keyboard_mouse_CTRL", "type_text_tool"),
+    "press_key_tool": ("keyboard_mouse_CTRL", "press_key_tool"),
+    "press_hotkey_tool": ("keyboard_mouse_CTRL", "press_hotkey_tool"),
+    "control_volume_tool": ("keyboard_mouse_CTRL", "control_volume_tool"),
+    "swipe_gesture_tool": ("keyboard_mouse_CTRL", "swipe_gesture_tool"),
+    "generate_image": ("stonic_gen_tools", "generate_image"),
+    "generate_image_alternative": ("stonic_gen_tools", "generate_image_alternative"),
+    "generate_code_advanced": ("stonic_gen_tools", "generate_code_advanced"),
+    "generate_code": ("stonic_gen_tools", "generate_code"),
+    "save_output": ("stonic_gen_tools", "save_output"),
+    "system_shutdown": ("stonic_system_control", "system_shutdown"),
+    "system_restart": ("stonic_system_control", "system_restart"),
+    "system_lock": ("stonic_system_control", "system_lock"),
+    "check_and_fix_code": ("stonic_code_fixer", "check_and_fix_code"),
+    "paste_fixed_code": ("stonic_code_fixer", "paste_fixed_code"),
+    "test_groq_connection": ("stonic_code_fixer", "test_groq_connection"),
+    "start_code_monitoring": ("stonic_code_fixer", "start_code_monitoring"),
+    "stop_code_monitoring": ("stonic_code_fixer", "stop_code_monitoring"),
+    "get_todays_schedule": ("stonic_schedule_manager", "get_todays_schedule"),
+    "get_tomorrows_schedule": ("stonic_schedule_manager", "get_tomorrows_schedule"),
+    "get_schedule_for_date": ("stonic_schedule_manager", "get_schedule_for_date"),
+    "get_schedule_info": ("stonic_schedule_manager", "get_schedule_info"),
+    "morning_briefing": ("stonic_briefing", "morning_briefing"),
+}
+
+_TYPE_SCHEMAS = {
+    "str": {"type": "string"},
+    "int": {"type": "integer"},
+    "float": {"type": "number"},
+    "bool": {"type": "boolean"},
+    "list": {"type": "array"},
+    "List[str]": {"type": "array", "items": {"type": "string"}},
+    "list[str]": {"type": "array", "items": {"type": "string"}},
+    "dict": {"type": "object"},
+}
+
+_schemas = {}  # tool name -> schema
+_loaded = {}  # (module, attribute) -> object
+_load_lock = threading.Lock()
+
+
+# -------------------------
+# Schemas from source (no import)
+# -------------------------
+def _parse_docstring(docstring):
+    """Split a Google-style docstring into (description, {argument: description})"""
+    if not docstring:
+        return "", {}
+    text = inspect.cleandoc(docstring)
+    description, _, args_block = text.partition("Args:")
+    arg_docs = {}
+    for line in args_block.splitlines():
+        if match := re.match(r"\s*(\w+)\s*(?:\([^)]*\))?:\s*(.+)", line):
+            arg_docs[match.group(1)] = match.group(2).strip()
+    return " ".join(description.split()), arg_docs
+
+
+def _decorator_overrides(node):
+    """name= / description= passed to @function_tool(...)"""
+    overrides = {}
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Call):
+            for keyword in decorator.keywords:
+                if keyword.arg in ("name", "description") and isinstance(keyword.value, ast.Constant):
+                    overrides[keyword.arg] = keyword.value.value
+    return overrides
+
+
+def _find_function(module_name, attribute):
+    spec = importlib.util.find_spec(module_name)  # Locates the file without importing the module
+    if spec is None or not spec.origin:
+        raise ImportError(f"Tool module {module_name} not found")
+    with open(spec.origin, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=spec.origin)
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == attribute:
+            return node
+    raise AttributeError(f"{module_name}.{attribute} not found")
+
+
+def tool_schema(name) -> dict:
+    """Function tool schema (name, description, JSON parameters) read from the tool's source"""
+    if name in _schemas:
+        return _schemas[name]
+    module_name, attribute = TOOL_LOCATIONS[name]
+    node = _find_function(module_name, attribute)
+    description, arg_docs = _parse_docstring(ast.get_docstring(node))
+    overrides = _decorator_overrides(node)
+
+    args = node.args.args
+    first_default = len(args) - len(node.args.defaults)
+    properties, required = {}, []
+    for i, arg in enumerate(args):
+        annotation = ast.unparse(arg.annotation) if arg.annotation else "str"
+        prop = dict(_TYPE_SCHEMAS.get(annotation, {"type": "string"}))
+        if arg.arg in arg_docs:
+            prop["description"] = arg_docs[arg.arg]
+        properties[arg.arg] = prop
+        if i < first_default:
+            required.append(arg.arg)
+
+    schema = {
+        "name": overrides.get("name", name),
+        "description": overrides.get("description", description),
+        "parameters": {"type": "object", "properties": properties, "required": required},
+    }
+    _schemas[name] = schema
+    return schema
+
+
+# -------------------------
+# Loading implementations on first use
+# -------------------------
+def load_attribute(module_name, attribute):
+    """Import module_name (once) and return one of its attributes"""
+    key = (module_name, attribute)
+    if key not in _loaded:
+        with _load_lock:
+            if key not in _loaded:
+                logger.info(f"📦 Loading {module_name} for {attribute}")
+                _loaded[key] = getattr(importlib.import_module(module_name), attribute)
+    return _loaded[key]
+
+
+async def load_attribute_async(module_name, attribute):
+    """load_attribute without blocking the event loop while heavy modules import"""
+    if (module_name, attribute) in _loaded:
+        return _loaded[(module_name, attribute)]
+    return await asyncio.to_thread(load_attribute, module_name, attribute)
+
+
+def load_tool(name):
+    return load_attribute(*TOOL_LOCATIONS[name])
+
+
+async def _invoke(tool, kwargs):
+    if inspect.iscoroutinefunction(tool):
+        result = await tool(**kwargs)
+    else:
+        result = await asyncio.to_thread(lambda: tool(**kwargs))
+    while inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def lazy_tool(name):
+    """LiveKit function tool with the real tool's schema that imports the implementation on first call"""
+    schema = tool_schema(name)
+
+    async def call_tool(raw_arguments: dict):
+        tool = await load_attribute_async(*TOOL_LOCATIONS[name])
+        return await _invoke(tool, dict(raw_arguments or {}))
+
+    return function_tool(call_tool, raw_schema=schema)
+
+
+def lazy_tools(names):
+    return [lazy_tool(name) for name in names]
+
+
+def lazy_callable(name):
+    """Plain callable standing in for a tool, for code that calls tools directly (the web servers)"""
+    def call(*args, **kwargs):
+        return load_tool(name)(*args, **kwargs)
+
+    call.__name__ = name
+    return call
+
+
+# -------------------------
+# Startup benchmark: python stonic_tool_registry.py [modules...]
+# -------------------------
+def measure_import_time(statement):
+    """Run `python -X importtime -c statement` in a fresh interpreter.
+    Returns (total seconds for the modules the statement imports, [(cumulative seconds, module)] for
+    their direct imports, heaviest first) or raises RuntimeError."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+
+    targets = set(re.findall(r"import (\w+)", statement))
+    total, children, parent = 0.0, [], None
+    # importtime prints a module after its own imports, deeper imports indented by two more spaces
+    for line in reversed(result.stderr.splitlines()):
+        match = re.match(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|( *)(\S+)", line)
+        if not match:
+            continue
+        seconds, depth, module = int(match.group(1)) / 1e6, len(match.group(2)), match.group(3)
+        if depth == 1:
+            parent = module if module in targets else None
+            if parent:
+                total += seconds
+        elif depth == 3 and parent:
+            children.append((seconds, module))
+    return total, sorted(children, reverse=True)
+
+
+def run_benchmark(targets=("agent", "stonic_integrated", "stonic_web_server"), top=8):
+    statements = [(target, f"import {target}") for target in targets]
+    eager = "; ".join(sorted({f"import {module}" for module, _ in TOOL_LOCATIONS.values()}))
+    statements.append(("all tool modules (eager)", eager))
+    for label, statement in statements:
+        try:
+            total, heaviest = measure_import_time(statement)
+        except RuntimeError as e:
+            print(f"{label:>26}: failed ({e})")
+            continue
+        print(f"{label:>26}: {total * 1000:8.1f} ms")
+        for seconds, module in heaviest[:top]:  # Direct imports of the measured modules
+            print(f"{'':>28}{seconds * 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    run_benchmark(tuple(sys.argv[1:]) or ("agent", "stonic_integrated", "stonic_web_server"))
@@ -0,0 +1,195 @@
+import re
+import sys
+import time
+import heapq
+import random
+import logging
+import tracemalloc
+from array import array
+from collections import defaultdict
+from fuzzywuzzy import fuzz
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Candidate generation limits
+POSTING_BUDGET = 20000  # Max posting entries read per lookup (rarest trigrams first)
+MAX_CANDIDATES = 200  # Candidates passed on to fuzzy scoring
+COMPACT_MIN_REMOVED = 10000  # Tombstones are swept once there are at least this many...
+COMPACT_RATIO = 0.1  # ...and they are this share of the live items
+
+_SEPARATORS = re.compile(r"[\s_\-.()\[\]]+")
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase a file name and turn separators into single spaces"""
+    return _SEPARATORS.sub(" ", name.lower()).strip()
+
+
+def trigrams(text: str) -> set:
+    """Trigrams of a normalized string, padded so short words still produce grams"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Inverted trigram index over item names, keyed by integer ids (FileIndex uses the SQLite rowid).
+
+    Only the postings are held in memory: each trigram maps to a compact array of ids, and each gram
+    string is stored once, as a dict key. Items are looked up with fetch_items(ids) -> {id: item} for
+    the shortlist of a query only; without it the index keeps the items itself (benchmark use).
+    Removed ids are tombstoned and swept out of the postings in bulk.
+    """
+
+    def __init__(self, fetch_items=None):
+        self._postings = {}  # trigram -> array of ids
+        self._removed = set()  # Tombstoned ids still present in some postings
+        self._count = 0
+        self._fetch_items = fetch_items
+        self._items = None if fetch_items else {}  # id -> item, only without fetch_items
+
+    def __len__(self):
+        return self._count
+
+    def add(self, item_id, name, item=None):
+        """Index a name under item_id. Ids must not be reused for another name without remove() first."""
+        if item_id in self._removed:
+            self._removed.discard(item_id)  # Reused id: stale postings only add candidates, which are re-scored
+        postings = self._postings
+        for gram in trigrams(normalize_name(name)):
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array("i")
+            posting.append(item_id)
+        if self._items is not None:
+            self._items[item_id] = item if item is not None else {"name": name}
+        self._count += 1
+
+    def remove(self, item_id):
+        self._removed.add(item_id)
+        if self._items is not None:
+            self._items.pop(item_id, None)
+        self._count = max(0, self._count - 1)
+        if len(self._removed) > COMPACT_MIN_REMOVED and len(self._removed) > self._count * COMPACT_RATIO:
+            self.compact()
+
+    def compact(self):
+        """Sweep tombstoned ids out of the postings"""
+        removed = self._removed
+        if not removed:
+            return
+        for gram, posting in list(self._postings.items()):
+            kept = array("i", (item_id for item_id in posting if item_id not in removed))
+            if kept:
+                self._postings[gram] = kept
+            else:
+                del self._postings[gram]
+        self._removed = set()
+
+    def _lookup_items(self, ids):
+        if self._fetch_items:
+            return self._fetch_items(ids)
+        return {item_id: self._items[item_id] for item_id in ids if item_id in self._items}
+
+    def candidates(self, query, max_candidates=MAX_CANDIDATES):
+        """Items sharing the most trigrams with the query, reading the rarest posting lists first"""
+        query_grams = trigrams(normalize_name(query))
+        postings = sorted((self._postings[g] for g in query_grams if g in self._postings), key=len)
+        if not postings:
+            return []
+
+        counts = defaultdict(int)
+        read = 0
+        for posting in postings:
+            if read and read + len(posting) > POSTING_BUDGET:
+                break
+            read += len(posting)
+            for item_id in posting:
+                counts[item_id] += 1
+
+        # Re-count the full overlap for the shortlist (from the names), so skipped common trigrams still count
+        removed = self._removed
+        shortlist = [item_id for item_id, _ in heapq.nlargest(
+            max_candidates * 2, ((i, c) for i, c in counts.items() if i not in removed), key=lambda kv: kv[1])]
+        items = self._lookup_items(shortlist)
+        scored = []
+        for item_id in shortlist:
+            item = items.get(item_id)
+            if item is not None:
+                scored.append((len(trigrams(normalize_name(item["name"])) & query_grams), item))
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return [item for _, item in scored[:max_candidates]]
+
+    def search(self, query, limit=10, min_score=0, predicate=None):
+        """Return [(item, score)] ranked by fuzzy score, best first.
+        predicate(item) -> bool drops items before scoring; the candidate pool is widened to compensate."""
+        max_candidates = MAX_CANDIDATES * 5 if predicate else MAX_CANDIDATES
+        results = []
+        for item in self.candidates(query, max_candidates):
+            if predicate and not predicate(item):
+                continue
+            score = fuzz.WRatio(query, item["name"])
+            if score >= min_score:
+                results.append((item, score))
+        results.sort(key=lambda pair: pair[1], reverse=True)
+        return results[:limit]
+
+
+# -------------------------
+# Benchmark: python stonic_trigram_index.py [sizes...]
+# -------------------------
+_WORDS = ["report", "song", "project", "notes", "invoice", "photo", "backup", "final", "draft", "lecture",
+          "signals", "systems", "analog", "circuits", "resume", "budget", "movie", "holiday", "lab", "assignment"]
+_EXTENSIONS = [".pdf", ".mp3", ".docx", ".txt", ".py", ".jpg", ".mp4", ".xlsx", ""]
+
+
+def _synthetic_names(count, seed=7):
+    rng = random.Random(seed)
+    for i in range(count):
+        words = rng.sample(_WORDS, rng.randint(1, 3))
+        yield f"{'_'.join(words)}_{rng.randint(0, 99999)}{rng.choice(_EXTENSIONS)}"
+
+
+def run_benchmark(sizes=(10000, 100000, 1000000), queries=50):
+    rng = random.Random(11)
+    previous = None
+    print(f"{'items':>10} {'build s':>9} {'postings MB':>12} {'lookup ms':>10} {'top-5 hit':>10} "
+          f"{'vs prev size':>13} {'vs prev latency':>16}")
+    for size in sizes:
+        names = list(_synthetic_names(size))
+        # Memory of the postings alone, as FileIndex holds them (items stay in SQLite there)
+        tracemalloc.start()
+        postings_only = TrigramIndex(fetch_items=lambda ids: {})
+        for i, name in enumerate(names):
+            postings_only.add(i, name)
+        memory = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+        del postings_only
+
+        index = TrigramIndex()
+        start = time.perf_counter()
+        for i, name in enumerate(names):
+            index.add(i, name, {"name": name, "path": f"/bench/{i}/{name}", "type": "file"})
+        build = time.perf_counter() - start
+
+        sample = [rng.choice(names) for _ in range(queries)]
+        hits = 0
+        start = time.perf_counter()
+        for name in sample:
+            # Spoken queries are partial and lossy: drop the extension and a letter
+            query = name.rsplit(".", 1)[0].replace("_", " ")
+            results = index.search(query[:-1], limit=5)
+            hits += any(item["name"] == name for item, _ in results)
+        latency = (time.perf_counter() - start) / queries * 1000
+        hit_rate = f"{hits / queries:.0%}"
+
+        if previous:
+            print(f"{size:>10} {build:>9.1f} {memory:>12.1f} {latency:>10.2f} {hit_rate:>10} "
+                  f"{size / previous[0]:>12.0f}x {latency / previous[1]:>15.2f}x")
+        else:
+            print(f"{size:>10} {build:>9.1f} {memory:>12.1f} {latency:>10.2f} {hit_rate:>10} {'-':>13} {'-':>16}")
+        previous = (size, latency)
+
+
+if __name__ == "__main__":
+    run_benchmark(tuple(int(arg) for arg in sys.argv[1:]) or (10000, 100000, 1000000))
@@ -0,0 +1,203 @@
+import os
+import re
+import json
+import time
+import atexit
+import asyncio
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from stonic_json_file import write_json_atomic
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SAVE_DEBOUNCE_SECONDS = 1.0  # Disk writes for persistent caches are batched within this window
+
+_PUNCTUATION = re.compile(r"[^\w\s]", re.UNICODE)
+
+
+def normalize_key(text: str) -> str:
+    """Cache key for spoken text: NFKC, case-folded, punctuation dropped, whitespace collapsed"""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return " ".join(text.split())
+
+
+class TTLCache:
+    """In-process LRU cache with per-entry TTL, stale-while-revalidate and optional JSON persistence.
+
+    Entries younger than ttl_seconds are fresh. Until ttl_seconds + stale_seconds they are still
+    served, while get_or_fetch refreshes them in the background.
+    """
+
+    def __init__(self, name, ttl_seconds, max_entries=256, stale_seconds=0, persist_file=None):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stale_seconds = stale_seconds
+        self.persist_file = persist_file
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, stored_at), least recently used first
+        self._lock = threading.RLock()
+        self._inflight = {}  # key -> asyncio.Task fetching it
+        self._timer = None
+        self._dirty = False
+        if persist_file:
+            self._load()
+            atexit.register(self.flush)
+
+    def __len__(self):
+        return len(self._entries)
+
+    # -------------------------
+    # Basic operations
+    # -------------------------
+    def lookup(self, key):
+        """Return (value, state) where state is "fresh", "stale" or None for a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, None
+            value, stored_at = entry
+            age = now - stored_at
+            if age < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                return value, "fresh"
+            if age < self.ttl_seconds + self.stale_seconds:
+                self._entries.move_to_end(key)
+                return value, "stale"
+            del self._entries[key]
+            self._dirty = True
+            return None, None
+
+    def get(self, key, default=None):
+        value, state = self.lookup(key)
+        if state == "fresh":
+            self.hits += 1
+            return value
+        self.misses += 1
+        return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._schedule_save()
+
+    def invalidate(self, key=None):
+        """Drop one key, or everything when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._schedule_save()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+        }
+
+    # -------------------------
+    # Async read-through
+    # -------------------------
+    async def get_or_fetch(self, key, fetch):
+        """Return the cached value for key, calling the coroutine function fetch() on a miss.
+
+        Stale values are returned immediately and refreshed in the background.
+        Concurrent misses for the same key share one fetch. Exceptions from fetch are not cached.
+        """
+        value, state = self.lookup(key)
+        if state == "fresh":
+            self.hits += 1
+            return value
+        if state == "stale":
+            self.stale_hits += 1
+            if key not in self._inflight:
+                self._start_fetch(key, fetch)
+            return value
+
+        self.misses += 1
+        task = self._inflight.get(key) or self._start_fetch(key, fetch)
+        return await asyncio.shield(task)
+
+    def _start_fetch(self, key, fetch):
+        async def runner():
+            try:
+                value = await fetch()
+                self.set(key, value)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.ensure_future(runner())
+        task.add_done_callback(self._log_background_error)
+        self._inflight[key] = task
+        return task
+
+    def _log_background_error(self, task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"{self.name} cache fetch failed: {task.exception()}")
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+    def _load(self):
+        try:
+            if not os.path.exists(self.persist_file):
+                return
+            with open(self.persist_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            limit = time.time() - self.ttl_seconds - self.stale_seconds
+            with self._lock:
+                for key, (value, stored_at) in data.items():
+                    if stored_at > limit:
+                        self._entries[key] = (value, stored_at)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            logger.info(f"✅ Loaded {len(self._entries)} cached {self.name} entries")
+        except Exception as e:
+            logger.warning(f"⚠ Could not load {self.name} cache: {e}")
+
+    def _schedule_save(self):
+        if not self.persist_file:
+            return
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write the cache to disk now (atomic replace)"""
+        if not self.persist_file:
+            return
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            data = {key: [value, stored_at] for key, (value, stored_at) in self._entries.items()}
+            self._dirty = False
+
+        try:
+            write_json_atomic(self.persist_file, data, prefix=".cache_", ensure_ascii=False, separators=(",", ":"))
+        except Exception as e:
+            logger.warning(f"⚠ Could not save {self.name} cache: {e}")
@@ -3,9 +3,13 @@ import subprocess
 import logging
 import sys
 import asyncio
-import json
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from fuzzywuzzy import process
+from stonic_file_index import get_file_index
+from stonic_path_cache import PathCacheStore
+from stonic_file_search import best_file_match, record_open
+from stonic_fs_watcher import start_file_watcher, subscribe as subscribe_fs_events
 
 try:
     from livekit.agents import function_tool
@@ -63,48 +67,91 @@ SEARCH_LOCATIONS = [
     r"C:\Program Files",
     r"C:\Program Files (x86)",
 ]
+SEARCH_WORKERS = 4  # Threads walking SEARCH_LOCATIONS concurrently
+
+
+class _SearchHandle:
+    """Stop state shared by the workers of one smart_search call.
+
+    Each worker walks one SEARCH_LOCATIONS entry, identified by its rank (index in the list). An exact
+    match stops only the workers of lower-priority locations, so a match in a higher-priority location
+    is never lost because a lower one happened to find its match first.
+    """
+
+    def __init__(self):
+        self.stop = threading.Event()  # Set on cancellation
+        self.cancelled = False
+        self.exact_rank = None  # Highest-priority location with an exact match so far
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        self.cancelled = True
+        self.stop.set()
+
+    def found_exact(self, rank):
+        with self._lock:
+            if self.exact_rank is None or rank < self.exact_rank:
+                self.exact_rank = rank
+
+    def should_stop(self, rank):
+        exact_rank = self.exact_rank
+        return self.stop.is_set() or (exact_rank is not None and exact_rank < rank)
+
 
 class SmartPathFinder:
     def __init__(self):
-        self.cache = {}
+        self.cache = PathCacheStore(CACHE_FILE, expiry_hours=CACHE_EXPIRY_HOURS)
+        self._index_building = False
+        self._executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="path-search")
+        self._active_search = None
         self.load_cache()
     
     def load_cache(self):
         """Load cached paths from file"""
-        try:
-            if os.path.exists(CACHE_FILE):
-                with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Check if cache is still valid
-                    cache_time = datetime.fromisoformat(data.get('timestamp', '2000-01-01'))
-                    if datetime.now() - cache_time < timedelta(hours=CACHE_EXPIRY_HOURS):
-                        self.cache = data.get('paths', {})
-                        logger.info(f"✅ Loaded {len(self.cache)} cached paths")
-                    else:
-                        logger.info("🔄 Cache expired, will rebuild")
-        except Exception as e:
-            logger.warning(f"⚠ Could not load cache: {e}")
+        self.cache.load()
     
     def save_cache(self):
-        """Save paths to cache file"""
+        """Write pending cache changes now (updates are otherwise batched by the store)"""
+        self.cache.flush()
+    
+    def ensure_live_index(self):
+        """Return the shared file index once it is built; it is kept live by the file watcher"""
+        index = get_file_index()
+        subscribe_fs_events(self._on_fs_event, index)
+        if index.is_built():
+            start_file_watcher(index)
+            return index
+        if not self._index_building:
+            # Build in the background, directory search is used until it is ready
+            self._index_building = True
+            threading.Thread(target=self._build_index, args=(index,), name="file-index-build", daemon=True).start()
+        return None
+
+    def _build_index(self, index):
         try:
-            cache_data = {
-                'timestamp': datetime.now().isoformat(),
-                'paths': self.cache
-            }
-            with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
-            logger.info(f"💾 Saved {len(self.cache)} paths to cache")
+            index.ensure_fresh()
+            start_file_watcher(index)
         except Exception as e:
-            logger.warning(f"⚠ Could not save cache: {e}")
-    
+            logger.warning(f"⚠ Could not build file index: {e}")
+        finally:
+            self._index_building = False
+
+    def _on_fs_event(self, event):
+        """Keep cached paths in sync with renames and deletes reported by the file watcher"""
+        if event["event"] not in ("deleted", "moved"):
+            return
+        if event["event"] == "moved":
+            self.cache.move_path(event["path"], event["dest_path"])
+        else:
+            self.cache.remove_path(event["path"])
+
     async def smart_search(self, query, max_depth=3):
         """Smart search that looks in common locations first"""
         query_lower = query.lower().strip()
         
         # First check cache
-        if query_lower in self.cache:
-            path = self.cache[query_lower]
+        path = self.cache.get(query_lower)
+        if path:
             if os.path.exists(path):
                 logger.info(f"🎯 Found in cache: {path}")
                 return {'name': os.path.basename(path), 'path': path, 'type': 'folder' if os.path.isdir(path) else 'file'}
@@ -112,80 +159,119 @@ class SmartPathFinder:
                 # Remove invalid path from cache
                 del self.cache[query_lower]
         
-        # Search in prioritized locations
-        found_items = []
+        # Then the live file index (shared ranked search), which avoids walking the disk
+        index = self.ensure_live_index()
+        if index:
+            item = await asyncio.to_thread(best_file_match, query, index=index)
+            if item:
+                self.cache[query_lower] = item['path']
+                logger.info(f"📇 Found in file index: {item['path']}")
+                return item
+            # Not in the index (other drives, excluded folders): walk the search locations below
         
-        for location in SEARCH_LOCATIONS:
-            if not os.path.exists(location):
-                continue
-                
-            try:
-                # Search current directory
-                items = self._search_in_directory(location, query_lower, max_depth=max_depth)
-                found_items.extend(items)
-                
-                # If we found exact matches, prioritize them
-                exact_matches = [item for item in items if item['name'].lower() == query_lower]
-                if exact_matches:
-                    best_match = exact_matches[0]
-                    # Cache the result
-                    self.cache[query_lower] = best_match['path']
-                    self.save_cache()
-                    return best_match
-                    
-            except Exception as e:
-                logger.warning(f"⚠ Error searching in {location}: {e}")
-                continue
+        # Index not built yet or no match in it: search in prioritized locations, concurrently on the worker pool
+        found_items, exact_match = await self._search_locations(query_lower, max_depth)
+        if exact_match:
+            # Cache the result
+            self.cache[query_lower] = exact_match['path']
+            return exact_match
         
         # If no exact match, use fuzzy matching on found items
         if found_items:
-            names = [item['name'] for item in found_items]
-            best_name, score = process.extractOne(query, names)
+            names = {i: item['name'] for i, item in enumerate(found_items)}
+            best_name, score, key = process.extractOne(query, names)
             
             if score > 70:  # Good enough match
-                for item in found_items:
-                    if item['name'] == best_name:
-                        # Cache the result
-                        self.cache[query_lower] = item['path']
-                        self.save_cache()
-                        logger.info(f"🔍 Fuzzy matched '{query}' to '{best_name}' (score: {score})")
-                        return item
+                item = found_items[key]
+                # Cache the result
+                self.cache[query_lower] = item['path']
+                logger.info(f"🔍 Fuzzy matched '{query}' to '{best_name}' (score: {score})")
+                return item
         
         return None
     
-    def _search_in_directory(self, directory, query, max_depth=3, current_depth=0):
-        """Search for items in a specific directory with depth limit"""
-        if current_depth >= max_depth:
-            return []
-        
-        found_items = []
+    def cancel_search(self):
+        """Stop the directory walk of the previous command, if it is still running"""
+        if self._active_search:
+            self._active_search.cancel()
+            self._active_search = None
+
+    async def _search_locations(self, query, max_depth):
+        """Walk SEARCH_LOCATIONS on the worker pool. Returns (found items, exact match or None)"""
+        # A new command cancels the walk of the previous one
+        self.cancel_search()
+        handle = _SearchHandle()
+        self._active_search = handle
+
+        loop = asyncio.get_running_loop()
+        futures = [
+            loop.run_in_executor(self._executor, self._search_in_directory, location, query, max_depth, handle, rank)
+            for rank, location in enumerate(SEARCH_LOCATIONS)
+        ]
         try:
-            for item in os.listdir(directory):
-                if item.startswith('.'):  # Skip hidden files
-                    continue
-                    
-                item_path = os.path.join(directory, item)
-                item_lower = item.lower()
-                
-                # Check if item name contains query
-                if query in item_lower:
-                    item_type = 'folder' if os.path.isdir(item_path) else 'file'
-                    found_items.append({
-                        'name': item,
-                        'path': item_path,
-                        'type': item_type
-                    })
-                
-                # Recursively search subdirectories (with depth limit)
-                if os.path.isdir(item_path) and current_depth < max_depth - 1:
-                    try:
-                        sub_items = self._search_in_directory(item_path, query, max_depth, current_depth + 1)
-                        found_items.extend(sub_items)
-                    except (PermissionError, OSError):
-                        continue  # Skip inaccessible directories
+            results = await asyncio.gather(*futures, return_exceptions=True)
+        except asyncio.CancelledError:
+            handle.cancel()
+            raise
+        finally:
+            if self._active_search is handle:
+                self._active_search = None
+
+        if handle.cancelled:
+            logger.info(f"⏹ Search for '{query}' cancelled")
+            return [], None
+
+        found_items = []
+        seen = set()
+        for location, items in zip(SEARCH_LOCATIONS, results):
+            if isinstance(items, Exception):
+                logger.warning(f"⚠ Error searching in {location}: {items}")
+                continue
+            for item in items:
+                if item['path'] not in seen:
+                    seen.add(item['path'])
+                    found_items.append(item)
+
+        # Exact matches keep the priority order of SEARCH_LOCATIONS
+        exact_match = next((item for item in found_items if item['name'].lower() == query), None)
+        return found_items, exact_match
+
+    def _search_in_directory(self, directory, query, max_depth=3, handle=None, rank=0):
+        """Search for items in a specific directory with depth limit (runs on the worker pool)"""
+        found_items = []
+        stack = [(directory, 0)]
+        while stack:
+            if handle and handle.should_stop(rank):
+                break
+            current, depth = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.name.startswith('.'):  # Skip hidden files
+                            continue
+                        
+                        # DirEntry caches the type from the directory listing, no extra stat
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        
+                        # Check if item name contains query
+                        item_lower = entry.name.lower()
+                        if query in item_lower:
+                            found_items.append({
+                                'name': entry.name,
+                                'path': entry.path,
+                                'type': 'folder' if is_dir else 'file'
+                            })
+                            if item_lower == query and handle:
+                                handle.found_exact(rank)  # Lower-priority locations can stop
                         
-        except (PermissionError, OSError) as e:
-            pass  # Skip inaccessible directories
+                        # Descend into subdirectories (with depth limit)
+                        if is_dir and depth < max_depth - 1:
+                            stack.append((entry.path, depth + 1))
+            except (PermissionError, OSError):
+                continue  # Skip inaccessible directories
             
         return found_items
 
@@ -239,11 +325,7 @@ async def rename_item(old_path, new_path):
     try:
         os.rename(old_path, new_path)
         # Update cache if item was cached
-        for key, cached_path in list(path_finder.cache.items()):
-            if cached_path == old_path:
-                path_finder.cache[key] = new_path
-                break
-        path_finder.save_cache()
+        path_finder.cache.move_path(old_path, new_path)
         return f"✅ Renamed to: {new_path}"
     except Exception as e:
         return f"❌ Rename failed: {e}"
@@ -256,11 +338,7 @@ async def delete_item(path):
             os.remove(path)
         
         # Remove from cache if it was cached
-        for key, cached_path in list(path_finder.cache.items()):
-            if cached_path == path:
-                del path_finder.cache[key]
-                break
-        path_finder.save_cache()
+        path_finder.cache.remove_path(path)
         
         return f"🗑️ Deleted: {path}"
     except Exception as e:
@@ -299,6 +377,7 @@ async def close(window_title: str) -> str:
 async def folder_file(command: str) -> str:
     """Enhanced folder/file operations with smart path finding"""
     command_lower = command.lower().strip()
+    path_finder.cancel_search()  # A new command supersedes any search still running
     
     # Extract the actual folder/file name from command
     search_terms = ["open", "folder", "file", "find", "search", "in", "drive", "c", "d", "e"]
@@ -344,6 +423,7 @@ async def folder_file(command: str) -> str:
     item = await path_finder.smart_search(clean_command)
     
     if item:
+        record_open(item["path"])  # Ranks higher in future searches
         if item["type"] == "folder":
             await open_folder(item["path"])
             return f"✅ Opened folder: {item['name']} at {item['path']}"
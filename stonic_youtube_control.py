@@ -1,4 +1,3 @@
-import re
 import asyncio
 from livekit.agents import function_tool
 from selenium import webdriver
@@ -7,12 +6,15 @@ from selenium.webdriver.edge.service import Service as EdgeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 import subprocess
 import os
 import logging
 import time
+import threading
 from urllib.parse import quote_plus
+from stonic_youtube_resolver import resolve_first_video
+from stonic_youtube_intents import match_youtube_intent
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -39,47 +41,114 @@ def get_driver():
         logger.error(f"Failed to initialize driver: {str(e)}")
         return None, f"Failed to initialize browser: {str(e)}"
 
+class BrowserSession:
+    """Keeps one warm Edge WebDriver that every YouTube command reuses"""
+
+    def __init__(self):
+        self._driver = None
+        self._lock = threading.Lock()
+
+    def _is_healthy(self) -> bool:
+        """The driver answers and still has a window; re-attach if the active tab was closed"""
+        try:
+            handles = self._driver.window_handles
+            if not handles:
+                return False
+            try:
+                self._driver.current_window_handle
+            except WebDriverException:
+                self._driver.switch_to.window(handles[-1])
+            return True
+        except Exception:
+            return False
+
+    def _discard(self):
+        try:
+            self._driver.quit()
+        except Exception:
+            pass
+        self._driver = None
+
+    def acquire(self):
+        """Return (driver, error), launching a browser only when there is no healthy one"""
+        with self._lock:
+            if self._driver is not None:
+                if self._is_healthy():
+                    return self._driver, None
+                logger.warning("⚠ Browser session unhealthy, restarting it")
+                self._discard()
+
+            start = time.time()
+            driver, error = get_driver()
+            if driver:
+                self._driver = driver
+                logger.info(f"🌐 Browser session started in {time.time() - start:.1f}s")
+            return driver, error
+
+    def invalidate(self):
+        """Drop the current driver after a failure, the next acquire() starts a fresh one"""
+        with self._lock:
+            if self._driver is not None:
+                self._discard()
+
+    def prewarm(self):
+        driver, error = self.acquire()
+        if error:
+            logger.warning(f"⚠ Browser pre-warm failed: {error}")
+        return driver is not None
+
+browser_session = BrowserSession()
+
+async def prewarm_browser() -> bool:
+    """Start the shared browser in the background so the first YouTube command is fast"""
+    return await asyncio.to_thread(browser_session.prewarm)
+
+def _open_results_and_click_first(driver, query, play_first):
+    """Browser fallback: load the results page and click the first video (runs in a worker thread)"""
+    url = f"https://www.youtube.com/results?search_query={quote_plus(query)}"
+    driver.get(url)
+    if not play_first:
+        return True, f"✅ Showing YouTube search results for '{query}'"
+
+    wait = WebDriverWait(driver, TIMEOUT)
+    links = wait.until(
+        EC.presence_of_all_elements_located((By.CSS_SELECTOR, "ytd-video-renderer a#video-title"))
+    )
+    if not links:
+        return False, f"❌ No videos found for '{query}'"
+
+    first = links[0]
+    try:
+        wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "ytd-video-renderer a#video-title")))
+        first.click()
+        return True, f"✅ Playing '{query}' on YouTube"
+    except Exception:
+        driver.execute_script("arguments[0].click();", first)
+        return True, f"✅ Playing '{query}' on YouTube (clicked via JS)"
+
 async def _perform_youtube_search_and_play(driver, query, play_first=True):
     """
     Navigate to YouTube search and optionally play the first result.
+    Playing resolves the video over HTTP and opens its watch URL directly,
+    falling back to clicking the first result in the browser.
     Returns a tuple (success: bool, message: str)
     """
     try:
-        encoded = quote_plus(query)
-        url = f"https://www.youtube.com/results?search_query={encoded}"
-        driver.get(url)
-
-        wait = WebDriverWait(driver, TIMEOUT)
-        links = wait.until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "ytd-video-renderer a#video-title"))
-        )
-
-        if not links:
-            return False, f"❌ No videos found for '{query}'"
-
         if play_first:
-            first = links[0]
-            try:
-                wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "ytd-video-renderer a#video-title")))
-                try:
-                    first.click()
-                except Exception:
-                    driver.execute_script("arguments[0].click();", first)
-                time.sleep(2)
+            watch_url = await resolve_first_video(query)
+            if watch_url:
+                await asyncio.to_thread(driver.get, watch_url)
                 return True, f"✅ Playing '{query}' on YouTube"
-            except TimeoutException:
-                try:
-                    driver.execute_script("arguments[0].click();", first)
-                    time.sleep(2)
-                    return True, f"✅ Playing '{query}' on YouTube (clicked via JS)"
-                except Exception as e:
-                    logger.error(f"Click failed after timeout: {e}")
-                    return False, f"❌ Failed to play '{query}': {e}"
-        else:
-            return True, f"✅ Showing YouTube search results for '{query}'"
+
+        return await asyncio.to_thread(_open_results_and_click_first, driver, query, play_first)
 
     except TimeoutException:
         return False, f"❌ Timeout while loading results for '{query}'"
+    except WebDriverException as e:
+        # Browser crashed or was closed mid-command; the next command gets a fresh one
+        logger.error(f"Browser error in search/play helper: {e}")
+        browser_session.invalidate()
+        return False, f"❌ Browser error while searching/playing '{query}', please try again"
     except Exception as e:
         logger.error(f"Error in search/play helper: {e}")
         return False, f"❌ Error while searching/playing '{query}': {e}"
@@ -89,68 +158,26 @@ async def YouTube_control(command: str) -> str:
     if not command:
         return "Please provide a YouTube command."
 
-    command = command.lower().strip()
-
-    # Patterns
-    play_patterns = [
-        r"open youtube and play (.+)",
-        r"youtube kholo aur (.+) bajao",
-        r"youtube kholo aur (.+) chalao",
-        r"play (.+) on youtube",
-        r"play song (.+) on youtube",
-        r"youtube pe (.+) chalao",
-        r"youtube par (.+) bajao",
-        r"play (.+)$",
-    ]
-
-    search_patterns = [
-        r"open youtube and search (.+)",
-        r"youtube kholo aur (.+) khojo",
-        r"youtube kholo aur (.+) dhundo",
-        r"search (.+) on youtube",
-        r"youtube pe (.+) dhundo",
-        r"youtube par (.+) khojo",
-        r"search (.+)$",
-    ]
-
-    # Play patterns
-    for pattern in play_patterns:
-        if match := re.search(pattern, command):
-            query = match.group(1).strip()
-            driver, error = get_driver()
-            if error:
-                if os.path.exists(YOUTUBE_SHORTCUT):
-                    try:
-                        subprocess.Popen([YOUTUBE_SHORTCUT], shell=True)
-                        return f"❗ Edge driver not available locally, launched YouTube app. Driver error: {error}"
-                    except Exception:
-                        return f"❌ {error}"
-                return f"❌ {error}"
-
-            success, msg = await _perform_youtube_search_and_play(driver, query, play_first=True)
-            # DO NOT quit driver → keeps browser open
-            return msg
-
-    # Search patterns
-    for pattern in search_patterns:
-        if match := re.search(pattern, command):
-            query = match.group(1).strip()
-            driver, error = get_driver()
-            if error:
-                if os.path.exists(YOUTUBE_SHORTCUT):
-                    try:
-                        subprocess.Popen([YOUTUBE_SHORTCUT], shell=True)
-                        return f"❗ Edge driver not available; opened YouTube app. Driver error: {error}"
-                    except Exception:
-                        return f"❌ {error}"
-                return f"❌ {error}"
-
-            success, msg = await _perform_youtube_search_and_play(driver, query, play_first=False)
-            # DO NOT quit driver → keeps browser open
-            return msg
+    intent, query = match_youtube_intent(command)
+
+    # Play / search
+    if intent in ("play", "search"):
+        driver, error = await asyncio.to_thread(browser_session.acquire)
+        if error:
+            if os.path.exists(YOUTUBE_SHORTCUT):
+                try:
+                    subprocess.Popen([YOUTUBE_SHORTCUT], shell=True)
+                    return f"❗ Edge driver not available locally, launched YouTube app. Driver error: {error}"
+                except Exception:
+                    return f"❌ {error}"
+            return f"❌ {error}"
+
+        success, msg = await _perform_youtube_search_and_play(driver, query, play_first=intent == "play")
+        # DO NOT quit driver → the warm browser is reused by the next command
+        return msg
 
     # Just open YouTube
-    if re.fullmatch(r"(open youtube|youtube kholo|open youtube app)", command):
+    if intent == "open":
         if not os.path.exists(YOUTUBE_SHORTCUT):
             return "❌ YouTube shortcut not found. Please check the path."
 
@@ -0,0 +1,108 @@
+import re
+import sys
+import time
+
+# Trigger phrases per intent, in priority order. "(.+)" is the slot (the query).
+# All of them are compiled into one alternation, so a command is parsed in a single pass:
+# the leftmost trigger in the text wins, and at the same position the earlier entry wins,
+# which keeps the greedy catch-alls ("play (.+)$", "search (.+)$") last.
+INTENT_PATTERNS = [
+    ("play", r"open youtube and play (.+)"),
+    ("play", r"youtube kholo aur (.+) (?:bajao|chalao)"),
+    ("search", r"youtube kholo aur (.+) (?:khojo|dhundo)"),
+    ("search", r"open youtube and search (.+)"),
+    ("play", r"play (?:song )?(.+) on youtube"),
+    ("play", r"youtube (?:pe|par) (.+) (?:bajao|chalao)"),
+    ("search", r"search (.+) on youtube"),
+    ("search", r"youtube (?:pe|par) (.+) (?:khojo|dhundo)"),
+    ("open", r"^(?:open youtube app|open youtube|youtube kholo)$"),
+    ("play", r"play (.+)$"),
+    ("search", r"search (.+)$"),
+]
+
+
+def compile_intents(patterns=INTENT_PATTERNS):
+    """One regex with a named group per trigger; returns (regex, {group name: (intent, slot group)})"""
+    alternatives = []
+    groups = {}
+    for i, (intent, pattern) in enumerate(patterns):
+        slot = f"slot{i}" if "(.+)" in pattern else None
+        if slot:
+            pattern = pattern.replace("(.+)", f"(?P<{slot}>.+)", 1)
+        alternatives.append(f"(?P<{intent}{i}>{pattern})")
+        groups[f"{intent}{i}"] = (intent, slot)
+    return re.compile("|".join(alternatives)), groups
+
+
+_INTENT_RE, _INTENT_GROUPS = compile_intents()
+
+
+def match_youtube_intent(command: str):
+    """Return (intent, query) for a spoken YouTube command, or (None, None).
+
+    intent is "play", "search" or "open"; query is None for "open".
+    """
+    command = " ".join(command.lower().split())
+    match = _INTENT_RE.search(command)
+    if not match:
+        return None, None
+    # The trigger's own group closes after its slot group, so it is always lastgroup
+    intent, slot = _INTENT_GROUPS[match.lastgroup]
+    return intent, match.group(slot).strip() if slot else None
+
+
+# -------------------------
+# Micro-benchmark: python stonic_youtube_intents.py [iterations] (the parse table lives in tests/)
+# -------------------------
+BENCHMARK_COMMANDS = [
+    "open youtube and play believer",
+    "youtube kholo aur kesariya bajao",
+    "play despacito on youtube",
+    "youtube pe arijit singh ke gaane chalao",
+    "please play some jazz",
+    "open youtube and search python tutorials",
+    "youtube kholo aur recipes dhundo",
+    "search signals and systems lecture on youtube",
+    "youtube par funny videos khojo",
+    "open youtube",
+    "youtube kholo",
+    "what is the weather",
+]
+
+_LEGACY_PLAY = [
+    r"open youtube and play (.+)", r"youtube kholo aur (.+) bajao", r"youtube kholo aur (.+) chalao",
+    r"play (.+) on youtube", r"play song (.+) on youtube", r"youtube pe (.+) chalao",
+    r"youtube par (.+) bajao", r"play (.+)$",
+]
+_LEGACY_SEARCH = [
+    r"open youtube and search (.+)", r"youtube kholo aur (.+) khojo", r"youtube kholo aur (.+) dhundo",
+    r"search (.+) on youtube", r"youtube pe (.+) dhundo", r"youtube par (.+) khojo", r"search (.+)$",
+]
+
+
+def _legacy_match(command):
+    """The previous sequential re.search loop, kept only for the benchmark"""
+    command = command.lower().strip()
+    for pattern in _LEGACY_PLAY:
+        if match := re.search(pattern, command):
+            return "play", match.group(1).strip()
+    for pattern in _LEGACY_SEARCH:
+        if match := re.search(pattern, command):
+            return "search", match.group(1).strip()
+    if re.fullmatch(r"(open youtube|youtube kholo|open youtube app)", command):
+        return "open", None
+    return None, None
+
+
+def run_benchmark(iterations=20000, commands=BENCHMARK_COMMANDS):
+    for name, matcher in (("sequential re.search", _legacy_match), ("compiled alternation", match_youtube_intent)):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for command in commands:
+                matcher(command)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>22}: {elapsed / (iterations * len(commands)) * 1e6:.2f} µs/command")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
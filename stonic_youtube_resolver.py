@@ -0,0 +1,107 @@
+import re
+import json
+import logging
+from urllib.parse import quote_plus
+
+from stonic_http import async_http_client
+from stonic_ttl_cache import TTLCache, normalize_key
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Resolver configuration
+RESOLVE_TIMEOUT = (3, 6)  # (connect, read) seconds; on timeout the browser falls back to the results page
+VIDEO_CACHE_TTL_SECONDS = 24 * 60 * 60  # A query keeps resolving to the same video for a day
+VIDEO_CACHE_FILE = "stonic_youtube_cache.json"  # Set to None to keep the cache in memory only
+video_cache = TTLCache("youtube_video", VIDEO_CACHE_TTL_SECONDS, max_entries=500, persist_file=VIDEO_CACHE_FILE)
+
+SEARCH_URL = "https://www.youtube.com/results?search_query={}"
+WATCH_URL = "https://www.youtube.com/watch?v={}"
+REQUEST_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0 Safari/537.36 Edg/124.0"),
+    "Accept-Language": "en-US,en;q=0.9",
+    "Cookie": "CONSENT=YES+1",  # Skips the EU consent interstitial
+}
+
+_INITIAL_DATA = re.compile(r"(?:var ytInitialData|window\[\"ytInitialData\"\])\s*=\s*")
+_VIDEO_RENDERER_ID = re.compile(r'"videoRenderer":\{"videoId":"([\w-]{11})"')
+_WATCH_LINK = re.compile(r"/watch\?v=([\w-]{11})")
+# Result-list entries whose videos are not the top result: ads and "Latest from" / "People also watched" shelves
+_SKIPPED_RENDERERS = frozenset({"adSlotRenderer", "promotedSparklesWebRenderer", "promotedVideoRenderer",
+                                "searchPyvRenderer", "shelfRenderer", "reelShelfRenderer"})
+
+
+class VideoNotFound(Exception):
+    """No playable video in the search results; never cached so the next request retries"""
+
+
+def _initial_data(html: str):
+    """The ytInitialData JSON object embedded in a results page, or None"""
+    match = _INITIAL_DATA.search(html)
+    if not match:
+        return None
+    try:
+        data, _ = json.JSONDecoder().raw_decode(html, match.end())
+        return data
+    except ValueError:
+        return None
+
+
+def _first_video_renderer(data):
+    """Depth-first, document-order walk for the first videoRenderer (skips ads, shelves and channels)"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            renderer = node.get("videoRenderer")
+            if isinstance(renderer, dict) and renderer.get("videoId"):
+                return renderer["videoId"]
+            stack.extend(reversed([value for key, value in node.items() if key not in _SKIPPED_RENDERERS]))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return None
+
+
+def extract_first_video_id(payload: str):
+    """First video ID in a YouTube results page (HTML) or a search API JSON payload, or None"""
+    data = _initial_data(payload)
+    if data is None and payload.lstrip().startswith("{"):
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            data = None
+    if data is not None:
+        video_id = _first_video_renderer(data)
+        if video_id:
+            return video_id
+
+    # Layout changed: fall back to plain pattern matching on the raw payload
+    for pattern in (_VIDEO_RENDERER_ID, _WATCH_LINK):
+        if match := pattern.search(payload):
+            return match.group(1)
+    return None
+
+
+async def _fetch_first_video_id(query: str) -> str:
+    response = await async_http_client.get(SEARCH_URL.format(quote_plus(query)), headers=REQUEST_HEADERS,
+                                           timeout=RESOLVE_TIMEOUT, retries=0)
+    response.raise_for_status()
+    video_id = extract_first_video_id(response.text)
+    if not video_id:
+        raise VideoNotFound(query)
+    return video_id
+
+
+async def resolve_first_video(query: str):
+    """Watch URL of the first search result for query, or None when it cannot be resolved over HTTP"""
+    try:
+        video_id = await video_cache.get_or_fetch(normalize_key(query), lambda: _fetch_first_video_id(query))
+    except VideoNotFound:
+        logger.info(f"❌ No video found over HTTP for '{query}'")
+        return None
+    except Exception as e:
+        logger.warning(f"⚠ YouTube resolver failed for '{query}': {e}")
+        return None
+    logger.debug(f"YouTube resolver cache stats: {video_cache.stats()}")
+    return WATCH_URL.format(video_id)
@@ -0,0 +1,115 @@
+import time
+import asyncio
+
+import pytest
+
+import stonic_code_fixer
+import stonic_ttl_cache
+from stonic_code_fixer import analysis_cache_key, extract_changed_code
+from stonic_ttl_cache import TTLCache
+
+CODE = "def add(a, b):\n    return a + b\n\nprint(add(1, 2))\n"
+
+
+@pytest.fixture
+def analysis_cache(monkeypatch):
+    """A fresh in-memory cache configured like the module's persistent one"""
+    cache = TTLCache("code_analysis", stonic_code_fixer.ANALYSIS_CACHE_TTL_SECONDS,
+                     max_entries=stonic_code_fixer.analysis_cache.max_entries)
+    monkeypatch.setattr(stonic_code_fixer, "analysis_cache", cache)
+    return cache
+
+
+# -------------------------
+# analysis_cache_key
+# -------------------------
+@pytest.mark.parametrize("variant", [
+    CODE.replace("\n", "\r\n"),  # Windows line endings
+    CODE.replace("\n", "   \n"),  # Trailing spaces
+    CODE.replace("\n\n", "\n\n\n\n"),  # Extra blank lines
+    "\n" + CODE + "\n\n",  # Leading/trailing blank lines
+])
+def test_cache_key_ignores_formatting_noise(variant):
+    assert analysis_cache_key(variant, "python") == analysis_cache_key(CODE, "python")
+
+
+@pytest.mark.parametrize("code, language, model", [
+    (CODE.replace("a + b", "a - b"), "python", stonic_code_fixer.GROQ_MODEL),  # Edited code
+    (CODE.replace("    return", "        return"), "python", stonic_code_fixer.GROQ_MODEL),  # Indentation
+    (CODE, "javascript", stonic_code_fixer.GROQ_MODEL),
+    (CODE, "python", "another-model"),
+])
+def test_cache_key_changes_with_code_language_and_model(code, language, model):
+    assert analysis_cache_key(code, language, model) != analysis_cache_key(CODE, "python")
+
+
+# -------------------------
+# Analysis cache eviction and restarts
+# -------------------------
+def test_analysis_cache_evicts_least_recently_used(analysis_cache):
+    keys = [analysis_cache_key(f"x = {i}", "python") for i in range(analysis_cache.max_entries + 1)]
+    for key in keys[:-1]:
+        analysis_cache.set(key, {"analysis": "ok", "fixed_code": ""})
+    analysis_cache.get(keys[0])  # Recently used, so it survives
+
+    analysis_cache.set(keys[-1], {"analysis": "ok", "fixed_code": ""})
+
+    assert analysis_cache.lookup(keys[0])[1] == "fresh"
+    assert analysis_cache.lookup(keys[1]) == (None, None)
+    assert analysis_cache.stats()["evictions"] == 1
+
+
+def test_analysis_cache_expires_after_ttl(analysis_cache, monkeypatch):
+    key = analysis_cache_key(CODE, "python")
+    analysis_cache.set(key, {"analysis": "ok", "fixed_code": ""})
+    stored_at = time.time()
+
+    monkeypatch.setattr(stonic_ttl_cache.time, "time", lambda: stored_at + analysis_cache.ttl_seconds - 60)
+    assert analysis_cache.lookup(key)[1] == "fresh"
+    monkeypatch.setattr(stonic_ttl_cache.time, "time", lambda: stored_at + analysis_cache.ttl_seconds + 60)
+    assert analysis_cache.lookup(key) == (None, None)
+
+
+def test_last_analysis_survives_a_restart(tmp_path, monkeypatch):
+    cache_file = str(tmp_path / "analysis_cache.json")
+    cache = TTLCache("code_analysis", stonic_code_fixer.ANALYSIS_CACHE_TTL_SECONDS, persist_file=cache_file)
+    monkeypatch.setattr(stonic_code_fixer, "analysis_cache", cache)
+    cache.set(analysis_cache_key(CODE, "python"), {"analysis": "Looks fine", "fixed_code": CODE})
+    stonic_code_fixer.CodeFixerCore().remember_analysis({"original_code": CODE, "language": "python"})
+    cache.flush()
+
+    monkeypatch.setattr(stonic_code_fixer, "analysis_cache",
+                        TTLCache("code_analysis", stonic_code_fixer.ANALYSIS_CACHE_TTL_SECONDS,
+                                 persist_file=cache_file))
+    last = stonic_code_fixer.CodeFixerCore().load_last_analysis()
+
+    assert (last["analysis"], last["fixed_code"]) == ("Looks fine", CODE)
+
+
+def test_no_last_analysis_on_first_run(analysis_cache):
+    assert stonic_code_fixer.CodeFixerCore().load_last_analysis() is None
+
+
+# -------------------------
+# Code monitoring
+# -------------------------
+@pytest.mark.parametrize("old, new, expected", [
+    ("a\nb\nc", "a\nb\nc", ""),
+    ("a\nb\nc", "a\nc", ""),  # Only removed lines
+    ("a\nb\nc\nd\ne\nf\ng\nh", "a\nb\nc\nd\nE\nf\ng\nh", "c\nd\nE\nf\ng"),
+    ("1\n2\n3\n4\n5\n6\n7\n8\n9\n10", "X\n2\n3\n4\n5\n6\n7\n8\n9\nY", "X\n2\n3\n...\n8\n9\nY"),  # Separate edits
+])
+def test_extract_changed_code(old, new, expected):
+    assert extract_changed_code(old, new, context=2) == expected
+
+
+def test_editor_monitoring_refused_without_ocr(monkeypatch):
+    core = stonic_code_fixer.CodeFixerCore()
+    core._tesseract_available = False
+    monkeypatch.setattr(stonic_code_fixer, "code_fixer_core", core)
+
+    message = asyncio.run(stonic_code_fixer.start_code_monitoring())
+
+    assert "Tesseract" in message
+    assert not core.monitoring
+    assert core._read_monitored_code(None) == (None, None)
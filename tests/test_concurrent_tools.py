@@ -0,0 +1,98 @@
+import json
+import time
+import asyncio
+
+import pytest
+
+import stonic_get_whether
+import stonic_google_search
+from stonic_http import AsyncResponse
+from stonic_ttl_cache import TTLCache
+
+# Fake network configuration
+CALL_DELAY_SECONDS = 0.3  # Latency of every fake HTTP call
+CONCURRENT_CALLS = 8  # Tool calls started at once
+ALLOWED_OVERHEAD = 1.5  # All calls together may take at most this many single calls
+
+
+class FakeAsyncHttpClient:
+    """Stands in for stonic_http.async_http_client: every GET sleeps, then returns a canned JSON body"""
+
+    def __init__(self, payload, delay=CALL_DELAY_SECONDS):
+        self.payload = payload
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def get(self, url, params=None, **kwargs) -> AsyncResponse:
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return AsyncResponse(200, json.dumps(self.payload).encode("utf-8"), {}, url)
+
+
+async def _run_concurrently(make_call):
+    started = time.perf_counter()
+    results = await asyncio.gather(*(make_call(i) for i in range(CONCURRENT_CALLS)))
+    return results, time.perf_counter() - started
+
+
+@pytest.fixture
+def weather_client(monkeypatch):
+    client = FakeAsyncHttpClient({
+        "weather": [{"description": "clear sky"}],
+        "main": {"temp": 31, "humidity": 40},
+        "wind": {"speed": 3},
+    })
+    monkeypatch.setenv("OPENWEATHER_API_KEY", "test-key")
+    monkeypatch.setattr(stonic_get_whether, "async_http_client", client)
+    monkeypatch.setattr(stonic_get_whether, "weather_cache",
+                        TTLCache("weather", stonic_get_whether.WEATHER_CACHE_TTL_SECONDS))
+    return client
+
+
+@pytest.fixture
+def search_client(monkeypatch):
+    client = FakeAsyncHttpClient({
+        "items": [{"title": "Stonic", "link": "https://example.com", "snippet": "test result"}],
+    })
+    monkeypatch.setenv("GOOGLE_SEARCH_API_KEY", "test-key")
+    monkeypatch.setenv("SEARCH_ENGINE_ID", "test-engine")
+    monkeypatch.setattr(stonic_google_search, "async_http_client", client)
+    monkeypatch.setattr(stonic_google_search, "search_cache",
+                        TTLCache("google_search", stonic_google_search.SEARCH_CACHE_TTL_SECONDS))
+    return client
+
+
+def test_concurrent_weather_calls_overlap(weather_client):
+    results, elapsed = asyncio.run(
+        _run_concurrently(lambda i: stonic_get_whether.get_weather(f"City{i}")))
+
+    assert all("Clear Sky" in result for result in results)
+    assert weather_client.calls == CONCURRENT_CALLS
+    assert weather_client.max_active == CONCURRENT_CALLS
+    assert elapsed < CALL_DELAY_SECONDS * ALLOWED_OVERHEAD
+
+
+def test_concurrent_search_calls_overlap(search_client):
+    results, elapsed = asyncio.run(
+        _run_concurrently(lambda i: stonic_google_search.google_search(f"query {i}")))
+
+    assert all("Stonic" in result for result in results)
+    assert search_client.calls == CONCURRENT_CALLS
+    assert search_client.max_active == CONCURRENT_CALLS
+    assert elapsed < CALL_DELAY_SECONDS * ALLOWED_OVERHEAD
+
+
+def test_concurrent_identical_searches_share_one_request(search_client):
+    results, elapsed = asyncio.run(
+        _run_concurrently(lambda i: stonic_google_search.google_search("same query")))
+
+    assert len(set(results)) == 1
+    assert search_client.calls == 1
+    assert elapsed < CALL_DELAY_SECONDS * ALLOWED_OVERHEAD
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from stonic_ocr_cache import OCRBandCache, band_fingerprint
+
+cv2 = pytest.importorskip("cv2")
+
+LINE_HEIGHT = 18  # Pixels per rendered editor line
+FRAME_WIDTH = 320
+
+
+def _render(lines, scale=0.5, top_margin=0):
+    """Binarized editor screenshot: dark anti-aliased text on white, one line per entry"""
+    image = np.full((top_margin + LINE_HEIGHT * len(lines) + 6, FRAME_WIDTH), 255, dtype=np.uint8)
+    for i, line in enumerate(lines):
+        baseline = top_margin + LINE_HEIGHT * (i + 1)
+        cv2.putText(image, line, (4, baseline), cv2.FONT_HERSHEY_SIMPLEX, scale, 0, 1, cv2.LINE_AA)
+    _, binary = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)  # As the code fixer does
+    return binary
+
+
+class FakeOCR:
+    """ocr_bands stand-in that counts how many bands it was asked to read"""
+
+    def __init__(self):
+        self.calls = 0
+        self.bands = 0
+
+    def __call__(self, bands):
+        self.calls += 1
+        self.bands += len(bands)
+        return [f"line{self.bands - len(bands) + i}" for i in range(len(bands))]
+
+
+@pytest.mark.parametrize("scale", [0.4, 0.5, 0.6])
+@pytest.mark.parametrize("before, after", [
+    ("x = a;", "x = a:"),
+    ("foo(a.b)", "foo(a,b)"),
+    ("print(i)", "print(l)"),
+    ("arr[i]", "arr[j]"),
+])
+def test_one_character_edits_change_the_fingerprint(before, after, scale):
+    assert band_fingerprint(_render([before], scale)) != band_fingerprint(_render([after], scale))
+
+
+def test_identical_frame_is_not_re_ocrd():
+    cache, ocr = OCRBandCache(), FakeOCR()
+    frame = _render(["def main():", "    return 1"])
+
+    first = cache.recognize(frame, ocr)
+    second = cache.recognize(frame.copy(), ocr)
+
+    assert first == second
+    assert ocr.calls == 1
+    assert cache.last_stats["ocr_bands"] == 0
+
+
+def test_only_edited_line_is_re_ocrd():
+    cache, ocr = OCRBandCache(), FakeOCR()
+    cache.recognize(_render(["def main():", "    x = a;", "    return x"]), ocr)
+
+    cache.recognize(_render(["def main():", "    x = a:", "    return x"]), ocr)
+
+    assert (cache.last_stats["bands"], cache.last_stats["ocr_bands"]) == (3, 1)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_scrolled_lines_hit_the_cache():
+    cache, ocr = OCRBandCache(), FakeOCR()
+    cache.recognize(_render(["import os", "import sys", "x = 1"]), ocr)
+
+    cache.recognize(_render(["import os", "import sys", "x = 1"], top_margin=LINE_HEIGHT * 3), ocr)
+
+    assert cache.last_stats["ocr_bands"] == 0
+
+
+def test_lru_cap_evicts_oldest_lines():
+    cache, ocr = OCRBandCache(max_bands=2), FakeOCR()
+    cache.recognize(_render(["alpha", "beta", "gamma"]), ocr)
+
+    cache.recognize(_render(["alpha"]), ocr)
+
+    assert cache.last_stats["ocr_bands"] == 1
@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+import pytest
+
+import stonic_ocr_engine
+from stonic_ocr_engine import find_text_bands, trim_band
+
+cv2 = pytest.importorskip("cv2")
+
+
+# -------------------------
+# Band detection
+# -------------------------
+@pytest.mark.parametrize("lines", [1, 12, 40])
+def test_one_band_per_rendered_line(lines):
+    binary = stonic_ocr_engine.render_code_image(lines=lines, width=1200, height=1100)
+    bands = find_text_bands(binary)
+
+    assert len(bands) == lines
+    assert all(top < bottom for top, bottom in bands)
+    assert bands == sorted(bands)
+
+
+def test_blank_and_dark_theme_frames():
+    assert find_text_bands(np.full((200, 400), 255, np.uint8)) == []
+
+    light = stonic_ocr_engine.render_code_image(lines=8, width=800, height=300)
+    assert find_text_bands(255 - light) == find_text_bands(light)  # Light text on a dark background
+
+
+def test_trim_band_cuts_blank_columns_on_the_right():
+    binary = stonic_ocr_engine.render_code_image(lines=1, width=2000, height=60)
+    binary[:, -16:] = 255  # Drop the scrollbar so only text is inked
+    top, bottom = find_text_bands(binary)[0]
+
+    band = trim_band(binary[top:bottom])
+
+    assert band.shape[1] < 1000
+    assert (band[:, -stonic_ocr_engine.BAND_PADDING:] == 255).all()
+    assert np.array_equal(band, binary[top:bottom, :band.shape[1]])  # Left margin (indentation) kept
+
+
+# -------------------------
+# Backend probe cache
+# -------------------------
+@pytest.fixture
+def probe_file(tmp_path, monkeypatch):
+    tesseract = tmp_path / "tesseract.exe"
+    tesseract.write_bytes(b"fake binary")
+    probe_path = tmp_path / "probe.json"
+    monkeypatch.setattr(stonic_ocr_engine, "OCR_PROBE_FILE", str(probe_path))
+    monkeypatch.setattr(stonic_ocr_engine, "_probe", None)
+    probe = {"backend": "cli", "source": str(tesseract), "tesseract_cmd": str(tesseract), "tessdata": None,
+             "signature": stonic_ocr_engine._file_signature(str(tesseract)), "version": "5.3.0"}
+    probe_path.write_text(json.dumps(probe), encoding="utf-8")
+    return probe, tesseract
+
+
+def test_saved_probe_is_reused_without_probing(probe_file, monkeypatch):
+    probe, _ = probe_file
+
+    def probe_backends():
+        raise AssertionError("backends were probed again")
+
+    monkeypatch.setattr(stonic_ocr_engine, "_probe_backends", probe_backends)
+
+    assert stonic_ocr_engine.probe_ocr_backend() == probe
+    assert stonic_ocr_engine.probe_ocr_backend() is stonic_ocr_engine.probe_ocr_backend()
+
+
+def test_saved_probe_is_dropped_when_the_binary_changes(probe_file, monkeypatch):
+    _, tesseract = probe_file
+    tesseract.write_bytes(b"reinstalled, different size")
+    fresh = {"backend": None}
+    monkeypatch.setattr(stonic_ocr_engine, "_probe_backends", lambda: fresh)
+
+    assert stonic_ocr_engine._load_probe() is None
+    assert stonic_ocr_engine.probe_ocr_backend() is fresh
@@ -0,0 +1,36 @@
+import pytest
+
+from stonic_youtube_intents import match_youtube_intent
+
+ENGLISH_COMMANDS = [
+    ("open youtube and play believer", "play", "believer"),
+    ("play despacito on youtube", "play", "despacito"),
+    ("play song tum hi ho on youtube", "play", "tum hi ho"),
+    ("play imagine dragons", "play", "imagine dragons"),
+    ("please play some jazz", "play", "some jazz"),
+    ("open youtube and search python tutorials", "search", "python tutorials"),
+    ("search signals and systems lecture on youtube", "search", "signals and systems lecture"),
+    ("search machine learning", "search", "machine learning"),
+    ("search for a song and play despacito", "search", "for a song and play despacito"),
+    ("open youtube", "open", None),
+    ("open youtube app", "open", None),
+    ("  Play   Believer  ON YouTube ", "play", "believer"),
+    ("what is the weather", None, None),
+]
+
+HINDI_COMMANDS = [
+    ("youtube kholo aur kesariya bajao", "play", "kesariya"),
+    ("youtube kholo aur lofi beats chalao", "play", "lofi beats"),
+    ("youtube pe arijit singh ke gaane chalao", "play", "arijit singh ke gaane"),
+    ("youtube par shape of you bajao", "play", "shape of you"),
+    ("youtube kholo aur cricket highlights khojo", "search", "cricket highlights"),
+    ("youtube kholo aur recipes dhundo", "search", "recipes"),
+    ("youtube pe news dhundo", "search", "news"),
+    ("youtube par funny videos khojo", "search", "funny videos"),
+    ("youtube kholo", "open", None),
+]
+
+
+@pytest.mark.parametrize("command, intent, query", ENGLISH_COMMANDS + HINDI_COMMANDS)
+def test_match_youtube_intent(command, intent, query):
+    assert match_youtube_intent(command) == (intent, query)
@@ -0,0 +1,40 @@
+import os
+import json
+
+import pytest
+
+from stonic_youtube_resolver import extract_first_video_id
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "youtube")
+
+SEARCH_API_PAYLOAD = json.dumps({
+    "contents": {"sectionListRenderer": {"contents": [{"itemSectionRenderer": {"contents": [
+        {"channelRenderer": {"channelId": "UCq-Fj5jknLsUf-MWSy4_brA"}},
+        {"videoRenderer": {"videoId": "kJQP7kiw5Fk"}},
+    ]}}]}},
+})
+
+
+def _fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("fixture, expected", [
+    ("results_page.html", "jfKfPfyJRdk"),  # First videoRenderer in ytInitialData
+    ("ads_and_shelves_first.html", "284Ov7ysmfA"),  # Ads, channel, shelf and shorts before the first result
+    ("regex_fallback_renderer.html", "BddP6PYo2gs"),  # Truncated ytInitialData, videoRenderer pattern
+    ("regex_fallback_watch_link.html", "BddP6PYo2gs"),  # No ytInitialData at all, /watch?v= link
+    ("no_results.html", None),
+])
+def test_extract_first_video_id_from_results_pages(fixture, expected):
+    assert extract_first_video_id(_fixture(fixture)) == expected
+
+
+@pytest.mark.parametrize("payload, expected", [
+    (SEARCH_API_PAYLOAD, "kJQP7kiw5Fk"),
+    ("{not json", None),
+    ("", None),
+])
+def test_extract_first_video_id_from_other_payloads(payload, expected):
+    assert extract_first_video_id(payload) == expected